@@ -47,6 +47,7 @@ from bpy.props import (
         StringProperty,
         BoolProperty,
         FloatProperty,
+        IntProperty,
         EnumProperty,
         CollectionProperty,
         )
@@ -571,6 +572,13 @@ class ExportFBX(bpy.types.Operator, ExportHelper):
             description="Always add a keyframe at start and end of actions for animated channels",
             default=True,
             )
+    bake_anim_batch_actions: BoolProperty(
+            name="Batch Actions",
+            description="Sample actions by evaluating their F-Curves directly, without updating the whole scene "
+                        "for each frame of each action (only for objects without parent, constraints, drivers "
+                        "or NLA tracks, when no camera or shape key is animated, others are sampled as usual)",
+            default=False,
+            )
     bake_anim_step: FloatProperty(
             name="Sampling Rate",
             description="How often to evaluate animated values (in frames)",
@@ -610,6 +618,13 @@ class ExportFBX(bpy.types.Operator, ExportHelper):
             description="Create a dir for each exported file",
             default=True,
             )
+    compression_level: IntProperty(
+            name="Compression Level",
+            description="Compression level of array data (0 to disable compression: faster export but bigger files, "
+                        "9 for the smallest files but slowest export)",
+            min=0, max=9,
+            default=1,
+            )
     use_metadata: BoolProperty(
             name="Use Metadata",
             default=True,
@@ -675,6 +690,7 @@ class FBX_PT_export_main(bpy.types.Panel):
         row.prop(operator, "batch_mode")
         sub = row.row(align=True)
         sub.prop(operator, "use_batch_own_dir", text="", icon='NEWFOLDER')
+        layout.prop(operator, "compression_level")
 
 
 class FBX_PT_export_include(bpy.types.Panel):
@@ -836,6 +852,9 @@ class FBX_PT_export_bake_animation(bpy.types.Panel):
         layout.prop(operator, "bake_anim_use_all_bones")
         layout.prop(operator, "bake_anim_use_nla_strips")
         layout.prop(operator, "bake_anim_use_all_actions")
+        sub = layout.row()
+        sub.enabled = operator.bake_anim_use_all_actions
+        sub.prop(operator, "bake_anim_batch_actions")
         layout.prop(operator, "bake_anim_force_startend_keying")
         layout.prop(operator, "bake_anim_step")
         layout.prop(operator, "bake_anim_simplify_factor")
@@ -0,0 +1,405 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+FBX benchmark, exporting then importing a generated, parametrised scene and timing each phase of both.
+
+Usage:
+
+    blender --background --factory-startup --python benchmark_fbx.py -- [options]
+
+For example, to record a baseline and compare a later version against it:
+
+    blender -b --factory-startup --python benchmark_fbx.py -- --characters 4 --frames 250 --output base.json
+    blender -b --factory-startup --python benchmark_fbx.py -- --characters 4 --frames 250 --compare base.json
+
+The imported scene is checked against the exported one (geometry, layers, bones, shape keys, animation),
+the script exits with an error code if that round-trip check fails or if a phase regressed.
+"""
+
+import argparse
+import ast
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import addon_utils
+import bmesh
+import bpy
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+
+# Phases reported for the steps of the exporter and importer, first matching step message prefix is used.
+# Other steps are reported as 'other'.
+EXPORT_PHASES = (
+    ("FBX export prepare: Wrapping Meshes", 'geometry'),
+    ("FBX export prepare: Wrapping ShapeKeys", 'shape_keys'),
+    ("FBX export prepare: Wrapping Armatures", 'armature'),
+    ("FBX export prepare: Wrapping Materials", 'materials'),
+    ("FBX export prepare: Wrapping Textures", 'materials'),
+    ("FBX export prepare: Wrapping Animations", 'animation'),
+    ("FBX export fetch meshes", 'geometry'),
+    ("FBX export fetch objects", 'armature'),
+    ("FBX export fetch animations", 'animation'),
+    ("FBX export: Writing file", 'write'),
+)
+IMPORT_PHASES = (
+    ("FBX Import: start importing", None),  # Whole import.
+    ("FBX import: Parsing", 'parse'),
+    ("FBX import: Decompressing arrays", 'parse'),
+    ("FBX import: Meshes", 'geometry'),
+    ("FBX import: Materials & Textures", 'materials'),
+    ("FBX import: Assign materials", 'materials'),
+    ("FBX import: Assign textures", 'materials'),
+    ("FBX import: Objects & Armatures", 'armature'),
+    ("FBX import: ShapeKeys", 'shape_keys'),
+    ("FBX import: Animations", 'animation'),
+)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the FBX exporter and importer on a generated scene")
+    parser.add_argument("--objects", type=int, default=50, help="number of static mesh objects")
+    parser.add_argument("--segments", type=int, default=64, help="segments of each UV sphere")
+    parser.add_argument("--uv-layers", type=int, default=1, help="number of UV layers of each mesh")
+    parser.add_argument("--color-layers", type=int, default=0, help="number of vertex color layers of each mesh")
+    parser.add_argument("--materials", type=int, default=4, help="number of textured materials")
+    parser.add_argument("--characters", type=int, default=1, help="number of skinned characters")
+    parser.add_argument("--bones", type=int, default=32, help="number of bones of each character")
+    parser.add_argument("--shape-keys", type=int, default=0, help="number of animated shape keys of each character")
+    parser.add_argument("--frames", type=int, default=100, help="number of animated frames")
+    parser.add_argument("--option", action="append", default=[], metavar="NAME=VALUE",
+                        help="extra export operator option, e.g. bake_anim_simplify_factor=0.0")
+    parser.add_argument("--import-option", action="append", default=[], metavar="NAME=VALUE",
+                        help="extra import operator option, e.g. use_anim=False")
+    parser.add_argument("--repeat", type=int, default=3, help="number of exports and imports, the median is reported")
+    parser.add_argument("--memory", action="store_true",
+                        help="do an extra export and import tracing the peak memory allocated by Python")
+    parser.add_argument("--label", default="", help="label stored with the results")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results with a previous JSON file")
+    parser.add_argument("--threshold", type=float, default=1.1,
+                        help="ratio to the compared value above which a phase is reported as regressed")
+    return parser.parse_args(argv)
+
+
+def parse_options(options):
+    result = {}
+    for option in options:
+        name, _, value = option.partition("=")
+        result[name] = ast.literal_eval(value)
+    return result
+
+
+def clear_scene():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+
+def create_scene(args):
+    clear_scene()
+    scene = bpy.context.scene
+
+    materials = []
+    for i in range(args.materials):
+        image = bpy.data.images.new("Texture.%d" % i, 256, 256)
+        image.generated_type = 'COLOR_GRID'
+        image.filepath_raw = "//Texture.%d.png" % i
+
+        material = bpy.data.materials.new("Material.%d" % i)
+        material.use_nodes = True
+        tex_node = material.node_tree.nodes.new('ShaderNodeTexImage')
+        tex_node.image = image
+        bsdf = material.node_tree.nodes['Principled BSDF']
+        material.node_tree.links.new(bsdf.inputs['Base Color'], tex_node.outputs['Color'])
+        materials.append(material)
+
+    def create_mesh(name, height=1.0):
+        mesh = bpy.data.meshes.new(name)
+        bm = bmesh.new()
+        bmesh.ops.create_uvsphere(bm, u_segments=args.segments, v_segments=max(args.segments // 2, 3),
+                                  radius=1.0, calc_uvs=args.uv_layers > 0)
+        bmesh.ops.scale(bm, vec=(1.0, 1.0, height), verts=bm.verts)
+        bm.to_mesh(mesh)
+        bm.free()
+        for i in range(1, args.uv_layers):
+            mesh.uv_layers.new(name="UVMap.%d" % i)
+        for i in range(args.color_layers):
+            mesh.vertex_colors.new(name="Col.%d" % i)
+        if materials:
+            mesh.materials.append(materials[len(bpy.data.meshes) % len(materials)])
+        return mesh
+
+    side = max(int(args.objects ** 0.5), 1)
+    for i in range(args.objects):
+        obj = bpy.data.objects.new("Object.%d" % i, create_mesh("Sphere.%d" % i))
+        obj.location = (3.0 * (i % side), 3.0 * (i // side), 0.0)
+        scene.collection.objects.link(obj)
+
+    frames = max(args.frames, 1)
+    for i in range(args.characters):
+        armature = bpy.data.armatures.new("Armature.%d" % i)
+        armature_object = bpy.data.objects.new("Armature.%d" % i, armature)
+        armature_object.location = (-3.0 * (i + 1), 0.0, 0.0)
+        scene.collection.objects.link(armature_object)
+        bpy.context.view_layer.objects.active = armature_object
+        bpy.ops.object.mode_set(mode='EDIT')
+        parent = None
+        bone_length = 1.0 / max(args.bones, 1)
+        for j in range(args.bones):
+            bone = armature.edit_bones.new("Bone.%d" % j)
+            bone.head = (0.0, 0.0, j * bone_length)
+            bone.tail = (0.0, 0.0, (j + 1) * bone_length)
+            bone.parent = parent
+            parent = bone
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        # The character mesh spans the whole bone chain, each vertex is weighted to the two closest bones.
+        mesh = create_mesh("Character.%d" % i, height=0.5)
+        obj = bpy.data.objects.new("Character.%d" % i, mesh)
+        obj.parent = armature_object
+        scene.collection.objects.link(obj)
+        modifier = obj.modifiers.new("Armature", 'ARMATURE')
+        modifier.object = armature_object
+        groups = [obj.vertex_groups.new(name="Bone.%d" % j) for j in range(args.bones)]
+        for v in mesh.vertices:
+            pos = min(max((v.co.z + 0.5) * args.bones - 0.5, 0.0), args.bones - 1.0)
+            j = int(pos)
+            groups[j].add((v.index,), 1.0 - (pos - j), 'REPLACE')
+            if j + 1 < args.bones:
+                groups[j + 1].add((v.index,), pos - j, 'REPLACE')
+
+        if args.shape_keys:
+            obj.shape_key_add(name="Basis")
+            for j in range(args.shape_keys):
+                shape = obj.shape_key_add(name="Key.%d" % j, from_mix=False)
+                for k, point in enumerate(shape.data):
+                    if k % (j + 2) == 0:
+                        point.co *= 1.1
+                for frame in range(frames):
+                    shape.value = ((frame + j) % 10) * 0.1
+                    shape.keyframe_insert("value", frame=frame + 1)
+
+        for frame in range(frames):
+            for j, pose_bone in enumerate(armature_object.pose.bones):
+                pose_bone.rotation_mode = 'XYZ'
+                pose_bone.rotation_euler.x = ((frame + j) % 20) * 0.02
+                pose_bone.keyframe_insert("rotation_euler", frame=frame + 1)
+            armature_object.location.y = frame * 0.01
+            armature_object.keyframe_insert("location", frame=frame + 1)
+
+    scene.frame_start = 1
+    scene.frame_end = frames
+
+
+def scene_counters():
+    """Data checked after the round-trip (export then import) of the generated scene."""
+    meshes = [obj.data for obj in bpy.context.scene.objects if obj.type == 'MESH']
+    armatures = [obj.data for obj in bpy.context.scene.objects if obj.type == 'ARMATURE']
+    return {
+        'mesh_objects': len(meshes),
+        'vertices': sum(len(me.vertices) for me in meshes),
+        'polygons': sum(len(me.polygons) for me in meshes),
+        'uv_layers': sum(len(me.uv_layers) for me in meshes),
+        'color_layers': sum(len(me.vertex_colors) for me in meshes),
+        'shape_keys': sum(len(me.shape_keys.key_blocks) for me in meshes if me.shape_keys),
+        'bones': sum(len(arm.bones) for arm in armatures),
+        'animated': any(obj.animation_data and obj.animation_data.action for obj in bpy.context.scene.objects),
+    }
+
+
+def phases_from_records(prefix, records, phases_table):
+    phases = {}
+    for _level, message, duration in records:
+        for message_start, phase in phases_table:
+            if message.startswith(message_start):
+                break
+        else:
+            phase = 'other'
+        if phase is not None:
+            name = prefix + phase
+            phases[name] = phases.get(name, 0.0) + duration
+    return phases
+
+
+def timed_run(prefix, phases_table, op, **kwargs):
+    from io_scene_fbx import fbx_utils
+
+    fbx_utils.PerfMon.records = []
+    try:
+        start = time.perf_counter()
+        op(**kwargs)
+        wall = time.perf_counter() - start
+        stages = phases_from_records(prefix, fbx_utils.PerfMon.records, phases_table)
+    finally:
+        fbx_utils.PerfMon.records = None
+    stages[prefix + 'wall'] = wall
+    return stages
+
+
+def traced_peak(op, **kwargs):
+    tracemalloc.start()
+    try:
+        op(**kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(args):
+    export_options = {'add_leaf_bones': False}  # Would not round-trip, adding bones.
+    export_options.update(parse_options(args.option))
+    import_options = parse_options(args.import_option)
+
+    runs = []
+    memory = {}
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "benchmark.fbx")
+
+        create_scene(args)
+        expected = scene_counters()
+        for _ in range(args.repeat):
+            runs.append({'stages': timed_run("export.", EXPORT_PHASES, bpy.ops.export_scene.fbx,
+                                             filepath=filepath, **export_options)})
+        if args.memory:
+            memory['export_python_peak'] = traced_peak(bpy.ops.export_scene.fbx, filepath=filepath, **export_options)
+        file_size = os.path.getsize(filepath)
+
+        for run in runs:
+            clear_scene()
+            run['stages'].update(timed_run("import.", IMPORT_PHASES, bpy.ops.import_scene.fbx,
+                                           filepath=filepath, **import_options))
+        imported = scene_counters()
+        if args.memory:
+            clear_scene()
+            memory['import_python_peak'] = traced_peak(bpy.ops.import_scene.fbx, filepath=filepath, **import_options)
+
+    if resource is not None:
+        # Kilobytes on Linux, bytes on macOS.
+        scale = 1 if sys.platform == 'darwin' else 1024
+        memory['process_peak'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+    for run in runs:
+        run['counters'] = dict(expected, file_size=file_size)
+    return runs, memory, expected, imported
+
+
+def median_run(runs):
+    names = {name for run in runs for name in run['stages']}
+    stages = {name: statistics.median(run['stages'].get(name, 0.0) for run in runs) for name in sorted(names)}
+    return {'stages': stages, 'counters': runs[0]['counters']}
+
+
+def check_roundtrip(expected, imported, args):
+    """Print the differences between the exported and imported scenes. Returns whether they match."""
+    ok = True
+    for name, value in expected.items():
+        if name == 'animated' and (args.frames == 0 or not args.characters):
+            continue
+        if imported.get(name) != value:
+            print("ROUND-TRIP MISMATCH {:<18} exported {:>10} imported {:>10}".format(name, value, imported.get(name)))
+            ok = False
+    return ok
+
+
+def compare(result, baseline, threshold):
+    """Print the phase durations and memory next to the baseline ones. Returns the names of the regressed ones."""
+    regressed = []
+    print("{:<24} {:>10} {:>10} {:>8}".format("phase", "base", "new", "ratio"))
+    for section in ('stages', 'memory'):
+        if section == 'stages':
+            values, base_values = result['median']['stages'], baseline['median']['stages']
+        else:
+            values, base_values = result['memory'], baseline.get('memory', {})
+        for name, value in values.items():
+            base = base_values.get(name)
+            if base is None:
+                print("{:<24} {:>10} {:10.3f}".format(name, "-", value))
+                continue
+            ratio = value / base if base > 0.0 else float('inf') if value > 0.0 else 1.0
+            flag = ""
+            if ratio > threshold:
+                flag = "  REGRESSED"
+                regressed.append(name)
+            if section == 'memory':
+                print("{:<24} {:9.1f}M {:9.1f}M {:8.2f}{}".format(name, base / 2 ** 20, value / 2 ** 20, ratio, flag))
+            else:
+                print("{:<24} {:10.3f} {:10.3f} {:8.2f}{}".format(name, base, value, ratio, flag))
+
+    base_counters = baseline['median']['counters']
+    for name, value in result['median']['counters'].items():
+        if base_counters.get(name, value) != value:
+            print("{:<24} {:>10} {:>10}".format(name, base_counters[name], value))
+    return regressed
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+
+    addon_utils.enable("io_scene_fbx", default_set=True)
+
+    runs, memory, expected, imported = run_benchmark(args)
+    result = {
+        'label': args.label,
+        'blender_version': bpy.app.version_string,
+        'addon_version': ".".join(str(v) for v in addon_utils.module_bl_info(sys.modules['io_scene_fbx'])['version']),
+        'parameters': {name: value for name, value in vars(args).items()
+                       if name not in ('label', 'output', 'compare', 'threshold', 'memory')},
+        'runs': runs,
+        'median': median_run(runs),
+        'memory': memory,
+        'roundtrip': {'exported': expected, 'imported': imported},
+    }
+
+    for name, duration in result['median']['stages'].items():
+        print("{:<24} {:10.3f} s".format(name, duration))
+    for name, value in result['median']['counters'].items():
+        print("{:<24} {:>10}".format(name, value))
+    for name, value in memory.items():
+        print("{:<24} {:9.1f} MiB".format(name, value / 2 ** 20))
+
+    failed = not check_roundtrip(expected, imported, args)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            json.dump(result, f, indent=4)
+
+    if args.compare:
+        with open(args.compare, encoding="utf8") as f:
+            baseline = json.load(f)
+        if baseline['parameters'] != result['parameters']:
+            print("WARNING: the compared results were recorded with other parameters")
+        if compare(result, baseline, args.threshold):
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,7 @@ except:
     import data_types
 
 from struct import pack
+from concurrent.futures import Future, ThreadPoolExecutor
 import array
 import zlib
 
@@ -45,6 +46,37 @@ _FOOT_ID = b'\xfa\xbc\xab\x09\xd0\xc8\xd4\x66\xb1\x76\xfb\x83\x1c\xf7\x26\x7e'
 # Awful exceptions: those "classes" of elements seem to need block sentinel even when having no children and some props.
 _ELEMS_ID_ALWAYS_BLOCK_SENTINEL = {b"AnimationStack", b"AnimationLayer"}
 
+# zlib compression of array properties, see init_write().
+_array_compression_level = 1
+_array_compression_executor = None
+
+
+def init_write(compression_level=1, max_workers=None):
+    """
+    Set the zlib compression level (0 to disable compression) of array properties added from now on,
+    and compress them in a thread pool until the next call to write() (zlib releases the GIL).
+    """
+    global _array_compression_level, _array_compression_executor
+    end_write()
+    _array_compression_level = compression_level
+    if compression_level > 0:
+        _array_compression_executor = ThreadPoolExecutor(max_workers=max_workers)
+
+
+def end_write():
+    """Stop the thread pool started by init_write() and restore the default compression level (done by write())."""
+    global _array_compression_level, _array_compression_executor
+    if _array_compression_executor is not None:
+        _array_compression_executor.shutdown(wait=True)
+    _array_compression_executor = None
+    _array_compression_level = 1
+
+
+def _encode_array(data, length, encoding, compression_level):
+    if encoding == 1:
+        data = zlib.compress(data, compression_level)
+    return pack('<3I', length, encoding, len(data)) + data
+
 
 class FBXElem:
     __slots__ = (
@@ -142,16 +174,12 @@ class FBXElem:
         data = data.tobytes()
 
         # mimic behavior of fbxconverter (also common sense)
-        # we could make this configurable.
-        encoding = 0 if len(data) <= 128 else 1
-        if encoding == 0:
-            pass
-        elif encoding == 1:
-            data = zlib.compress(data, 1)
-
-        comp_len = len(data)
-
-        data = pack('<3I', length, encoding, comp_len) + data
+        encoding = 0 if len(data) <= 128 or _array_compression_level == 0 else 1
+        if encoding == 1 and _array_compression_executor is not None:
+            # Resolved in _calc_offsets().
+            data = _array_compression_executor.submit(_encode_array, data, length, encoding, _array_compression_level)
+        else:
+            data = _encode_array(data, length, encoding, _array_compression_level)
 
         self.props_type.append(prop_type)
         self.props.append(data)
@@ -200,7 +228,9 @@ class FBXElem:
         offset += 1 + len(self.id)  # len + idname
 
         props_length = 0
-        for data in self.props:
+        for i, data in enumerate(self.props):
+            if data.__class__ is Future:
+                data = self.props[i] = data.result()
             # 1 byte for the prop type
             props_length += 1 + len(data)
         self._props_length = props_length
@@ -254,6 +284,26 @@ class FBXElem:
                 write(_BLOCK_SENTINEL_DATA)
 
 
+def _write_timedate_hack_elem(elem):
+    if elem.id == b'FileId':
+        assert(elem.props_type[0] == b'R'[0])
+        assert(len(elem.props_type) == 1)
+        elem.props.clear()
+        elem.props_type.clear()
+
+        elem.add_bytes(_FILE_ID)
+        return True
+    elif elem.id == b'CreationTime':
+        assert(elem.props_type[0] == b'S'[0])
+        assert(len(elem.props_type) == 1)
+        elem.props.clear()
+        elem.props_type.clear()
+
+        elem.add_string(_TIME_ID)
+        return True
+    return False
+
+
 def _write_timedate_hack(elem_root):
     # perform 2 changes
     # - set the FileID
@@ -261,21 +311,7 @@ def _write_timedate_hack(elem_root):
 
     ok = 0
     for elem in elem_root.elems:
-        if elem.id == b'FileId':
-            assert(elem.props_type[0] == b'R'[0])
-            assert(len(elem.props_type) == 1)
-            elem.props.clear()
-            elem.props_type.clear()
-
-            elem.add_bytes(_FILE_ID)
-            ok += 1
-        elif elem.id == b'CreationTime':
-            assert(elem.props_type[0] == b'S'[0])
-            assert(len(elem.props_type) == 1)
-            elem.props.clear()
-            elem.props_type.clear()
-
-            elem.add_string(_TIME_ID)
+        if _write_timedate_hack_elem(elem):
             ok += 1
 
         if ok == 2:
@@ -288,6 +324,33 @@ def _write_timedate_hack(elem_root):
 def write(fn, elem_root, version):
     assert(elem_root.id == b'')
 
+    try:
+        _write(fn, elem_root, version)
+    finally:
+        end_write()
+
+
+def _write_footer(write, tell, version):
+    write(_FOOT_ID)
+    write(b'\x00' * 4)
+
+    # padding for alignment (values between 1 & 16 observed)
+    # if already aligned to 16, add a full 16 bytes padding.
+    ofs = tell()
+    pad = ((ofs + 15) & ~15) - ofs
+    if pad == 0:
+        pad = 16
+
+    write(b'\0' * pad)
+
+    write(pack('<I', version))
+
+    # unknown magic (always the same)
+    write(b'\0' * 120)
+    write(b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b')
+
+
+def _write(fn, elem_root, version):
     with open(fn, 'wb') as f:
         write = f.write
         tell = f.tell
@@ -302,20 +365,126 @@ def write(fn, elem_root, version):
         elem_root._calc_offsets_children(tell(), False)
         elem_root._write_children(write, tell, False)
 
-        write(_FOOT_ID)
-        write(b'\x00' * 4)
+        _write_footer(write, tell, version)
 
-        # padding for alignment (values between 1 & 16 observed)
-        # if already aligned to 16, add a full 16 bytes padding.
-        ofs = tell()
-        pad = ((ofs + 15) & ~15) - ofs
-        if pad == 0:
-            pad = 16
 
-        write(b'\0' * pad)
+class StreamWriter:
+    """
+    Write elements to a binary file as they come, instead of from a whole elements tree.
 
-        write(pack('<I', version))
+    Elements are given in depth-first order with their depth (root ones being 0), their own elems are ignored.
+    End offsets are only known once an element is complete, they get patched in then.
+    """
+    __slots__ = (
+        "_file",
+        "_buf",  # Data not yet written to the file.
+        "_buf_offset",  # File offset of the start of _buf.
+        "_scopes",  # [header offset, elem, has children, childless last child waiting for its end offset].
+        "_timedate_ok",
+        )
 
-        # unknown magic (always the same)
-        write(b'\0' * 120)
-        write(b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b')
+    # Flush buffered data to the file when reaching that size.
+    _BUF_SIZE = 1 << 22
+
+    def __init__(self, f):
+        self._file = f
+        self._buf = bytearray()
+        self._buf_offset = 0
+        self._timedate_ok = 0
+        # Root (the file itself).
+        self._scopes = [[-1, None, False, None]]
+
+        self._write(_HEAD_MAGIC)
+        self._write(pack('<I', 0))  # Version, patched by finish().
+
+    def _write(self, data):
+        if len(data) >= self._BUF_SIZE:
+            self._flush()
+            self._file.write(data)
+            self._buf_offset += len(data)
+            return
+        self._buf += data
+        if len(self._buf) >= self._BUF_SIZE:
+            self._flush()
+
+    def _flush(self):
+        self._file.write(self._buf)
+        self._buf_offset += len(self._buf)
+        self._buf.clear()
+
+    def _tell(self):
+        return self._buf_offset + len(self._buf)
+
+    def _patch_uint(self, offset, value):
+        data = pack('<I', value)
+        if offset >= self._buf_offset:
+            offset -= self._buf_offset
+            self._buf[offset:offset + len(data)] = data
+        else:
+            self._file.seek(offset)
+            self._file.write(data)
+            self._file.seek(self._buf_offset)
+
+    def _end_childless(self, scope, is_last):
+        offset, needs_sentinel = scope[3]
+        scope[3] = None
+        if needs_sentinel and not is_last:
+            self._write(_BLOCK_SENTINEL_DATA)
+        self._patch_uint(offset, self._tell())
+
+    def _end_scope(self):
+        scope = self._scopes.pop()
+        offset, elem, has_children, last_child = scope
+        if last_child is not None:
+            self._end_childless(scope, True)
+        if has_children:
+            self._write(_BLOCK_SENTINEL_DATA)
+            self._patch_uint(offset, self._tell())
+        else:
+            # Whether a block sentinel is needed depends on this element being the last child of its parent or not.
+            needs_sentinel = not elem.props or elem.id in _ELEMS_ID_ALWAYS_BLOCK_SENTINEL
+            self._scopes[-1][3] = (offset, needs_sentinel)
+
+    def add_elem(self, depth, elem):
+        assert(elem.id != b'')
+        assert(depth < len(self._scopes))
+        while len(self._scopes) > depth + 1:
+            self._end_scope()
+        parent = self._scopes[-1]
+        if parent[3] is not None:
+            self._end_childless(parent, False)
+        parent[2] = True
+
+        if depth == 0 and _write_timedate_hack_elem(elem):
+            self._timedate_ok += 1
+
+        props = elem.props
+        for i, data in enumerate(props):
+            if data.__class__ is Future:
+                props[i] = data.result()
+        props_length = sum(1 + len(data) for data in props)
+
+        offset = self._tell()
+        self._write(pack('<3I', 0, len(props), props_length))  # End offset patched by _end_scope().
+        self._write(bytes((len(elem.id),)))
+        self._write(elem.id)
+        for prop_type, data in zip(elem.props_type, props):
+            self._write(bytes((prop_type,)))
+            self._write(data)
+
+        self._scopes.append([offset, elem, False, None])
+
+    def finish(self, version):
+        while len(self._scopes) > 1:
+            self._end_scope()
+        root = self._scopes[0]
+        if root[3] is not None:
+            self._end_childless(root, True)
+        self._write(_BLOCK_SENTINEL_DATA)
+
+        if self._timedate_ok != 2:
+            print("Missing fields!")
+
+        _write_footer(self._write, self._tell, version)
+        self._patch_uint(len(_HEAD_MAGIC), version)
+        self._flush()
@@ -40,6 +40,7 @@ if "bpy" in locals():
 
 import bpy
 import bpy_extras
+import numpy as np
 from bpy_extras import node_shader_utils
 from mathutils import Vector, Matrix
 
@@ -57,13 +58,13 @@ from .fbx_utils import (
     FBX_ANIM_KEY_VERSION,
     FBX_ANIM_PROPSGROUP_NAME,
     FBX_KTIME,
-    BLENDER_OTHER_OBJECT_TYPES, BLENDER_OBJECT_TYPES_MESHLIKE,
+    BLENDER_OTHER_OBJECT_TYPES, BLENDER_OBJECT_TYPES_MESHLIKE, BLENDER_TRANSFORM_PROPS,
     FBX_LIGHT_TYPES, FBX_LIGHT_DECAY_TYPES,
     RIGHT_HAND_AXES, FBX_FRAMERATES,
     # Miscellaneous utils.
     PerfMon,
     units_blender_to_fbx_factor, units_convertor, units_convertor_iter,
-    matrix4_to_array, similar_values, similar_values_iter,
+    matrix4_to_array, similar_values, similar_values_iter, nparray_to_array,
     # Mesh transform helpers.
     vcos_transformed_gen, nors_transformed_gen,
     # UUID from key.
@@ -927,43 +928,54 @@ def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
     #                 for loose edges).
     #       We also have to store a mapping from real edges to their indices in this array, for edge-mapped data
     #       (like e.g. crease).
-    t_eli = array.array(data_types.ARRAY_INT32)
-    edges_map = {}
+    t_eli = np.empty(0, dtype=np.int32)
+    # Index of each Blender edge in FBX edges array (-1 for edges not in it, e.g. loose ones when not exported).
+    edges_fbx_idx = np.full(len(me.edges), -1, dtype=np.int32)
     edges_nbr = 0
-    if t_ls and t_pvi:
-        t_ls = set(t_ls)
-        todo_edges = [None] * len(me.edges) * 2
+    t_pvi = np.frombuffer(t_pvi, dtype=t_pvi.typecode).copy()
+    t_ls = np.unique(np.asarray(t_ls, dtype=np.int64))
+    if len(t_ls) and len(t_pvi):
+        t_ev = np.empty(len(me.edges) * 2, dtype=np.int64)
         # Sigh, cannot access edge.key through foreach_get... :/
-        me.edges.foreach_get("vertices", todo_edges)
-        todo_edges = set((v1, v2) if v1 < v2 else (v2, v1) for v1, v2 in zip(*(iter(todo_edges),) * 2))
-
-        li = 0
-        vi = vi_start = t_pvi[0]
-        for li_next, vi_next in enumerate(t_pvi[1:] + t_pvi[:1], start=1):
-            if li_next in t_ls:  # End of a poly's loop.
-                vi2 = vi_start
-                vi_start = vi_next
-            else:
-                vi2 = vi_next
-
-            e_key = (vi, vi2) if vi < vi2 else (vi2, vi)
-            if e_key in todo_edges:
-                t_eli.append(li)
-                todo_edges.remove(e_key)
-                edges_map[e_key] = edges_nbr
-                edges_nbr += 1
-
-            vi = vi_next
-            li = li_next
+        me.edges.foreach_get("vertices", t_ev)
+        t_ev = t_ev.reshape(-1, 2)
+        edges_keys = (t_ev.min(axis=1) << 32) | t_ev.max(axis=1)
+        del t_ev
+
+        # Second vertex of each loop's edge: next loop's vertex, or for the last loop of a poly, its first one.
+        t_li = np.arange(len(t_pvi))
+        t_poly_starts = np.union1d(t_ls, (0,))
+        t_pvi_start = t_pvi[t_poly_starts[np.searchsorted(t_poly_starts, t_li, side='right') - 1]]
+        t_pvi_next = np.where(np.isin(t_li + 1, t_ls), t_pvi_start, np.roll(t_pvi, -1)).astype(np.int64)
+        loops_keys = (np.minimum(t_pvi, t_pvi_next) << 32) | np.maximum(t_pvi, t_pvi_next)
+        del t_li, t_poly_starts, t_pvi_start, t_pvi_next
+
+        # Each edge is written once, using the first loop it is found on.
+        loops_keys, t_eli = np.unique(loops_keys, return_index=True)
+        is_edge = np.isin(loops_keys, edges_keys)
+        loops_keys = loops_keys[is_edge]
+        t_eli = t_eli[is_edge]
+        del is_edge
+        edges_order = np.argsort(t_eli)
+        t_eli = t_eli[edges_order]
+        edges_nbr = len(t_eli)
+
+        keys_fbx_idx = np.empty(edges_nbr, dtype=np.int32)
+        keys_fbx_idx[edges_order] = np.arange(edges_nbr)
+        keys_idx = np.minimum(np.searchsorted(loops_keys, edges_keys), max(edges_nbr - 1, 0))
+        if edges_nbr:
+            is_written = loops_keys[keys_idx] == edges_keys
+            edges_fbx_idx[is_written] = keys_fbx_idx[keys_idx[is_written]]
+            del is_written
+        del loops_keys, edges_keys, edges_order, keys_fbx_idx, keys_idx
     # End of edges!
 
     # We have to ^-1 last index of each loop.
-    for ls in t_ls:
-        t_pvi[ls - 1] ^= -1
+    t_pvi[t_ls - 1] ^= -1
 
     # And finally we can write data!
-    elem_data_single_int32_array(geom, b"PolygonVertexIndex", t_pvi)
-    elem_data_single_int32_array(geom, b"Edges", t_eli)
+    elem_data_single_int32_array(geom, b"PolygonVertexIndex", nparray_to_array(t_pvi, data_types.ARRAY_INT32))
+    elem_data_single_int32_array(geom, b"Edges", nparray_to_array(t_eli, data_types.ARRAY_INT32))
     del t_pvi
     del t_ls
     del t_eli
@@ -981,23 +993,24 @@ def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
         else:  # EDGE
             # Write Edge Smoothing.
             # Note edge is sharp also if it's used by more than two faces, or one of its faces is flat.
-            t_ps = array.array(data_types.ARRAY_INT32, (0,)) * edges_nbr
-            sharp_edges = set()
-            temp_sharp_edges = {}
-            for p in me.polygons:
-                if not p.use_smooth:
-                    sharp_edges.update(p.edge_keys)
-                    continue
-                for k in p.edge_keys:
-                    if temp_sharp_edges.setdefault(k, 0) > 1:
-                        sharp_edges.add(k)
-                    else:
-                        temp_sharp_edges[k] += 1
-            del temp_sharp_edges
-            for e in me.edges:
-                if e.key not in edges_map:
-                    continue  # Only loose edges, in theory!
-                t_ps[edges_map[e.key]] = not (e.use_edge_sharp or (e.key in sharp_edges))
+            t_ps = np.zeros(edges_nbr, dtype=np.int32)
+            t_les = np.empty(len(me.loops), dtype=np.int32)
+            me.loops.foreach_get("edge_index", t_les)
+            t_lt = np.empty(len(me.polygons), dtype=np.int32)
+            me.polygons.foreach_get("loop_total", t_lt)
+            t_lsmooth = np.empty(len(me.polygons), dtype=bool)
+            me.polygons.foreach_get("use_smooth", t_lsmooth)
+            # Assumes polygons' loops are contiguous and in order.
+            t_lsmooth = np.repeat(t_lsmooth, t_lt)
+            sharp_edges = np.bincount(t_les[:len(t_lsmooth)][t_lsmooth], minlength=len(me.edges)) > 2
+            sharp_edges[t_les[:len(t_lsmooth)][~t_lsmooth]] = True
+            t_es = np.empty(len(me.edges), dtype=bool)
+            me.edges.foreach_get("use_edge_sharp", t_es)
+            # Only loose edges are not written, in theory!
+            is_written = edges_fbx_idx >= 0
+            t_ps[edges_fbx_idx[is_written]] = ~(t_es | sharp_edges)[is_written]
+            t_ps = nparray_to_array(t_ps, data_types.ARRAY_INT32)
+            del t_les, t_lt, t_lsmooth, sharp_edges, t_es, is_written
             _map = b"ByEdge"
         lay_smooth = elem_data_single_int32(geom, b"LayerElementSmoothing", 0)
         elem_data_single_int32(lay_smooth, b"Version", FBX_GEOMETRY_SMOOTHING_VERSION)
@@ -1009,13 +1022,16 @@ def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
 
     # Edge crease for subdivision
     if write_crease:
-        t_ec = array.array(data_types.ARRAY_FLOAT64, (0.0,)) * edges_nbr
-        for e in me.edges:
-            if e.key not in edges_map:
-                continue  # Only loose edges, in theory!
-            # Blender squares those values before sending them to OpenSubdiv, when other softwares don't,
-            # so we need to compensate that to get similar results through FBX...
-            t_ec[edges_map[e.key]] = e.crease * e.crease
+        t_ec = np.zeros(edges_nbr, dtype=np.float64)
+        t_ecr = np.empty(len(me.edges), dtype=np.float32)
+        me.edges.foreach_get("crease", t_ecr)
+        # Only loose edges are not written, in theory!
+        is_written = edges_fbx_idx >= 0
+        # Blender squares those values before sending them to OpenSubdiv, when other softwares don't,
+        # so we need to compensate that to get similar results through FBX...
+        t_ec[edges_fbx_idx[is_written]] = np.square(t_ecr[is_written], dtype=np.float64)
+        t_ec = nparray_to_array(t_ec, data_types.ARRAY_FLOAT64)
+        del t_ecr, is_written
 
         lay_crease = elem_data_single_int32(geom, b"LayerElementEdgeCrease", 0)
         elem_data_single_int32(lay_crease, b"Version", FBX_GEOMETRY_CREASE_VERSION)
@@ -1026,7 +1042,7 @@ def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
         del t_ec
 
     # And we are done with edges!
-    del edges_map
+    del edges_fbx_idx
 
     # Loop normals.
     tspacenumber = 0
@@ -1128,10 +1144,7 @@ def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
     # Write VertexColor Layers.
     vcolnumber = len(me.vertex_colors)
     if vcolnumber:
-        def _coltuples_gen(raw_cols):
-            return zip(*(iter(raw_cols),) * 4)
-
-        t_lc = array.array(data_types.ARRAY_FLOAT64, (0.0,)) * len(me.loops) * 4
+        t_lc = np.empty(len(me.loops) * 4, dtype=np.float64)
         for colindex, collayer in enumerate(me.vertex_colors):
             collayer.data.foreach_get("color", t_lc)
             lay_vcol = elem_data_single_int32(geom, b"LayerElementColor", colindex)
@@ -1140,14 +1153,12 @@ def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
             elem_data_single_string(lay_vcol, b"MappingInformationType", b"ByPolygonVertex")
             elem_data_single_string(lay_vcol, b"ReferenceInformationType", b"IndexToDirect")
 
-            col2idx = tuple(set(_coltuples_gen(t_lc)))
-            elem_data_single_float64_array(lay_vcol, b"Colors", chain(*col2idx))  # Flatten again...
-
-            col2idx = {col: idx for idx, col in enumerate(col2idx)}
-            elem_data_single_int32_array(lay_vcol, b"ColorIndex", (col2idx[c] for c in _coltuples_gen(t_lc)))
+            col2idx, t_lcidx = np.unique(t_lc.reshape(-1, 4), axis=0, return_inverse=True)
+            elem_data_single_float64_array(lay_vcol, b"Colors", nparray_to_array(col2idx, data_types.ARRAY_FLOAT64))
+            elem_data_single_int32_array(lay_vcol, b"ColorIndex", nparray_to_array(t_lcidx, data_types.ARRAY_INT32))
             del col2idx
+            del t_lcidx
         del t_lc
-        del _coltuples_gen
 
     # Write UV layers.
     # Note: LayerElementTexture is deprecated since FBX 2011 - luckily!
@@ -1156,30 +1167,29 @@ def fbx_data_mesh_elements(root, me_obj, scene_data, done_meshes):
     if uvnumber:
         # Looks like this mapping is also expected to convey UV islands (arg..... :((((( ).
         # So we need to generate unique triplets (uv, vertex_idx) here, not only just based on UV values.
-        def _uvtuples_gen(raw_uvs, raw_lvidxs):
-            return zip(zip(*(iter(raw_uvs),) * 2), raw_lvidxs)
-
-        t_luv = array.array(data_types.ARRAY_FLOAT64, (0.0,)) * len(me.loops) * 2
-        t_lvidx = array.array(data_types.ARRAY_INT32, (0,)) * len(me.loops)
+        t_luv = np.empty(len(me.loops) * 2, dtype=np.float64)
+        t_lvidx = np.empty(len(me.loops), dtype=np.int32)
         me.loops.foreach_get("vertex_index", t_lvidx)
+        # (u, v, vertex_idx) rows, vertex indices are exactly represented as doubles.
+        t_luvids = np.empty((len(me.loops), 3), dtype=np.float64)
+        t_luvids[:, 2] = t_lvidx
         for uvindex, uvlayer in enumerate(me.uv_layers):
             uvlayer.data.foreach_get("uv", t_luv)
+            t_luvids[:, :2] = t_luv.reshape(-1, 2)
             lay_uv = elem_data_single_int32(geom, b"LayerElementUV", uvindex)
             elem_data_single_int32(lay_uv, b"Version", FBX_GEOMETRY_UV_VERSION)
             elem_data_single_string_unicode(lay_uv, b"Name", uvlayer.name)
             elem_data_single_string(lay_uv, b"MappingInformationType", b"ByPolygonVertex")
             elem_data_single_string(lay_uv, b"ReferenceInformationType", b"IndexToDirect")
 
-            uv_ids = tuple(set(_uvtuples_gen(t_luv, t_lvidx)))
-            elem_data_single_float64_array(lay_uv, b"UV", chain(*(uv for uv, vidx in uv_ids)))  # Flatten again...
-
-            uv2idx = {uv_id: idx for idx, uv_id in enumerate(uv_ids)}
-            elem_data_single_int32_array(lay_uv, b"UVIndex", (uv2idx[uv_id] for uv_id in _uvtuples_gen(t_luv, t_lvidx)))
-            del uv2idx
+            uv_ids, t_luvidx = np.unique(t_luvids, axis=0, return_inverse=True)
+            elem_data_single_float64_array(lay_uv, b"UV", nparray_to_array(uv_ids[:, :2], data_types.ARRAY_FLOAT64))
+            elem_data_single_int32_array(lay_uv, b"UVIndex", nparray_to_array(t_luvidx, data_types.ARRAY_INT32))
+            del t_luvidx
             del uv_ids
         del t_luv
         del t_lvidx
-        del _uvtuples_gen
+        del t_luvids
 
     # Face's materials.
     me_fbxmaterials_idx = scene_data.mesh_material_indices.get(me)
@@ -1547,14 +1557,22 @@ def fbx_data_armature_elements(root, arm_obj, scene_data):
             ob = ob_obj.bdata
             bo_vg_idx = {bo_obj.bdata.name: ob.vertex_groups[bo_obj.bdata.name].index
                          for bo_obj in clusters.keys() if bo_obj.bdata.name in ob.vertex_groups}
-            valid_idxs = set(bo_vg_idx.values())
-            vgroups = {vg.index: {} for vg in ob.vertex_groups}
-            verts_vgroups = (sorted(((vg.group, vg.weight) for vg in v.groups if vg.weight and vg.group in valid_idxs),
-                                    key=lambda e: e[1], reverse=True)
-                             for v in me.vertices)
-            for idx, vgs in enumerate(verts_vgroups):
-                for vg_idx, w in vgs:
-                    vgroups[vg_idx][idx] = w
+            valid_idxs = np.fromiter(bo_vg_idx.values(), dtype=np.int32, count=len(bo_vg_idx))
+            verts_groups = [v.groups for v in me.vertices]
+            vg_nbr = np.fromiter(map(len, verts_groups), dtype=np.int64, count=len(verts_groups))
+            vg_elems = [vg for groups in verts_groups for vg in groups]
+            del verts_groups
+            vg_verts = np.repeat(np.arange(len(vg_nbr), dtype=np.int32), vg_nbr)
+            vg_groups = np.fromiter((vg.group for vg in vg_elems), dtype=np.int32, count=len(vg_elems))
+            vg_weights = np.fromiter((vg.weight for vg in vg_elems), dtype=np.float64, count=len(vg_elems))
+            del vg_elems
+            vg_valid = (vg_weights != 0.0) & np.isin(vg_groups, valid_idxs)
+            # Group by vgroup, vertices remain in increasing order inside each of them.
+            vg_order = np.argsort(vg_groups[vg_valid], kind='stable')
+            vg_verts = vg_verts[vg_valid][vg_order]
+            vg_groups = vg_groups[vg_valid][vg_order]
+            vg_weights = vg_weights[vg_valid][vg_order]
+            del vg_nbr, vg_valid, vg_order
 
             for bo_obj, clstr_key in clusters.items():
                 bo = bo_obj.bdata
@@ -1562,7 +1580,12 @@ def fbx_data_armature_elements(root, arm_obj, scene_data):
                 # Note we still write a cluster for bones not affecting the mesh, to get 'rest pose' data
                 # (the TransformBlah matrices).
                 vg_idx = bo_vg_idx.get(bo.name, None)
-                indices, weights = ((), ()) if vg_idx is None or not vgroups[vg_idx] else zip(*vgroups[vg_idx].items())
+                if vg_idx is None:
+                    indices = weights = ()
+                else:
+                    vg_start, vg_end = np.searchsorted(vg_groups, (vg_idx, vg_idx + 1))
+                    indices = vg_verts[vg_start:vg_end]
+                    weights = vg_weights[vg_start:vg_end]
 
                 # Create the cluster.
                 fbx_clstr = elem_data_single_int64(root, b"Deformer", get_fbx_uuid_from_key(clstr_key))
@@ -1573,9 +1596,11 @@ def fbx_data_armature_elements(root, arm_obj, scene_data):
                 # No idea what that user data might be...
                 fbx_userdata = elem_data_single_string(fbx_clstr, b"UserData", b"")
                 fbx_userdata.add_string(b"")
-                if indices:
-                    elem_data_single_int32_array(fbx_clstr, b"Indexes", indices)
-                    elem_data_single_float64_array(fbx_clstr, b"Weights", weights)
+                if len(indices):
+                    elem_data_single_int32_array(fbx_clstr, b"Indexes",
+                                                 nparray_to_array(indices, data_types.ARRAY_INT32))
+                    elem_data_single_float64_array(fbx_clstr, b"Weights",
+                                                   nparray_to_array(weights, data_types.ARRAY_FLOAT64))
                 # Transform, TransformLink and TransformAssociateModel matrices...
                 # They seem to be doublons of BindPose ones??? Have armature (associatemodel) in addition, though.
                 # WARNING! Even though official FBX API presents Transform in global space,
@@ -1929,9 +1954,12 @@ def fbx_generate_leaf_bones(settings, data_bones):
     return leaf_bones
 
 
-def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=None, force_keep=False):
+def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=None, force_keep=False,
+                      frame_eval=None):
     """
     Generate animation data (a single AnimStack) from objects, for a given frame range.
+    If given, frame_eval(frame) is called for each sampled frame instead of setting the scene's current frame,
+    it is then responsible for updating the (baked) transforms of the objects.
     """
     bake_step = scene_data.settings.bake_anim_step
     simplify_fac = scene_data.settings.bake_anim_simplify_factor
@@ -1991,7 +2019,10 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
     currframe = f_start
     while currframe <= f_end:
         real_currframe = currframe - f_start if start_zero else currframe
-        scene.frame_set(int(currframe), subframe=currframe - int(currframe))
+        if frame_eval is None:
+            scene.frame_set(int(currframe), subframe=currframe - int(currframe))
+        else:
+            frame_eval(currframe)
 
         for dp_obj in ob_obj.dupli_list_gen(depsgraph):
             pass  # Merely updating dupli matrix of ObjectWrapper...
@@ -2009,7 +2040,8 @@ def fbx_animations_do(scene_data, ref_id, f_start, f_end, start_zero, objects=No
             anim_camera.add_keyframe(real_currframe, (camera.lens,))
         currframe += bake_step
 
-    scene.frame_set(back_currframe, subframe=0.0)
+    if frame_eval is None:
+        scene.frame_set(back_currframe, subframe=0.0)
 
     animations = {}
 
@@ -2154,6 +2186,79 @@ def fbx_animations(scene_data):
                 if not ob_to.is_property_readonly(p):
                     setattr(ob_to, p, getattr(ob_from, p))
 
+        def is_static(anim_data):
+            return anim_data is None or not (anim_data.action or anim_data.drivers or anim_data.nla_tracks)
+
+        def can_batch_actions(ob):
+            # Only the object's own actions may affect its transform (and its pose bones' ones).
+            if ob.parent or ob.constraints or ob.is_instancer:
+                return False
+            if ob.animation_data.drivers or (ob.animation_data.use_nla and ob.animation_data.nla_tracks):
+                return False
+            if ob.type == 'ARMATURE' and any(pbo.constraints for pbo in ob.pose.bones):
+                return False
+            return True
+
+        def batch_actions(ob_obj, actions):
+            # Sample the actions by evaluating their transform F-Curves directly and computing the pose ourselves,
+            # instead of setting each frame of each action on the whole scene.
+            ob = ob_obj.bdata
+            # Rest matrices are shared by all actions.
+            bones = ()
+            if ob.type == 'ARMATURE':
+                bones = tuple((ObjectWrapper(bo, ob), bo, ob.pose.bones[bo.name], bo.matrix_local.copy(),
+                               ObjectWrapper(bo.parent, ob), bo.parent.matrix_local.copy() if bo.parent else None)
+                              for bo in ob.data.bones)  # Parents always come before their children here.
+
+            org_values = {}
+            actions_channels = []
+            for act in actions:
+                act_channels = []
+                for fc in act.fcurves:
+                    if fc.mute or (fc.group and fc.group.mute):
+                        continue
+                    owner_path, _sep, prop = fc.data_path.rpartition('.')
+                    if prop not in BLENDER_TRANSFORM_PROPS:
+                        continue  # Does not affect any transform.
+                    try:
+                        owner = ob.path_resolve(owner_path) if owner_path else ob
+                    except ValueError:
+                        continue  # Invalid path (e.g. deleted bone) in org action, ignored as in scene evaluation.
+                    values = getattr(owner, prop)
+                    org_values.setdefault((owner, prop), tuple(values))
+                    act_channels.append((fc, values, fc.array_index))
+                actions_channels.append(act_channels)
+
+            def frame_eval(frame):
+                for fc, values, idx in channels:
+                    values[idx] = fc.evaluate(frame)
+                ob_obj.baked_matrix = ob.matrix_basis
+                for bo_obj, bo, pbo, mat_rest, par_obj, par_mat_rest in bones:
+                    if par_obj is None:
+                        bo_obj.baked_matrix = bo.convert_local_to_pose(pbo.matrix_basis, mat_rest)
+                    else:
+                        bo_obj.baked_matrix = bo.convert_local_to_pose(pbo.matrix_basis, mat_rest,
+                                                                       parent_matrix=par_obj.baked_matrix,
+                                                                       parent_matrix_local=par_mat_rest)
+
+            for act, channels in zip(actions, actions_channels):
+                frame_start, frame_end = act.frame_range  # sic!
+                add_anim(animations, animated,
+                         fbx_animations_do(scene_data, (ob, act), frame_start, frame_end, True,
+                                           objects={ob_obj}, force_keep=True, frame_eval=frame_eval))
+                # Back to org state, for channels not animated by next action.
+                for (owner, prop), values in org_values.items():
+                    setattr(owner, prop, values)
+                ob_obj.baked_matrix = None
+                for bo_obj, *_data in bones:
+                    bo_obj.baked_matrix = None
+
+        # Batching is only possible if the only things changing over time are the sampled objects' transforms.
+        use_batch_actions = (
+            scene_data.settings.bake_anim_batch_actions and
+            all(is_static(cam_obj.bdata.data.animation_data) for cam_obj in scene_data.data_cameras) and
+            all(is_static(me.shape_keys.animation_data) for me in scene_data.data_deformers_shape))
+
         for ob_obj in scene_data.objects:
             # Actions only for objects, not bones!
             if not ob_obj.is_object:
@@ -2167,20 +2272,24 @@ def fbx_animations(scene_data):
             if ob.animation_data.is_property_readonly('action'):
                 continue  # Cannot re-assign 'active action' to this object (usually related to NLA usage, see T48089).
 
+            org_act = ob.animation_data.action
+            path_resolve = ob.path_resolve
+
+            # For now, *all* paths in the action must be valid for the object, to validate the action.
+            # Unless that action was already assigned to the object!
+            actions = [act for act in bpy.data.actions if act == org_act or validate_actions(act, path_resolve)]
+
+            if use_batch_actions and can_batch_actions(ob):
+                batch_actions(ob_obj, actions)
+                continue
+
             # We can't play with animdata and actions and get back to org state easily.
             # So we have to add a temp copy of the object to the scene, animate it, and remove it... :/
             ob_copy = ob.copy()
             # Great, have to handle bones as well if needed...
             pbones_matrices = [pbo.matrix_basis.copy() for pbo in ob.pose.bones] if ob.type == 'ARMATURE' else ...
 
-            org_act = ob.animation_data.action
-            path_resolve = ob.path_resolve
-
-            for act in bpy.data.actions:
-                # For now, *all* paths in the action must be valid for the object, to validate the action.
-                # Unless that action was already assigned to the object!
-                if act != org_act and not validate_actions(act, path_resolve):
-                    continue
+            for act in actions:
                 ob.animation_data.action = act
                 frame_start, frame_end = act.frame_range  # sic!
                 add_anim(animations, animated,
@@ -2999,6 +3108,7 @@ def save_single(operator, scene, depsgraph, filepath="",
                 bake_anim_step=1.0,
                 bake_anim_simplify_factor=1.0,
                 bake_anim_force_startend_keying=True,
+                bake_anim_batch_actions=False,
                 add_leaf_bones=False,
                 primary_bone_axis='Y',
                 secondary_bone_axis='X',
@@ -3010,6 +3120,7 @@ def save_single(operator, scene, depsgraph, filepath="",
                 use_custom_props=False,
                 bake_space_transform=False,
                 armature_nodetype='NULL',
+                compression_level=1,
                 **kwargs
                 ):
 
@@ -3076,7 +3187,7 @@ def save_single(operator, scene, depsgraph, filepath="",
         armature_nodetype, use_armature_deform_only,
         add_leaf_bones, bone_correction_matrix, bone_correction_matrix_inv,
         bake_anim, bake_anim_use_all_bones, bake_anim_use_nla_strips, bake_anim_use_all_actions,
-        bake_anim_step, bake_anim_simplify_factor, bake_anim_force_startend_keying,
+        bake_anim_step, bake_anim_simplify_factor, bake_anim_force_startend_keying, bake_anim_batch_actions,
         False, media_settings, use_custom_props,
     )
 
@@ -3085,35 +3196,45 @@ def save_single(operator, scene, depsgraph, filepath="",
     print('\nFBX export starting... %r' % filepath)
     start_time = time.process_time()
 
-    # Generate some data about exported scene...
-    scene_data = fbx_data_from_scene(scene, depsgraph, settings)
+    # Array properties get compressed in background threads while the elements tree is built.
+    encode_bin.init_write(compression_level)
+    try:
+        # Generate some data about exported scene...
+        scene_data = fbx_data_from_scene(scene, depsgraph, settings)
 
-    root = elem_empty(None, b"")  # Root element has no id, as it is not saved per se!
+        root = elem_empty(None, b"")  # Root element has no id, as it is not saved per se!
 
-    # Mostly FBXHeaderExtension and GlobalSettings.
-    fbx_header_elements(root, scene_data)
+        # Mostly FBXHeaderExtension and GlobalSettings.
+        fbx_header_elements(root, scene_data)
 
-    # Documents and References are pretty much void currently.
-    fbx_documents_elements(root, scene_data)
-    fbx_references_elements(root, scene_data)
+        # Documents and References are pretty much void currently.
+        fbx_documents_elements(root, scene_data)
+        fbx_references_elements(root, scene_data)
 
-    # Templates definitions.
-    fbx_definitions_elements(root, scene_data)
+        # Templates definitions.
+        fbx_definitions_elements(root, scene_data)
 
-    # Actual data.
-    fbx_objects_elements(root, scene_data)
+        # Actual data.
+        fbx_objects_elements(root, scene_data)
 
-    # How data are inter-connected.
-    fbx_connections_elements(root, scene_data)
+        # How data are inter-connected.
+        fbx_connections_elements(root, scene_data)
 
-    # Animation.
-    fbx_takes_elements(root, scene_data)
+        # Animation.
+        fbx_takes_elements(root, scene_data)
 
-    # Cleanup!
-    fbx_scene_data_cleanup(scene_data)
+        # Cleanup!
+        fbx_scene_data_cleanup(scene_data)
 
-    # And we are down, we can write the whole thing!
-    encode_bin.write(filepath, root, FBX_VERSION)
+        # And we are down, we can write the whole thing!
+        perfmon = PerfMon()
+        perfmon.level_up()
+        perfmon.step("FBX export: Writing file...")
+        encode_bin.write(filepath, root, FBX_VERSION)
+        perfmon.level_down()
+    finally:
+        # Do not leave the compression thread pool running if anything above failed.
+        encode_bin.end_write()
 
     # Clear cached ObjectWrappers!
     ObjectWrapper.cache_clear()
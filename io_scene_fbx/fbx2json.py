@@ -26,10 +26,17 @@
 Usage
 =====
 
-   fbx2json [FILES]...
+   fbx2json [--max-array-length=N] [FILES]...
 
 This script will write a JSON file for each FBX argument given.
 
+Elements are converted as they are read, so that huge files can be converted
+without loading them whole in memory.
+
+--max-array-length=N: summarize arrays of more than N items as
+   ``{"length": ..., "min": ..., "max": ...}`` instead of writing them
+   (such JSON files can not be converted back to FBX).
+
 
 Output
 ======
@@ -67,207 +74,18 @@ ensured to be unique.
 
 
 # ----------------------------------------------------------------------------
-# FBX Binary Parser
-
-from struct import unpack
-import array
-import zlib
-
-# at the end of each nested block, there is a NUL record to indicate
-# that the sub-scope exists (i.e. to distinguish between P: and P : {})
-_BLOCK_SENTINEL_LENGTH = ...
-_BLOCK_SENTINEL_DATA = ...
-read_fbx_elem_uint = ...
-_IS_BIG_ENDIAN = (__import__("sys").byteorder != 'little')
-_HEAD_MAGIC = b'Kaydara FBX Binary\x20\x20\x00\x1a\x00'
-from collections import namedtuple
-FBXElem = namedtuple("FBXElem", ("id", "props", "props_type", "elems"))
-del namedtuple
-
-
-def read_uint(read):
-    return unpack(b'<I', read(4))[0]
-
-
-def read_uint64(read):
-    return unpack(b'<Q', read(8))[0]
-
-
-def read_ubyte(read):
-    return unpack(b'B', read(1))[0]
-
-
-def read_string_ubyte(read):
-    size = read_ubyte(read)
-    data = read(size)
-    return data
-
-
-def unpack_array(read, array_type, array_stride, array_byteswap):
-    length = read_uint(read)
-    encoding = read_uint(read)
-    comp_len = read_uint(read)
-
-    data = read(comp_len)
-
-    if encoding == 0:
-        pass
-    elif encoding == 1:
-        data = zlib.decompress(data)
-
-    assert(length * array_stride == len(data))
-
-    data_array = array.array(array_type, data)
-    if array_byteswap and _IS_BIG_ENDIAN:
-        data_array.byteswap()
-    return data_array
-
-
-read_data_dict = {
-    b'Y'[0]: lambda read: unpack(b'<h', read(2))[0],  # 16 bit int
-    b'C'[0]: lambda read: unpack(b'?', read(1))[0],   # 1 bit bool (yes/no)
-    b'I'[0]: lambda read: unpack(b'<i', read(4))[0],  # 32 bit int
-    b'F'[0]: lambda read: unpack(b'<f', read(4))[0],  # 32 bit float
-    b'D'[0]: lambda read: unpack(b'<d', read(8))[0],  # 64 bit float
-    b'L'[0]: lambda read: unpack(b'<q', read(8))[0],  # 64 bit int
-    b'R'[0]: lambda read: read(read_uint(read)),      # binary data
-    b'S'[0]: lambda read: read(read_uint(read)),      # string data
-    b'f'[0]: lambda read: unpack_array(read, 'f', 4, False),  # array (float)
-    b'i'[0]: lambda read: unpack_array(read, 'i', 4, True),   # array (int)
-    b'd'[0]: lambda read: unpack_array(read, 'd', 8, False),  # array (double)
-    b'l'[0]: lambda read: unpack_array(read, 'q', 8, True),   # array (long)
-    b'b'[0]: lambda read: unpack_array(read, 'b', 1, False),  # array (bool)
-    b'c'[0]: lambda read: unpack_array(read, 'B', 1, False),  # array (ubyte)
-    }
-
-
-# FBX 7500 (aka FBX2016) introduces incompatible changes at binary level:
-#   * The NULL block marking end of nested stuff switches from 13 bytes long to 25 bytes long.
-#   * The FBX element metadata (end_offset, prop_count and prop_length) switch from uint32 to uint64.
-def init_version(fbx_version):
-    global _BLOCK_SENTINEL_LENGTH, _BLOCK_SENTINEL_DATA, read_fbx_elem_uint
-
-    assert(_BLOCK_SENTINEL_LENGTH == ...)
-    assert(_BLOCK_SENTINEL_DATA == ...)
-
-    if fbx_version < 7500:
-        _BLOCK_SENTINEL_LENGTH = 13
-        read_fbx_elem_uint = read_uint
-    else:
-        _BLOCK_SENTINEL_LENGTH = 25
-        read_fbx_elem_uint = read_uint64
-    _BLOCK_SENTINEL_DATA = (b'\0' * _BLOCK_SENTINEL_LENGTH)
-
-
-def read_elem(read, tell, use_namedtuple):
-    # [0] the offset at which this block ends
-    # [1] the number of properties in the scope
-    # [2] the length of the property list
-    end_offset = read_fbx_elem_uint(read)
-    if end_offset == 0:
-        return None
-
-    prop_count = read_fbx_elem_uint(read)
-    prop_length = read_fbx_elem_uint(read)
-
-    elem_id = read_string_ubyte(read)        # elem name of the scope/key
-    elem_props_type = bytearray(prop_count)  # elem property types
-    elem_props_data = [None] * prop_count    # elem properties (if any)
-    elem_subtree = []                        # elem children (if any)
-
-    for i in range(prop_count):
-        data_type = read(1)[0]
-        elem_props_data[i] = read_data_dict[data_type](read)
-        elem_props_type[i] = data_type
-
-    if tell() < end_offset:
-        while tell() < (end_offset - _BLOCK_SENTINEL_LENGTH):
-            elem_subtree.append(read_elem(read, tell, use_namedtuple))
-
-        if read(_BLOCK_SENTINEL_LENGTH) != _BLOCK_SENTINEL_DATA:
-            raise IOError("failed to read nested block sentinel, "
-                          "expected all bytes to be 0")
-
-    if tell() != end_offset:
-        raise IOError("scope length not reached, something is wrong")
-
-    args = (elem_id, elem_props_data, elem_props_type, elem_subtree)
-    return FBXElem(*args) if use_namedtuple else args
-
-
-def parse_version(fn):
-    """
-    Return the FBX version,
-    if the file isn't a binary FBX return zero.
-    """
-    with open(fn, 'rb') as f:
-        read = f.read
-
-        if read(len(_HEAD_MAGIC)) != _HEAD_MAGIC:
-            return 0
-
-        return read_uint(read)
-
-
-def parse(fn, use_namedtuple=True):
-    root_elems = []
-
-    with open(fn, 'rb') as f:
-        read = f.read
-        tell = f.tell
-
-        if read(len(_HEAD_MAGIC)) != _HEAD_MAGIC:
-            raise IOError("Invalid header")
-
-        fbx_version = read_uint(read)
-        init_version(fbx_version)
-
-        while True:
-            elem = read_elem(read, tell, use_namedtuple)
-            if elem is None:
-                break
-            root_elems.append(elem)
-
-    args = (b'', [], bytearray(0), root_elems)
-    return FBXElem(*args) if use_namedtuple else args, fbx_version
-
+# JSON Converter
 
-# ----------------------------------------------------------------------------
-# Inline Modules
-
-# pyfbx.data_types
-data_types = type(array)("data_types")
-data_types.__dict__.update(
-dict(
-INT16 = b'Y'[0],
-BOOL = b'C'[0],
-INT32 = b'I'[0],
-FLOAT32 = b'F'[0],
-FLOAT64 = b'D'[0],
-INT64 = b'L'[0],
-BYTES = b'R'[0],
-STRING = b'S'[0],
-FLOAT32_ARRAY = b'f'[0],
-INT32_ARRAY = b'i'[0],
-FLOAT64_ARRAY = b'd'[0],
-INT64_ARRAY = b'l'[0],
-BOOL_ARRAY = b'b'[0],
-BYTE_ARRAY = b'c'[0],
-))
-
-# pyfbx.parse_bin
-parse_bin = type(array)("parse_bin")
-parse_bin.__dict__.update(
-dict(
-parse = parse
-))
+import json
 
+try:
+    from . import parse_fbx, data_types
+except:
+    import parse_fbx
+    import data_types
 
-# ----------------------------------------------------------------------------
-# JSON Converter
-# from pyfbx import parse_bin, data_types
-import json
-import array
+# Number of array items converted at once.
+_ARRAY_CHUNK_SIZE = 65536
 
 
 def fbx2json_property_as_string(prop, prop_type):
@@ -281,51 +99,65 @@ def fbx2json_property_as_string(prop, prop_type):
             return json.dumps(repr(prop)[2:-1])
         elif prop_py_type == bool:
             return json.dumps(prop)
-        elif prop_py_type == array.array:
-            return repr(list(prop))
 
     return repr(prop)
 
 
-def fbx2json_properties_as_string(fbx_elem):
-    return ", ".join(fbx2json_property_as_string(*prop_item)
-                     for prop_item in zip(fbx_elem.props,
-                                          fbx_elem.props_type))
-
-
-def fbx2json_recurse(fw, fbx_elem, ident, is_last):
-    fbx_elem_id = fbx_elem.id.decode('utf-8')
-    fw('%s["%s", ' % (ident, fbx_elem_id))
-    fw('[%s], ' % fbx2json_properties_as_string(fbx_elem))
-    fw('"%s", ' % (fbx_elem.props_type.decode('ascii')))
+def fbx2json_array_write(fw, prop, max_array_length):
+    data = prop.to_array()
+    if max_array_length is not None and len(data) > max_array_length:
+        fw('{"length": %d, "min": %r, "max": %r}' % (len(data), min(data), max(data)))
+        return
 
     fw('[')
-    if fbx_elem.elems:
-        fw('\n')
-        ident_sub = ident + "    "
-        for fbx_elem_sub in fbx_elem.elems:
-            fbx2json_recurse(fw, fbx_elem_sub, ident_sub,
-                             fbx_elem_sub is fbx_elem.elems[-1])
+    for i in range(0, len(data), _ARRAY_CHUNK_SIZE):
+        if i:
+            fw(', ')
+        fw(", ".join(map(repr, data[i:i + _ARRAY_CHUNK_SIZE])))
     fw(']')
 
-    fw(']%s' % ('' if is_last else ',\n'))
+
+def fbx2json_properties_write(fw, fbx_elem, max_array_length):
+    for i, (prop, prop_type) in enumerate(zip(fbx_elem.props, fbx_elem.props_type)):
+        if i:
+            fw(', ')
+        if prop.__class__ is parse_fbx.FBXArray:
+            fbx2json_array_write(fw, prop, max_array_length)
+        else:
+            fw(fbx2json_property_as_string(prop, prop_type))
 
 
-def fbx2json(fn):
+def fbx2json(fn, max_array_length=None):
     import os
 
     fn_json = "%s.json" % os.path.splitext(fn)[0]
     print("Writing: %r " % fn_json, end="")
-    fbx_root_elem, fbx_version = parse(fn, use_namedtuple=True)
+    fbx_version = parse_fbx.parse_version(fn)
     print("(Version %d) ..." % fbx_version)
 
     with open(fn_json, 'w', encoding="ascii", errors='xmlcharrefreplace') as f:
         fw = f.write
         fw('[\n')
-        ident_sub = "    "
-        for fbx_elem_sub in fbx_root_elem.elems:
-            fbx2json_recurse(f.write, fbx_elem_sub, ident_sub,
-                             fbx_elem_sub is fbx_root_elem.elems[-1])
+        # Elements come in depth-first order, the subtree list of the previous one is still open,
+        # it gets closed (with those of its parents) once we know its next sibling.
+        prev_depth = -1
+        for depth, fbx_elem in parse_fbx.parse_iter(fn):
+            if depth > prev_depth:
+                if prev_depth != -1:
+                    fw('\n')
+            else:
+                fw(']]' * (prev_depth - depth + 1))
+                fw(',\n')
+            prev_depth = depth
+
+            fbx_elem_id = fbx_elem.id.decode('utf-8')
+            fw('%s["%s", ' % ("    " * (depth + 1), fbx_elem_id))
+            fw('[')
+            fbx2json_properties_write(fw, fbx_elem, max_array_length)
+            fw('], ')
+            fw('"%s", ' % (fbx_elem.props_type.decode('ascii')))
+            fw('[')
+        fw(']]' * (prev_depth + 1))
         fw(']\n')
 
 
@@ -339,9 +171,17 @@ def main():
         print(__doc__)
         return
 
+    max_array_length = None
+    files = []
     for arg in sys.argv[1:]:
+        if arg.startswith("--max-array-length="):
+            max_array_length = int(arg.split("=", 1)[1])
+        else:
+            files.append(arg)
+
+    for arg in files:
         try:
-            fbx2json(arg)
+            fbx2json(arg, max_array_length)
         except:
             print("Failed to convert %r, error:" % arg)
 
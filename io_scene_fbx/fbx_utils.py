@@ -21,6 +21,7 @@
 # Script copyright (C) Campbell Barton, Bastien Montagne
 
 
+import array
 import math
 import time
 
@@ -30,6 +31,7 @@ from itertools import zip_longest, chain
 
 import bpy
 import bpy_extras
+import numpy as np
 from bpy.types import Object, Bone, PoseBone, DepsgraphObjectInstance
 from mathutils import Vector, Matrix
 
@@ -81,6 +83,11 @@ MAT_CONVERT_BONE = Matrix()
 
 BLENDER_OTHER_OBJECT_TYPES = {'CURVE', 'SURFACE', 'FONT', 'META'}
 BLENDER_OBJECT_TYPES_MESHLIKE = {'MESH'} | BLENDER_OTHER_OBJECT_TYPES
+# Animatable properties defining the transform of objects and pose bones.
+BLENDER_TRANSFORM_PROPS = {
+    'location', 'rotation_euler', 'rotation_quaternion', 'rotation_axis_angle', 'scale',
+    'delta_location', 'delta_rotation_euler', 'delta_rotation_quaternion', 'delta_scale',
+}
 
 
 # Lamps.
@@ -153,52 +160,56 @@ FBX_FRAMERATES = (
 # Enable performance reports (measuring time used to perform various steps of importing or exporting).
 DO_PERFMON = False
 
-if DO_PERFMON:
-    class PerfMon():
-        def __init__(self):
-            self.level = -1
-            self.ref_time = []
 
-        def level_up(self, message=""):
-            self.level += 1
-            self.ref_time.append(None)
-            if message:
-                print("\t" * self.level, message, sep="")
+class PerfMon():
+    # When set to a list, all finished steps get appended to it as (level, message, wall clock seconds) tuples
+    # (see benchmark_fbx.py).
+    records = None
+
+    def __init__(self):
+        self.level = -1
+        self.ref_time = []
+        self.ref_step = []
+
+    def _end_step(self):
+        message, ref_time = self.ref_step[self.level]
+        if ref_time is not None and PerfMon.records is not None:
+            PerfMon.records.append((self.level, message, time.perf_counter() - ref_time))
+
+    def level_up(self, message=""):
+        self.level += 1
+        self.ref_time.append(None)
+        self.ref_step.append(("", None))
+        if DO_PERFMON and message:
+            print("\t" * self.level, message, sep="")
 
-        def level_down(self, message=""):
-            if not self.ref_time:
-                if message:
-                    print(message)
-                return
+    def level_down(self, message=""):
+        if not self.ref_time:
+            if DO_PERFMON and message:
+                print(message)
+            return
+        self._end_step()
+        if DO_PERFMON:
             ref_time = self.ref_time[self.level]
             print("\t" * self.level,
                   "\tDone (%f sec)\n" % ((time.process_time() - ref_time) if ref_time is not None else 0.0),
                   sep="")
             if message:
                 print("\t" * self.level, message, sep="")
-            del self.ref_time[self.level]
-            self.level -= 1
-
-        def step(self, message=""):
+        del self.ref_time[self.level]
+        del self.ref_step[self.level]
+        self.level -= 1
+
+    def step(self, message=""):
+        self._end_step()
+        self.ref_step[self.level] = (message, time.perf_counter())
+        if DO_PERFMON:
             ref_time = self.ref_time[self.level]
             curr_time = time.process_time()
             if ref_time is not None:
                 print("\t" * self.level, "\tDone (%f sec)\n" % (curr_time - ref_time), sep="")
             self.ref_time[self.level] = curr_time
             print("\t" * self.level, message, sep="")
-else:
-    class PerfMon():
-        def __init__(self):
-            pass
-
-        def level_up(self, message=""):
-            pass
-
-        def level_down(self, message=""):
-            pass
-
-        def step(self, message=""):
-            pass
 
 
 # Scale/unit mess. FBX can store the 'reference' unit of a file in its UnitScaleFactor property
@@ -270,6 +281,10 @@ def similar_values_iter(v1, v2, e=1e-6):
             return False
     return True
 
+def nparray_to_array(data, array_type):
+    """Convert a NumPy array into an array.array of given type code (values are cast if needed)."""
+    return array.array(array_type, np.ascontiguousarray(data, dtype=array_type).tobytes())
+
 def vcos_transformed_gen(raw_cos, m=None):
     # Note: we could most likely get much better performances with numpy, but will leave this as TODO for now.
     gen = zip(*(iter(raw_cos),) * 3)
@@ -726,7 +741,8 @@ class AnimationCurveNodeWrapper:
     and easy API to handle those.
     """
     __slots__ = (
-        'elem_keys', '_keys', 'default_values', 'fbx_group', 'fbx_gname', 'fbx_props',
+        'elem_keys', '_frames', '_values', '_write_flags', '_nbr_keys',
+        'default_values', 'fbx_group', 'fbx_gname', 'fbx_props',
         'force_keying', 'force_startend_keying')
 
     kinds = {
@@ -745,7 +761,12 @@ class AnimationCurveNodeWrapper:
         self.fbx_props = [self.kinds[kind][2]]
         self.force_keying = force_keying
         self.force_startend_keying = force_startend_keying
-        self._keys = []  # (frame, values, write_flags)
+        # Baked keys, stored in arrays grown as needed (only the first _nbr_keys items are valid).
+        nbr_channels = len(self.fbx_props[0])
+        self._frames = np.empty(0, dtype=np.float64)
+        self._values = np.empty((0, nbr_channels), dtype=np.float64)
+        self._write_flags = np.empty((0, nbr_channels), dtype=bool)
+        self._nbr_keys = 0
         if default_values is not ...:
             assert(len(default_values) == len(self.fbx_props[0]))
             self.default_values = default_values
@@ -754,7 +775,7 @@ class AnimationCurveNodeWrapper:
 
     def __bool__(self):
         # We are 'True' if we do have some validated keyframes...
-        return bool(self._keys) and (True in ((True in k[2]) for k in self._keys))
+        return bool(self._nbr_keys) and bool(self._write_flags[:self._nbr_keys].any())
 
     def add_group(self, elem_key, fbx_group, fbx_gname, fbx_props):
         """
@@ -772,14 +793,23 @@ class AnimationCurveNodeWrapper:
         Add a new keyframe to all curves of the group.
         """
         assert(len(values) == len(self.fbx_props[0]))
-        self._keys.append((frame, values, [True] * len(values)))  # write everything by default.
+        idx = self._nbr_keys
+        if idx == len(self._frames):
+            size = max(idx * 2, 64)
+            self._frames = np.resize(self._frames, size)
+            self._values = np.resize(self._values, (size, self._values.shape[1]))
+            self._write_flags = np.resize(self._write_flags, (size, self._write_flags.shape[1]))
+        self._frames[idx] = frame
+        self._values[idx] = values
+        self._write_flags[idx] = True  # write everything by default.
+        self._nbr_keys = idx + 1
 
     def simplify(self, fac, step, force_keep=False):
         """
         Simplifies sampled curves by only enabling samples when:
             * their values relatively differ from the previous sample ones.
         """
-        if not self._keys:
+        if not self._nbr_keys:
             return
 
         if fac == 0.0:
@@ -788,36 +818,57 @@ class AnimationCurveNodeWrapper:
         # So that, with default factor and step values (1), we get:
         min_reldiff_fac = fac * 1.0e-3  # min relative value evolution: 0.1% of current 'order of magnitude'.
         min_absdiff_fac = 0.1  # A tenth of reldiff...
-        keys = self._keys
-
-        p_currframe, p_key, p_key_write = keys[0]
-        p_keyed = list(p_key)
-        are_keyed = [False] * len(p_key)
-        for currframe, key, key_write in keys:
-            for idx, (val, p_val) in enumerate(zip(key, p_key)):
-                key_write[idx] = False
-                p_keyedval = p_keyed[idx]
-                if val == p_val:
-                    # Never write keyframe when value is exactly the same as prev one!
-                    continue
-                # This is contracted form of relative + absolute-near-zero difference:
-                #     absdiff = abs(a - b)
-                #     if absdiff < min_reldiff_fac * min_absdiff_fac:
-                #         return False
-                #     return (absdiff / ((abs(a) + abs(b)) / 2)) > min_reldiff_fac
-                # Note that we ignore the '/ 2' part here, since it's not much significant for us.
-                if abs(val - p_val) > (min_reldiff_fac * max(abs(val) + abs(p_val), min_absdiff_fac)):
-                    # If enough difference from previous sampled value, key this value *and* the previous one!
-                    key_write[idx] = True
-                    p_key_write[idx] = True
-                    p_keyed[idx] = val
-                    are_keyed[idx] = True
-                elif abs(val - p_keyedval) > (min_reldiff_fac * max((abs(val) + abs(p_keyedval)), min_absdiff_fac)):
-                    # Else, if enough difference from previous keyed value, key this value only!
-                    key_write[idx] = True
-                    p_keyed[idx] = val
-                    are_keyed[idx] = True
-            p_currframe, p_key, p_key_write = currframe, key, key_write
+        values = self._values[:self._nbr_keys]
+        keys_write = self._write_flags[:self._nbr_keys]
+        keys_write[:] = False
+
+        def are_different(vals, p_vals):
+            # This is contracted form of relative + absolute-near-zero difference:
+            #     absdiff = abs(a - b)
+            #     if absdiff < min_reldiff_fac * min_absdiff_fac:
+            #         return False
+            #     return (absdiff / ((abs(a) + abs(b)) / 2)) > min_reldiff_fac
+            # Note that we ignore the '/ 2' part here, since it's not much significant for us.
+            return np.abs(vals - p_vals) > (min_reldiff_fac *
+                                            np.maximum(np.abs(vals) + np.abs(p_vals), min_absdiff_fac))
+
+        # Never write keyframe when value is exactly the same as prev one! (first key is compared to itself).
+        changed = np.zeros(values.shape, dtype=bool)
+        changed[1:] = values[1:] != values[:-1]
+        # If enough difference from previous sampled value, key this value *and* the previous one!
+        keyed = changed.copy()
+        keyed[1:] &= are_different(values[1:], values[:-1])
+        keys_write |= keyed
+        keys_write[:-1] |= keyed[1:]
+
+        # Else, if enough difference from previous keyed value, key this value only!
+        # Only runs of samples between keyed ones need to be checked, sequentially, since each new key
+        # becomes the reference for the following samples.
+        nbr_changed = np.zeros((values.shape[0] + 1, values.shape[1]), dtype=np.int64)
+        np.cumsum(changed, axis=0, out=nbr_changed[1:])
+        for idx in range(values.shape[1]):
+            c_values = values[:, idx]
+            c_changed = changed[:, idx]
+            c_keyed = np.flatnonzero(keyed[:, idx])
+            refs = np.concatenate(((0,), c_keyed))
+            ends = np.concatenate((c_keyed, (len(c_values),)))
+            todo = nbr_changed[ends, idx] - nbr_changed[refs + 1, idx] > 0
+            for ref, end in zip(refs[todo].tolist(), ends[todo].tolist()):
+                start = ref + 1
+                window = 16
+                while start < end:
+                    stop = min(start + window, end)
+                    far = c_changed[start:stop] & are_different(c_values[start:stop], c_values[ref])
+                    i = int(far.argmax())
+                    if far[i]:
+                        ref = start + i
+                        keys_write[ref, idx] = True
+                        start = ref + 1
+                        window = 16
+                    else:
+                        start = stop
+                        window *= 2
+        are_keyed = keys_write.any(axis=0)
 
         # If we write nothing (action doing nothing) and are in 'force_keep' mode, we key everything! :P
         # See T41766.
@@ -826,24 +877,22 @@ class AnimationCurveNodeWrapper:
         # one key in this case.
         # See T41719, T41605, T41254...
         if self.force_keying or (force_keep and not self):
-            are_keyed[:] = [True] * len(are_keyed)
+            are_keyed[:] = True
 
         # If we did key something, ensure first and last sampled values are keyed as well.
         if self.force_startend_keying:
-            for idx, is_keyed in enumerate(are_keyed):
-                if is_keyed:
-                    keys[0][2][idx] = keys[-1][2][idx] = True
+            keys_write[0, are_keyed] = True
+            keys_write[-1, are_keyed] = True
 
     def get_final_data(self, scene, ref_id, force_keep=False):
         """
         Yield final anim data for this 'curvenode' (for all curvenodes defined).
         force_keep is to force to keep a curve even if it only has one valid keyframe.
         """
-        curves = [[] for k in self._keys[0][1]]
-        for currframe, key, key_write in self._keys:
-            for curve, val, wrt in zip(curves, key, key_write):
-                if wrt:
-                    curve.append((currframe, val))
+        frames = self._frames[:self._nbr_keys]
+        values = self._values[:self._nbr_keys]
+        keys_write = self._write_flags[:self._nbr_keys]
+        curves = [list(zip(frames[wrt].tolist(), vals[wrt].tolist())) for vals, wrt in zip(values.T, keys_write.T)]
 
         force_keep = force_keep or self.force_keying
         for elem_key, fbx_group, fbx_gname, fbx_props in \
@@ -917,7 +966,7 @@ class ObjectWrapper(metaclass=MetaObjectWrapper):
     """
     __slots__ = (
         'name', 'key', 'bdata', 'parented_to_armature',
-        '_tag', '_ref', '_dupli_matrix'
+        '_tag', '_ref', '_dupli_matrix', 'baked_matrix'
     )
 
     @classmethod
@@ -971,6 +1020,9 @@ class ObjectWrapper(metaclass=MetaObjectWrapper):
             self.bdata = bdata
             self._ref = armature
         self.parented_to_armature = False
+        # Transform evaluated outside of the depsgraph, used instead of the Blender one when set
+        # (pose matrix in armature space for bones, world matrix for parentless objects).
+        self.baked_matrix = None
 
     def __eq__(self, other):
         return isinstance(other, self.__class__) and self.key == other.key
@@ -1017,6 +1069,12 @@ class ObjectWrapper(metaclass=MetaObjectWrapper):
     bdata_pose_bone = property(get_bdata_pose_bone)
 
     def get_matrix_local(self):
+        if self.baked_matrix is not None:
+            if self._tag == 'BO':
+                par = self.bdata.parent
+                par_mat_inv = ObjectWrapper(par, self._ref).baked_matrix.inverted_safe() if par else Matrix()
+                return par_mat_inv @ self.baked_matrix
+            return self.baked_matrix.copy()
         if self._tag == 'OB':
             return self.bdata.matrix_local.copy()
         elif self._tag == 'DP':
@@ -1029,6 +1087,10 @@ class ObjectWrapper(metaclass=MetaObjectWrapper):
     matrix_local = property(get_matrix_local)
 
     def get_matrix_global(self):
+        if self.baked_matrix is not None:
+            if self._tag == 'BO':
+                return ObjectWrapper(self._ref).matrix_global @ self.baked_matrix
+            return self.baked_matrix.copy()
         if self._tag == 'OB':
             return self.bdata.matrix_world.copy()
         elif self._tag == 'DP':
@@ -1229,7 +1291,7 @@ FBXExportSettings = namedtuple("FBXExportSettings", (
     "armature_nodetype", "use_armature_deform_only", "add_leaf_bones",
     "bone_correction_matrix", "bone_correction_matrix_inv",
     "bake_anim", "bake_anim_use_all_bones", "bake_anim_use_nla_strips", "bake_anim_use_all_actions",
-    "bake_anim_step", "bake_anim_simplify_factor", "bake_anim_force_startend_keying",
+    "bake_anim_step", "bake_anim_simplify_factor", "bake_anim_force_startend_keying", "bake_anim_batch_actions",
     "use_metadata", "media_settings", "use_custom_props",
 ))
 
@@ -33,6 +33,7 @@ if "bpy" in locals():
         importlib.reload(fbx_utils)
 
 import bpy
+import numpy as np
 from mathutils import Matrix, Euler, Vector
 
 # -----
@@ -42,6 +43,7 @@ from . import parse_fbx, fbx_utils
 from .parse_fbx import (
     data_types,
     FBXElem,
+    FBXArray,
 )
 from .fbx_utils import (
     PerfMon,
@@ -166,7 +168,11 @@ def elem_uuid(elem):
 
 
 def elem_prop_first(elem, default=None):
-    return elem.props[0] if (elem is not None) and elem.props else default
+    if (elem is None) or not elem.props:
+        return default
+    prop = elem.props[0]
+    # Arrays of lazily parsed files are only decompressed when actually used.
+    return prop.to_array() if prop.__class__ is FBXArray else prop
 
 
 # ----
@@ -461,6 +467,69 @@ def blen_read_object_transform_do(transform_data):
     return (base_mat @ geom_mat, base_mat, geom_mat)
 
 
+def blen_read_euler_array_to_matrix(rots, rot_ord):
+    """
+    Vectorized equivalent of Euler(convert_deg_to_rad_iter(rot), rot_ord).to_matrix(),
+    for an (n, 3) array of FBX (degrees) euler rotations. Returns an (n, 3, 3) array of matrices.
+    """
+    angles = np.deg2rad(rots)
+    cos = np.cos(angles)
+    sin = np.sin(angles)
+    mat = np.broadcast_to(np.identity(3), (len(rots), 3, 3))
+    # First axis of rot_ord is applied first, i.e. 'XYZ' gives Rz @ Ry @ Rx.
+    for axis in rot_ord:
+        i = 'XYZ'.index(axis)
+        j, k = (i + 1) % 3, (i + 2) % 3
+        axis_mat = np.zeros((len(rots), 3, 3))
+        axis_mat[:, i, i] = 1.0
+        axis_mat[:, j, j] = axis_mat[:, k, k] = cos[:, i]
+        axis_mat[:, k, j] = sin[:, i]
+        axis_mat[:, j, k] = -sin[:, i]
+        mat = axis_mat @ mat
+    return mat
+
+
+def blen_read_object_transform_do_array(transform_data, locs, rots, scas):
+    """
+    Vectorized version of blen_read_object_transform_do(), for (n, 3) arrays of local translations,
+    rotations and scales, all other transform data being constant.
+    Returns an (n, 4, 4) array of matrices, geometric transforms included.
+    """
+    to_rot = lambda rot, rot_ord: Euler(convert_deg_to_rad_iter(rot), rot_ord).to_matrix().to_4x4()
+    rot_piv = Matrix.Translation(transform_data.rot_piv)
+    sca_piv = Matrix.Translation(transform_data.sca_piv)
+    geom_mat = (
+        Matrix.Translation(transform_data.geom_loc) @
+        to_rot(transform_data.geom_rot, transform_data.rot_ord) @
+        Matrix.Diagonal((*transform_data.geom_sca, 1.0))
+    )
+
+    # Constant parts of the transform, between the animated translation, rotation and scale.
+    rot_pre_mat = np.array(
+        Matrix.Translation(transform_data.rot_ofs) @
+        rot_piv @
+        to_rot(transform_data.pre_rot, transform_data.rot_ord)
+    )
+    rot_pst_mat = np.array(
+        transform_data.rot_alt_mat @
+        to_rot(transform_data.pst_rot, transform_data.rot_ord) @
+        rot_piv.inverted_safe() @
+        Matrix.Translation(transform_data.sca_ofs) @
+        sca_piv
+    )
+    sca_pst_mat = np.array(sca_piv.inverted_safe() @ geom_mat)
+
+    nbr_frames = len(locs)
+    lcl_translation = np.tile(np.identity(4), (nbr_frames, 1, 1))
+    lcl_translation[:, :3, 3] = locs
+    lcl_rot = np.tile(np.identity(4), (nbr_frames, 1, 1))
+    lcl_rot[:, :3, :3] = blen_read_euler_array_to_matrix(rots, transform_data.rot_ord)
+    lcl_scale = np.tile(np.identity(4), (nbr_frames, 1, 1))
+    lcl_scale[:, 0, 0], lcl_scale[:, 1, 1], lcl_scale[:, 2, 2] = np.transpose(scas)
+
+    return lcl_translation @ rot_pre_mat @ lcl_rot @ rot_pst_mat @ lcl_scale @ sca_pst_mat
+
+
 # XXX This might be weak, now that we can add vgroups from both bones and shapes, name collisions become
 #     more likely, will have to make this more robust!!!
 def add_vgroup_to_objects(vg_indices, vg_weights, vg_name, objects):
@@ -523,10 +592,10 @@ def blen_read_object_transform_preprocess(fbx_props, fbx_obj, rot_alt_mat, use_p
 
 # ---------
 # Animation
-def blen_read_animations_curves_iter(fbx_curves, blen_start_offset, fbx_start_offset, fps):
+def blen_read_animations_curves(fbx_curves, blen_start_offset, fbx_start_offset, fps):
     """
-    Get raw FBX AnimCurve list, and yield values for all curves at each singular curves' keyframes,
-    together with (blender) timing, in frames.
+    Get raw FBX AnimCurve list, and return the (blender) timing, in frames, of all curves' keyframes,
+    together with a list of (values, fbx_curve) pairs, values being the curve resampled at those times.
     blen_start_offset is expected in frames, while fbx_start_offset is expected in FBX ktime.
     """
     # As a first step, assume linear interpolation between key frames, we'll (try to!) handle more
@@ -534,35 +603,18 @@ def blen_read_animations_curves_iter(fbx_curves, blen_start_offset, fbx_start_of
     from .fbx_utils import FBX_KTIME
     timefac = fps / FBX_KTIME
 
-    curves = tuple([0,
-                    elem_prop_first(elem_find_first(c[2], b'KeyTime')),
-                    elem_prop_first(elem_find_first(c[2], b'KeyValueFloat')),
-                    c]
-                   for c in fbx_curves)
-
-    allkeys = sorted({item for sublist in curves for item in sublist[1]})
-    for curr_fbxktime in allkeys:
-        curr_values = []
-        for item in curves:
-            idx, times, values, fbx_curve = item
-
-            if times[idx] < curr_fbxktime:
-                if idx >= 0:
-                    idx += 1
-                    if idx >= len(times):
-                        # We have reached our last element for this curve, stay on it from now on...
-                        idx = -1
-                    item[0] = idx
-
-            if times[idx] >= curr_fbxktime:
-                if idx == 0:
-                    curr_values.append((values[idx], fbx_curve))
-                else:
-                    # Interpolate between this key and the previous one.
-                    ifac = (curr_fbxktime - times[idx - 1]) / (times[idx] - times[idx - 1])
-                    curr_values.append(((values[idx] - values[idx - 1]) * ifac + values[idx - 1], fbx_curve))
-        curr_blenkframe = (curr_fbxktime - fbx_start_offset) * timefac + blen_start_offset
-        yield (curr_blenkframe, curr_values)
+    curves = []
+    for c in fbx_curves:
+        times = np.asarray(elem_prop_first(elem_find_first(c[2], b'KeyTime'), default=()), dtype=np.int64)
+        values = np.asarray(elem_prop_first(elem_find_first(c[2], b'KeyValueFloat'), default=()), dtype=np.float64)
+        if len(times):
+            curves.append((times, values, c))
+
+    allkeys = np.unique(np.concatenate([times for times, _values, _c in curves])) if curves else np.empty(0, np.int64)
+    # Curves keep their first (resp. last) value before (resp. after) their own keys.
+    curves_values = [(np.interp(allkeys, times, values), fbx_curve) for times, values, fbx_curve in curves]
+    blen_frames = (allkeys - fbx_start_offset) * timefac + blen_start_offset
+    return blen_frames, curves_values
 
 
 def blen_read_animations_action_item(action, item, cnodes, fps, anim_offset):
@@ -584,14 +636,6 @@ def blen_read_animations_action_item(action, item, cnodes, fps, anim_offset):
 
     blen_curves = []
     props = []
-    keyframes = {}
-
-    # Add each keyframe to the keyframe dict
-    def store_keyframe(fc, frame, value):
-        fc_key = (fc.data_path, fc.array_index)
-        if not keyframes.get(fc_key):
-            keyframes[fc_key] = []
-        keyframes[fc_key].extend((frame, value))
 
     if isinstance(item, Material):
         grpname = item.name
@@ -625,38 +669,31 @@ def blen_read_animations_action_item(action, item, cnodes, fps, anim_offset):
     blen_curves = [action.fcurves.new(prop, index=channel, action_group=grpname)
                    for prop, nbr_channels, grpname in props for channel in range(nbr_channels)]
 
-    if isinstance(item, Material):
-        for frame, values in blen_read_animations_curves_iter(fbx_curves, anim_offset, 0, fps):
-            value = [0,0,0]
-            for v, (fbxprop, channel, _fbx_acdata) in values:
-                assert(fbxprop == b'DiffuseColor')
-                assert(channel in {0, 1, 2})
-                value[channel] = v
+    blen_frames, curves_values = blen_read_animations_curves(fbx_curves, anim_offset, 0, fps)
+    nbr_frames = len(blen_frames)
+    if nbr_frames == 0:
+        return
 
-            for fc, v in zip(blen_curves, value):
-                store_keyframe(fc, frame, v)
+    # One column of values per blender fcurve.
+    values = np.zeros((nbr_frames, len(blen_curves)))
 
-    elif isinstance(item, ShapeKey):
-        for frame, values in blen_read_animations_curves_iter(fbx_curves, anim_offset, 0, fps):
-            value = 0.0
-            for v, (fbxprop, channel, _fbx_acdata) in values:
-                assert(fbxprop == b'DeformPercent')
-                assert(channel == 0)
-                value = v / 100.0
+    if isinstance(item, Material):
+        for v, (fbxprop, channel, _fbx_acdata) in curves_values:
+            assert(fbxprop == b'DiffuseColor')
+            assert(channel in {0, 1, 2})
+            values[:, channel] = v
 
-            for fc, v in zip(blen_curves, (value,)):
-                store_keyframe(fc, frame, v)
+    elif isinstance(item, ShapeKey):
+        for v, (fbxprop, channel, _fbx_acdata) in curves_values:
+            assert(fbxprop == b'DeformPercent')
+            assert(channel == 0)
+            values[:, 0] = v / 100.0
 
     elif isinstance(item, Camera):
-        for frame, values in blen_read_animations_curves_iter(fbx_curves, anim_offset, 0, fps):
-            value = 0.0
-            for v, (fbxprop, channel, _fbx_acdata) in values:
-                assert(fbxprop == b'FocalLength')
-                assert(channel == 0)
-                value = v
-
-            for fc, v in zip(blen_curves, (value,)):
-                store_keyframe(fc, frame, v)
+        for v, (fbxprop, channel, _fbx_acdata) in curves_values:
+            assert(fbxprop == b'FocalLength')
+            assert(channel == 0)
+            values[:, 0] = v
 
     else:  # Object or PoseBone:
         if item.is_bone:
@@ -668,37 +705,39 @@ def blen_read_animations_action_item(action, item, cnodes, fps, anim_offset):
         rot_eul_prev = bl_obj.rotation_euler.copy()
         rot_quat_prev = bl_obj.rotation_quaternion.copy()
 
-        # Pre-compute inverted local rest matrix of the bone, if relevant.
-        restmat_inv = item.get_bind_matrix().inverted_safe() if item.is_bone else None
-
-        for frame, values in blen_read_animations_curves_iter(fbx_curves, anim_offset, 0, fps):
-            for v, (fbxprop, channel, _fbx_acdata) in values:
-                if fbxprop == b'Lcl Translation':
-                    transform_data.loc[channel] = v
-                elif fbxprop == b'Lcl Rotation':
-                    transform_data.rot[channel] = v
-                elif fbxprop == b'Lcl Scaling':
-                    transform_data.sca[channel] = v
-            mat, _, _ = blen_read_object_transform_do(transform_data)
-
-            # compensate for changes in the local matrix during processing
-            if item.anim_compensation_matrix:
-                mat = mat @ item.anim_compensation_matrix
-
-            # apply pre- and post matrix
-            # post-matrix will contain any correction for lights, camera and bone orientation
-            # pre-matrix will contain any correction for a parent's correction matrix or the global matrix
-            if item.pre_matrix:
-                mat = item.pre_matrix @ mat
-            if item.post_matrix:
-                mat = mat @ item.post_matrix
-
-            # And now, remove that rest pose matrix from current mat (also in parent space).
-            if restmat_inv:
-                mat = restmat_inv @ mat
-
-            # Now we have a virtual matrix of transform from AnimCurves, we can insert keyframes!
-            loc, rot, sca = mat.decompose()
+        # Non-animated channels keep their values from the FBX object.
+        lcl_channels = {
+            b'Lcl Translation': np.tile(np.asarray(transform_data.loc, dtype=np.float64), (nbr_frames, 1)),
+            b'Lcl Rotation': np.tile(np.asarray(transform_data.rot, dtype=np.float64), (nbr_frames, 1)),
+            b'Lcl Scaling': np.tile(np.asarray(transform_data.sca, dtype=np.float64), (nbr_frames, 1)),
+        }
+        for v, (fbxprop, channel, _fbx_acdata) in curves_values:
+            if fbxprop in lcl_channels:
+                lcl_channels[fbxprop][:, channel] = v
+        mats = blen_read_object_transform_do_array(transform_data, lcl_channels[b'Lcl Translation'],
+                                                   lcl_channels[b'Lcl Rotation'], lcl_channels[b'Lcl Scaling'])
+
+        # compensate for changes in the local matrix during processing
+        if item.anim_compensation_matrix:
+            mats = mats @ np.array(item.anim_compensation_matrix)
+
+        # apply pre- and post matrix
+        # post-matrix will contain any correction for lights, camera and bone orientation
+        # pre-matrix will contain any correction for a parent's correction matrix or the global matrix
+        if item.pre_matrix:
+            mats = np.array(item.pre_matrix) @ mats
+        if item.post_matrix:
+            mats = mats @ np.array(item.post_matrix)
+
+        # And now, remove that rest pose matrix from current mat (also in parent space).
+        if item.is_bone:
+            restmat_inv = item.get_bind_matrix().inverted_safe()
+            mats = np.array(restmat_inv) @ mats
+
+        # Now we have virtual matrices of transform from AnimCurves, we can compute keyframes values!
+        # Rotations have to stay compatible with the previous frame, so this is done frame by frame.
+        for frame_idx, mat in enumerate(mats.tolist()):
+            loc, rot, sca = Matrix(mat).decompose()
             if rot_mode == 'QUATERNION':
                 if rot_quat_prev.dot(rot) < 0.0:
                     rot = -rot
@@ -710,21 +749,18 @@ def blen_read_animations_action_item(action, item, cnodes, fps, anim_offset):
                 rot = rot.to_euler(rot_mode, rot_eul_prev)
                 rot_eul_prev = rot
 
-            # Add each keyframe and its value to the keyframe dict
-            for fc, value in zip(blen_curves, chain(loc, rot, sca)):
-                store_keyframe(fc, frame, value)
+            values[frame_idx] = tuple(chain(loc, rot, sca))
 
     # Add all keyframe points to the fcurves at once and modify them after
-    for fc_key, key_values in keyframes.items():
-        data_path, index = fc_key
-
-        # Add all keyframe points at once
-        fcurve = action.fcurves.find(data_path=data_path, index=index)
-        num_keys = len(key_values) // 2
-        fcurve.keyframe_points.add(num_keys)
-        fcurve.keyframe_points.foreach_set('co', key_values)
-        linear_enum_value = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
-        fcurve.keyframe_points.foreach_set('interpolation', (linear_enum_value,) * num_keys)
+    linear_enum_value = bpy.types.Keyframe.bl_rna.properties['interpolation'].enum_items['LINEAR'].value
+    interpolations = (linear_enum_value,) * nbr_frames
+    keyframes_co = np.empty((nbr_frames, 2), dtype=np.float32)
+    keyframes_co[:, 0] = blen_frames
+    for fc, fc_values in zip(blen_curves, values.T):
+        keyframes_co[:, 1] = fc_values
+        fc.keyframe_points.add(nbr_frames)
+        fc.keyframe_points.foreach_set('co', keyframes_co.ravel())
+        fc.keyframe_points.foreach_set('interpolation', interpolations)
 
     # Since we inserted our keyframes in 'ultra-fast' mode, we have to update the fcurves now.
     for fc in blen_curves:
@@ -787,81 +823,71 @@ def blen_read_geom_layerinfo(fbx_layer):
         )
 
 
-def blen_read_geom_array_setattr(generator, blen_data, blen_attr, fbx_data, stride, item_size, descr, xform):
-    """Generic fbx_layer to blen_data setter, generator is expected to yield tuples (ble_idx, fbx_idx)."""
+def blen_read_geom_array_setattr(mapping, blen_data, blen_attr, fbx_data, stride, item_size, descr, xform):
+    """Generic fbx_layer to blen_data setter, mapping is expected to be a pair of arrays (blen_idx, fbx_idx),
+    fbx_idx being indices of items of stride values in fbx_data."""
+    blen_idx, fbx_idx = mapping
     max_idx = len(blen_data) - 1
-    print_error = True
-
-    def check_skip(blen_idx, fbx_idx):
-        nonlocal print_error
-        if fbx_idx < 0:  # Negative values mean 'skip'.
-            return True
-        if blen_idx > max_idx:
-            if print_error:
-                print("ERROR: too much data in this layer, compared to elements in mesh, skipping!")
-                print_error = False
-            return True
-        return False
 
+    fbx_data = np.asarray(fbx_data)
+    fbx_items = fbx_data[:len(fbx_data) // stride * stride].reshape(-1, stride)[:, :item_size]
+
+    # Negative values mean 'skip'.
+    valid = (fbx_idx >= 0) & (fbx_idx < len(fbx_items))
+    too_much = blen_idx > max_idx
+    if too_much.any():
+        print("ERROR: too much data in this layer, compared to elements in mesh, skipping!")
+        valid &= ~too_much
+    if not valid.all():
+        blen_idx = blen_idx[valid]
+        fbx_idx = fbx_idx[valid]
+
+    values = fbx_items[fbx_idx]
+    if item_size == 1:
+        values = values[:, 0]
     if xform is not None:
-        if isinstance(blen_data, list):
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = xform(fbx_data[fbx_idx])
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = xform(fbx_data[fbx_idx:fbx_idx + item_size])
-        else:
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, xform(fbx_data[fbx_idx]))
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, xform(fbx_data[fbx_idx:fbx_idx + item_size]))
-    else:
-        if isinstance(blen_data, list):
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = fbx_data[fbx_idx]
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    blen_data[blen_idx] = fbx_data[fbx_idx:fbx_idx + item_size]
-        else:
-            if item_size == 1:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, fbx_data[fbx_idx])
-            else:
-                def _process(blend_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx):
-                    setattr(blen_data[blen_idx], blen_attr, fbx_data[fbx_idx:fbx_idx + item_size])
+        values = xform(values)
 
-    for blen_idx, fbx_idx in generator:
-        if check_skip(blen_idx, fbx_idx):
-            continue
-        _process(blen_data, blen_attr, fbx_data, xform, item_size, blen_idx, fbx_idx)
+    if isinstance(blen_data, np.ndarray):
+        blen_data[blen_idx] = values
+        return
+
+    if values.dtype.kind == 'f':
+        dtype = np.float32
+    elif values.dtype.kind == 'b':
+        dtype = np.bool_
+    else:
+        dtype = np.int32
+    shape = (len(blen_data),) if item_size == 1 else (len(blen_data), item_size)
+    blen_values = np.empty(shape, dtype=dtype)
+    # Only fetch current values when some items are left untouched by this layer.
+    if len(blen_idx) != len(blen_data) or not np.array_equal(blen_idx, np.arange(len(blen_data))):
+        blen_data.foreach_get(blen_attr, blen_values.ravel())
+    blen_values[blen_idx] = values
+    blen_data.foreach_set(blen_attr, blen_values.ravel())
 
 
 # generic generators.
 def blen_read_geom_array_gen_allsame(data_len):
-    return zip(*(range(data_len), (0,) * data_len))
+    return np.arange(data_len), np.zeros(data_len, dtype=np.int64)
 
 
 def blen_read_geom_array_gen_direct(fbx_data, stride):
-    fbx_data_len = len(fbx_data)
-    return zip(*(range(fbx_data_len // stride), range(0, fbx_data_len, stride)))
+    fbx_data_len = len(fbx_data) // stride
+    return np.arange(fbx_data_len), np.arange(fbx_data_len)
 
 
 def blen_read_geom_array_gen_indextodirect(fbx_layer_index, stride):
-    return ((bi, fi * stride) for bi, fi in enumerate(fbx_layer_index))
+    fbx_layer_index = np.asarray(fbx_layer_index, dtype=np.int64)
+    return np.arange(len(fbx_layer_index)), fbx_layer_index
 
 
 def blen_read_geom_array_gen_direct_looptovert(mesh, fbx_data, stride):
     fbx_data_len = len(fbx_data) // stride
-    loops = mesh.loops
-    for p in mesh.polygons:
-        for lidx in p.loop_indices:
-            vidx = loops[lidx].vertex_index
-            if vidx < fbx_data_len:
-                yield lidx, vidx * stride
+    loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_verts)
+    loops = np.flatnonzero(loop_verts < fbx_data_len)
+    return loops, loop_verts[loops]
 
 
 # generic error printers.
@@ -1133,7 +1159,7 @@ def blen_read_geom_layer_smooth(fbx_obj, mesh):
             fbx_layer_data, None,
             fbx_layer_mapping, fbx_layer_ref,
             1, 1, layer_id,
-            xform=lambda s: not s,
+            xform=np.logical_not,
             )
         # We only set sharp edges here, not face smoothing itself...
         mesh.use_auto_smooth = True
@@ -1152,8 +1178,6 @@ def blen_read_geom_layer_smooth(fbx_obj, mesh):
         return False
 
 def blen_read_geom_layer_edge_crease(fbx_obj, mesh):
-    from math import sqrt
-
     fbx_layer = elem_find_first(fbx_obj, b'LayerElementEdgeCrease')
 
     if fbx_layer is None:
@@ -1190,7 +1214,7 @@ def blen_read_geom_layer_edge_crease(fbx_obj, mesh):
             1, 1, layer_id,
             # Blender squares those values before sending them to OpenSubdiv, when other softwares don't,
             # so we need to compensate that to get similar results through FBX...
-            xform=sqrt,
+            xform=np.sqrt,
             )
     else:
         print("warning layer %r mapping type unsupported: %r" % (fbx_layer.id, fbx_layer_mapping))
@@ -1220,17 +1244,25 @@ def blen_read_geom_layer_normal(fbx_obj, mesh, xform=None):
              (mesh.polygons, "Polygons", True, blen_read_geom_array_mapped_polygon),
              (mesh.vertices, "Vertices", True, blen_read_geom_array_mapped_vert))
     for blen_data, blen_data_type, is_fake, func in tries:
-        bdata = [None] * len(blen_data) if is_fake else blen_data
+        bdata = np.zeros((len(blen_data), 3), dtype=np.float32) if is_fake else blen_data
         if func(mesh, bdata, "normal",
                 fbx_layer_data, fbx_layer_index, fbx_layer_mapping, fbx_layer_ref, 3, 3, layer_id, xform, True):
             if blen_data_type == "Polygons":
-                for pidx, p in enumerate(mesh.polygons):
-                    for lidx in range(p.loop_start, p.loop_start + p.loop_total):
-                        mesh.loops[lidx].normal[:] = bdata[pidx]
+                # Polygons' loops are still contiguous and in order here.
+                poly_loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+                mesh.polygons.foreach_get("loop_total", poly_loop_totals)
+                lnors = np.zeros((len(mesh.loops), 3), dtype=np.float32)
+                lnors[:poly_loop_totals.sum()] = np.repeat(bdata, poly_loop_totals, axis=0)
+                mesh.loops.foreach_set("normal", lnors.ravel())
             elif blen_data_type == "Vertices":
-                # We have to copy vnors to lnors! Far from elegant, but simple.
-                for l in mesh.loops:
-                    l.normal[:] = bdata[l.vertex_index]
+                # We have to copy vnors to lnors!
+                loop_verts = np.empty(len(mesh.loops), dtype=np.int32)
+                mesh.loops.foreach_get("vertex_index", loop_verts)
+                # Invalid vertex indices are only removed by validate() later.
+                lnors = np.zeros((len(mesh.loops), 3), dtype=np.float32)
+                valid = (loop_verts >= 0) & (loop_verts < len(bdata))
+                lnors[valid] = bdata[loop_verts[valid]]
+                mesh.loops.foreach_set("normal", lnors.ravel())
             return True
 
     blen_read_geom_array_error_mapping("normal", fbx_layer_mapping)
@@ -1239,9 +1271,6 @@ def blen_read_geom_layer_normal(fbx_obj, mesh, xform=None):
 
 
 def blen_read_geom(fbx_tmpl, fbx_obj, settings):
-    from itertools import chain
-    import array
-
     # Vertices are in object space, but we are post-multiplying all transforms with the inverse of the
     # global matrix, so we need to apply the global matrix to the vertices to get the correct result.
     geom_mat_co = settings.global_matrix if settings.bake_space_transform else None
@@ -1259,73 +1288,53 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
     fbx_polys = elem_prop_first(elem_find_first(fbx_obj, b'PolygonVertexIndex'))
     fbx_edges = elem_prop_first(elem_find_first(fbx_obj, b'Edges'))
 
-    if geom_mat_co is not None:
-        def _vcos_transformed_gen(raw_cos, m=None):
-            # Note: we could most likely get much better performances with numpy, but will leave this as TODO for now.
-            return chain(*(m @ Vector(v) for v in zip(*(iter(raw_cos),) * 3)))
-        fbx_verts = array.array(fbx_verts.typecode, _vcos_transformed_gen(fbx_verts, geom_mat_co))
-
     if fbx_verts is None:
         fbx_verts = ()
     if fbx_polys is None:
         fbx_polys = ()
 
+    fbx_verts = np.asarray(fbx_verts, dtype=np.float64).reshape(-1, 3)
+    if geom_mat_co is not None:
+        geom_mat_co = np.array(geom_mat_co)
+        fbx_verts = fbx_verts @ geom_mat_co[:3, :3].T + geom_mat_co[:3, 3]
+
     mesh = bpy.data.meshes.new(name=elem_name_utf8)
-    mesh.vertices.add(len(fbx_verts) // 3)
-    mesh.vertices.foreach_set("co", fbx_verts)
+    mesh.vertices.add(len(fbx_verts))
+    mesh.vertices.foreach_set("co", fbx_verts.astype(np.float32).ravel())
+
+    if len(fbx_polys):
+        fbx_polys = np.asarray(fbx_polys, dtype=np.int32)
+        # Last index of each polygon is negative (bitwise-not of the actual vertex index).
+        poly_loop_ends = np.flatnonzero(fbx_polys < 0)
+        poly_loop_starts = np.empty(len(poly_loop_ends), dtype=np.int32)
+        poly_loop_starts[:1] = 0
+        poly_loop_starts[1:] = poly_loop_ends[:-1] + 1
+        poly_loop_totals = poly_loop_ends - poly_loop_starts + 1
+        loop_verts = np.where(fbx_polys < 0, fbx_polys ^ -1, fbx_polys)
 
-    if fbx_polys:
         mesh.loops.add(len(fbx_polys))
-        poly_loop_starts = []
-        poly_loop_totals = []
-        poly_loop_prev = 0
-        for i, l in enumerate(mesh.loops):
-            index = fbx_polys[i]
-            if index < 0:
-                poly_loop_starts.append(poly_loop_prev)
-                poly_loop_totals.append((i - poly_loop_prev) + 1)
-                poly_loop_prev = i + 1
-                index ^= -1
-            l.vertex_index = index
+        mesh.loops.foreach_set("vertex_index", loop_verts)
 
         mesh.polygons.add(len(poly_loop_starts))
         mesh.polygons.foreach_set("loop_start", poly_loop_starts)
-        mesh.polygons.foreach_set("loop_total", poly_loop_totals)
+        mesh.polygons.foreach_set("loop_total", poly_loop_totals.astype(np.int32))
 
         blen_read_geom_layer_material(fbx_obj, mesh)
         blen_read_geom_layer_uv(fbx_obj, mesh)
         blen_read_geom_layer_color(fbx_obj, mesh)
 
-    if fbx_edges:
+    if fbx_edges and len(fbx_polys):
         # edges in fact index the polygons (NOT the vertices)
-        import array
-        tot_edges = len(fbx_edges)
-        edges_conv = array.array('i', [0]) * (tot_edges * 2)
-
-        edge_index = 0
-        for i in fbx_edges:
-            e_a = fbx_polys[i]
-            if e_a >= 0:
-                e_b = fbx_polys[i + 1]
-                if e_b < 0:
-                    e_b ^= -1
-            else:
-                # Last index of polygon, wrap back to the start.
-
-                # ideally we wouldn't have to search back,
-                # but it should only be 2-3 iterations.
-                j = i - 1
-                while j >= 0 and fbx_polys[j] >= 0:
-                    j -= 1
-                e_a ^= -1
-                e_b = fbx_polys[j + 1]
+        fbx_edges = np.asarray(fbx_edges, dtype=np.int64)
+        # Next loop of each loop in its polygon, last index of a polygon wraps back to its start.
+        loop_next = np.arange(1, len(fbx_polys) + 1)
+        loop_next[poly_loop_ends] = poly_loop_starts
+        edges_conv = np.empty((len(fbx_edges), 2), dtype=np.int32)
+        edges_conv[:, 0] = loop_verts[fbx_edges]
+        edges_conv[:, 1] = loop_verts[loop_next[fbx_edges]]
 
-            edges_conv[edge_index] = e_a
-            edges_conv[edge_index + 1] = e_b
-            edge_index += 2
-
-        mesh.edges.add(tot_edges)
-        mesh.edges.foreach_set("vertices", edges_conv)
+        mesh.edges.add(len(fbx_edges))
+        mesh.edges.foreach_set("vertices", edges_conv.ravel())
 
     # must be after edge, face loading.
     ok_smooth = blen_read_geom_layer_smooth(fbx_obj, mesh)
@@ -1340,21 +1349,23 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
         if geom_mat_no is None:
             ok_normals = blen_read_geom_layer_normal(fbx_obj, mesh)
         else:
+            geom_mat_no = np.array(geom_mat_no.to_3x3())
+
             def nortrans(v):
-                return geom_mat_no @ Vector(v)
+                return v @ geom_mat_no.T
             ok_normals = blen_read_geom_layer_normal(fbx_obj, mesh, nortrans)
 
     mesh.validate(clean_customdata=False)  # *Very* important to not remove lnors here!
 
     if ok_normals:
-        clnors = array.array('f', [0.0] * (len(mesh.loops) * 3))
+        clnors = np.empty(len(mesh.loops) * 3, dtype=np.float32)
         mesh.loops.foreach_get("normal", clnors)
 
         if not ok_smooth:
-            mesh.polygons.foreach_set("use_smooth", [True] * len(mesh.polygons))
+            mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=np.bool_))
             ok_smooth = True
 
-        mesh.normals_split_custom_set(tuple(zip(*(iter(clnors),) * 3)))
+        mesh.normals_split_custom_set(clnors.reshape(-1, 3).tolist())
         mesh.use_auto_smooth = True
     else:
         mesh.calc_normals()
@@ -1363,7 +1374,7 @@ def blen_read_geom(fbx_tmpl, fbx_obj, settings):
         mesh.free_normals_split()
 
     if not ok_smooth:
-        mesh.polygons.foreach_set("use_smooth", [True] * len(mesh.polygons))
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=np.bool_))
 
     if ok_crease:
         mesh.use_customdata_edge_crease = True
@@ -2386,6 +2397,8 @@ def load(operator, context, filepath="",
     perfmon.step("FBX Import: start importing %s" % filepath)
     perfmon.level_up()
 
+    perfmon.step("FBX import: Parsing...")
+
     # Detect ASCII files.
 
     # Typically it's bad practice to fail silently on any error,
@@ -2406,7 +2419,7 @@ def load(operator, context, filepath="",
     # End ascii detection.
 
     try:
-        elem_root, version = parse_fbx.parse(filepath)
+        elem_root, version = parse_fbx.parse(filepath, lazy=True)
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -2552,6 +2565,12 @@ def load(operator, context, filepath="",
             return fbx_templates.get(key, fbx_elem_nil)
         return ret
 
+    perfmon.step("FBX import: Decompressing arrays...")
+
+    # Decompress all arrays the import may use at once, in parallel.
+    # Animation curves are left to be decompressed on access, when animation is not imported.
+    parse_fbx.decompress_arrays(fbx_nodes.elems, skip_ids=frozenset() if use_anim else {b'KeyTime', b'KeyValueFloat'})
+
     perfmon.step("FBX import: Nodes...")
 
     # ----
@@ -29,6 +29,9 @@ Usage
 
 This script will write a binary FBX file for each JSON argument given.
 
+The JSON file is read and converted incrementally, so that huge files can be
+converted without loading them whole in memory.
+
 
 Input
 ======
@@ -64,23 +67,102 @@ Note that key:value pairs aren't used since the id's are not
 ensured to be unique.
 """
 
-
-def elem_empty(elem, name):
+import json
+import re
+
+# Size of the chunks read from the JSON file (bigger values are read whole anyway).
+_JSON_CHUNK_SIZE = 1 << 20
+_JSON_WHITESPACE = re.compile(r'\s*')
+
+
+def iter_json_elems(f_json):
+    """
+    Incrementally read the JSON nested lists from the given file,
+    yielding (depth, name, data, data_types) for each element, in depth-first order.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+
+    def read_more():
+        nonlocal buf, pos, eof
+        # Read at least as much as what is already buffered, to keep re-decoding of big values linear.
+        data = f_json.read(max(_JSON_CHUNK_SIZE, len(buf) - pos))
+        if not data:
+            eof = True
+        buf = buf[pos:] + data
+        pos = 0
+
+    def next_char():
+        nonlocal pos
+        while True:
+            pos = _JSON_WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                raise ValueError("Unexpected end of JSON data")
+            read_more()
+
+    def expect(char):
+        nonlocal pos
+        if next_char() != char:
+            raise ValueError("Expected %r, found %r" % (char, buf[pos:pos + 32]))
+        pos += 1
+
+    def decode_value():
+        nonlocal pos
+        next_char()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+                # A number at the end of the buffer might be truncated.
+                if end < len(buf) or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            read_more()
+
+    def iter_elems(depth):
+        nonlocal pos
+        # Opening bracket of the list of elements is already consumed.
+        if next_char() == ']':
+            pos += 1
+            return
+        while True:
+            expect('[')
+            name = decode_value()
+            expect(',')
+            data = decode_value()
+            expect(',')
+            data_types = decode_value()
+            expect(',')
+            expect('[')
+            yield depth, name, data, data_types
+            yield from iter_elems(depth + 1)
+            expect(']')
+            char = next_char()
+            pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError("Expected ',' or ']', found %r" % buf[pos - 1:pos + 31])
+
+    expect('[')
+    yield from iter_elems(0)
+
+
+def json_elem_to_fbx(name, data, data_types):
     import encode_bin
-    sub_elem = encode_bin.FBXElem(name)
-    if elem is not None:
-        elem.elems.append(sub_elem)
-    return sub_elem
-
-
-def parse_json_rec(fbx_root, json_node):
-    name, data, data_types, children = json_node
-    ver = 0
 
     assert(len(data_types) == len(data))
 
-    e = elem_empty(fbx_root, name.encode())
+    e = encode_bin.FBXElem(name.encode())
     for d, dt in zip(data, data_types):
+        if isinstance(d, dict):
+            raise ValueError("%r: summarized arrays can not be converted back to FBX" % name)
         if dt == "C":
             e.add_bool(d)
         elif dt == "Y":
@@ -112,44 +194,26 @@ def parse_json_rec(fbx_root, json_node):
         elif dt == "c":
             e.add_byte_array(d)
 
-    if name == "FBXVersion":
-        assert(data_types == "I")
-        ver = int(data[0])
-
-    for child in children:
-        _ver = parse_json_rec(e, child)
-        if _ver:
-            ver = _ver
-
-    return ver
-
-
-def parse_json(json_root):
-    root = elem_empty(None, b"")
-    ver = 0
-
-    for n in json_root:
-        _ver = parse_json_rec(root, n)
-        if _ver:
-            ver = _ver
-
-    return root, ver
+    return e
 
 
 def json2fbx(fn):
     import os
-    import json
 
     import encode_bin
 
     fn_fbx = "%s.fbx" % os.path.splitext(fn)[0]
     print("Writing: %r " % fn_fbx, end="")
-    json_root = []
-    with open(fn) as f_json:
-        json_root = json.load(f_json)
-    fbx_root, fbx_version = parse_json(json_root)
+    fbx_version = 0
+    with open(fn) as f_json, open(fn_fbx, 'wb') as f_fbx:
+        writer = encode_bin.StreamWriter(f_fbx)
+        for depth, name, data, data_types in iter_json_elems(f_json):
+            writer.add_elem(depth, json_elem_to_fbx(name, data, data_types))
+            if name == "FBXVersion":
+                assert(data_types == "I")
+                fbx_version = int(data[0])
+        writer.finish(fbx_version)
     print("(Version %d) ..." % fbx_version)
-    encode_bin.write(fn_fbx, fbx_root, fbx_version)
 
 
 # ----------------------------------------------------------------------------
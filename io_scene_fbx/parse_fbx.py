@@ -23,16 +23,25 @@
 
 __all__ = (
     "parse",
+    "parse_iter",
     "data_types",
     "parse_version",
     "FBXElem",
+    "FBXArray",
+    "decompress_arrays",
     )
 
-from struct import unpack
+from struct import unpack, Struct
 import array
+import concurrent.futures
+import mmap
+import os
 import zlib
 
-from . import data_types
+try:
+    from . import data_types
+except:
+    import data_types
 
 # at the end of each nested block, there is a NUL record to indicate
 # that the sub-scope exists (i.e. to distinguish between P: and P : {})
@@ -64,6 +73,100 @@ def read_string_ubyte(read):
     return data
 
 
+class FBXArray:
+    """
+    Array property of a lazily parsed file, decompressed on first access.
+
+    Behaves as a read-only sequence, to_array() and to_numpy() give the actual array.
+    """
+    __slots__ = ("data", "encoding", "length", "array_type", "array_stride", "array_byteswap", "numpy_dtype",
+                 "_array")
+
+    def __init__(self, data, encoding, length, array_type, array_stride, array_byteswap, numpy_dtype):
+        self.data = data
+        self.encoding = encoding
+        self.length = length
+        self.array_type = array_type
+        self.array_stride = array_stride
+        self.array_byteswap = array_byteswap
+        self.numpy_dtype = numpy_dtype
+        self._array = None
+
+    def _decompress(self):
+        if self.encoding == 1:
+            self.data = zlib.decompress(self.data)
+            self.encoding = 0
+        assert(self.length * self.array_stride == len(self.data))
+        return self.data
+
+    def to_array(self):
+        """Get the data as an array.array, like the non-lazy parser."""
+        if self._array is None:
+            data_array = array.array(self.array_type)
+            data_array.frombytes(self._decompress())
+            if self.array_byteswap and _IS_BIG_ENDIAN:
+                data_array.byteswap()
+            self._array = data_array
+            # The array holds its own copy of the data.
+            self.data = None
+        return self._array
+
+    def to_numpy(self):
+        """Get the data as a read-only NumPy array, without copying it when possible."""
+        import numpy as np
+        if self._array is not None:
+            return np.frombuffer(self._array, dtype=self.array_type)
+        return np.frombuffer(self._decompress(), dtype=self.numpy_dtype)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        return iter(self.to_array())
+
+    def __getitem__(self, index):
+        return self.to_array()[index]
+
+    def __repr__(self):
+        return "<FBXArray %r[%d]>" % (self.array_type, self.length)
+
+
+# Compressed arrays smaller than this are not worth a task in the thread pool.
+_DECOMPRESS_THREADED_MIN_SIZE = 64 * 1024
+
+
+def decompress_arrays(elems, skip_ids=frozenset(), max_workers=None):
+    """
+    Decompress in a thread pool all FBXArray of the given elements and their children,
+    except for children whose id is in skip_ids. zlib releases the GIL while inflating.
+    """
+    arrays = []
+    stack = list(elems)
+    while stack:
+        elem = stack.pop()
+        for prop in elem.props:
+            if prop.__class__ is FBXArray and prop.encoding == 1:
+                arrays.append(prop)
+        stack.extend(sub for sub in elem.elems if sub.id not in skip_ids)
+
+    # Largest first, so that the pool ends as evenly loaded as possible.
+    arrays.sort(key=lambda a: len(a.data), reverse=True)
+    large = [a for a in arrays if len(a.data) >= _DECOMPRESS_THREADED_MIN_SIZE]
+    small = arrays[len(large):]
+
+    if len(large) > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+            futures = [executor.submit(a._decompress) for a in large]
+            # The main thread takes care of the small ones meanwhile.
+            for a in small:
+                a._decompress()
+            for future in futures:
+                future.result()
+    else:
+        for a in arrays:
+            a._decompress()
+
+
 def unpack_array(read, array_type, array_stride, array_byteswap):
     length = read_uint(read)
     encoding = read_uint(read)
@@ -121,6 +224,103 @@ def init_version(fbx_version):
     _BLOCK_SENTINEL_DATA = (b'\0' * _BLOCK_SENTINEL_LENGTH)
 
 
+# Precompiled layouts used by the lazy parser.
+_ELEM_HEAD_UINT32 = Struct(b'<IIIB')
+_ELEM_HEAD_UINT64 = Struct(b'<QQQB')
+_UINT32 = Struct(b'<I')
+_ARRAY_HEAD = Struct(b'<III')
+
+_lazy_scalar_structs = {
+    b'Y'[0]: Struct(b'<h'),  # 16 bit int
+    b'C'[0]: Struct(b'?'),   # 1 bit bool (yes/no)
+    b'I'[0]: Struct(b'<i'),  # 32 bit int
+    b'F'[0]: Struct(b'<f'),  # 32 bit float
+    b'D'[0]: Struct(b'<d'),  # 64 bit float
+    b'L'[0]: Struct(b'<q'),  # 64 bit int
+    }
+
+# array_type, array_stride, array_byteswap, numpy_dtype
+_lazy_array_types = {
+    b'f'[0]: (data_types.ARRAY_FLOAT32, 4, False, '<f4'),  # array (float)
+    b'i'[0]: (data_types.ARRAY_INT32, 4, True, '<i4'),     # array (int)
+    b'd'[0]: (data_types.ARRAY_FLOAT64, 8, False, '<f8'),  # array (double)
+    b'l'[0]: (data_types.ARRAY_INT64, 8, True, '<i8'),     # array (long)
+    b'b'[0]: (data_types.ARRAY_BOOL, 1, False, 'i1'),      # array (bool)
+    b'c'[0]: (data_types.ARRAY_BYTE, 1, False, 'u1'),      # array (ubyte)
+    }
+
+
+def read_elem_start_lazy(buf, offset, elem_head):
+    """
+    Read the id and properties of the element starting at offset in buf.
+    Returns (elem_id, elem_props_data, elem_props_type, end_offset) (None for the NUL record ending a scope)
+    and the offset following the properties.
+    """
+    if offset + elem_head.size > len(buf):
+        # Truncated file, handled as its end.
+        return None, offset
+    end_offset, prop_count, prop_length, elem_id_length = elem_head.unpack_from(buf, offset)
+    if end_offset == 0:
+        return None, offset + elem_head.size
+
+    offset += elem_head.size
+    elem_id = bytes(buf[offset:offset + elem_id_length])  # elem name of the scope/key
+    offset += elem_id_length
+    elem_props_type = bytearray(prop_count)  # elem property types
+    elem_props_data = [None] * prop_count    # elem properties (if any)
+
+    for i in range(prop_count):
+        data_type = buf[offset]
+        offset += 1
+        scalar_struct = _lazy_scalar_structs.get(data_type)
+        if scalar_struct is not None:
+            elem_props_data[i] = scalar_struct.unpack_from(buf, offset)[0]
+            offset += scalar_struct.size
+        elif data_type in {data_types.BYTES, data_types.STRING}:
+            size = _UINT32.unpack_from(buf, offset)[0]
+            offset += _UINT32.size
+            elem_props_data[i] = bytes(buf[offset:offset + size])
+            offset += size
+        else:
+            length, encoding, comp_len = _ARRAY_HEAD.unpack_from(buf, offset)
+            offset += _ARRAY_HEAD.size
+            elem_props_data[i] = FBXArray(buf[offset:offset + comp_len], encoding, length,
+                                          *_lazy_array_types[data_type])
+            offset += comp_len
+        elem_props_type[i] = data_type
+
+    return (elem_id, elem_props_data, elem_props_type, end_offset), offset
+
+
+def read_elem_lazy(buf, offset, elem_head, use_namedtuple):
+    """
+    Read the element starting at offset in buf.
+    Returns the element (None for the NUL record ending a scope) and the offset following it.
+    """
+    elem_start, offset = read_elem_start_lazy(buf, offset, elem_head)
+    if elem_start is None:
+        return None, offset
+
+    elem_id, elem_props_data, elem_props_type, end_offset = elem_start
+    elem_subtree = []  # elem children (if any)
+
+    if offset < end_offset:
+        while offset < (end_offset - _BLOCK_SENTINEL_LENGTH):
+            elem, offset = read_elem_lazy(buf, offset, elem_head, use_namedtuple)
+            elem_subtree.append(elem)
+
+        if buf[offset:offset + _BLOCK_SENTINEL_LENGTH] != _BLOCK_SENTINEL_DATA:
+            raise IOError("failed to read nested block sentinel, "
+                          "expected all bytes to be 0")
+        offset += _BLOCK_SENTINEL_LENGTH
+
+    if offset != end_offset:
+        raise IOError("scope length not reached, something is wrong")
+
+    args = (elem_id, elem_props_data, elem_props_type, elem_subtree)
+    return (FBXElem(*args) if use_namedtuple else args), offset
+
+
 def read_elem(read, tell, use_namedtuple):
     # [0] the offset at which this block ends
     # [1] the number of properties in the scope
@@ -171,7 +371,83 @@ def parse_version(fn):
         return read_uint(read)
 
 
-def parse(fn, use_namedtuple=True):
+def _open_lazy(fn):
+    """
+    Memory-map the file, returns its buffer, FBX version, elements header layout and the offset of the first element.
+    """
+    with open(fn, 'rb') as f:
+        if f.read(len(_HEAD_MAGIC)) != _HEAD_MAGIC:
+            raise IOError("Invalid header")
+        buf = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    offset = len(_HEAD_MAGIC)
+    fbx_version = _UINT32.unpack_from(buf, offset)[0]
+    offset += _UINT32.size
+    init_version(fbx_version)
+    elem_head = _ELEM_HEAD_UINT32 if fbx_version < 7500 else _ELEM_HEAD_UINT64
+    return buf, fbx_version, elem_head, offset
+
+
+def parse_iter(fn, use_namedtuple=True):
+    """
+    Iterate over all elements of a memory-mapped file in depth-first order, as (depth, elem) pairs,
+    without ever building the whole elements tree (yielded elements have no children).
+    Array properties are FBXArray, see parse_lazy().
+    """
+    buf, fbx_version, elem_head, offset = _open_lazy(fn)
+
+    # End offsets of the elements which children are being read.
+    scopes_end = []
+    while True:
+        if scopes_end and offset >= scopes_end[-1] - _BLOCK_SENTINEL_LENGTH:
+            if buf[offset:offset + _BLOCK_SENTINEL_LENGTH] != _BLOCK_SENTINEL_DATA:
+                raise IOError("failed to read nested block sentinel, "
+                              "expected all bytes to be 0")
+            offset += _BLOCK_SENTINEL_LENGTH
+            if offset != scopes_end.pop():
+                raise IOError("scope length not reached, something is wrong")
+            continue
+
+        elem_start, offset = read_elem_start_lazy(buf, offset, elem_head)
+        if elem_start is None:
+            if scopes_end:
+                raise IOError("unexpected end of scope, something is wrong")
+            break
+
+        elem_id, elem_props_data, elem_props_type, end_offset = elem_start
+        args = (elem_id, elem_props_data, elem_props_type, [])
+        yield len(scopes_end), (FBXElem(*args) if use_namedtuple else args)
+
+        if offset < end_offset:
+            scopes_end.append(end_offset)
+        elif offset != end_offset:
+            raise IOError("scope length not reached, something is wrong")
+
+
+def parse_lazy(fn, use_namedtuple=True):
+    """
+    Parse a memory-mapped file.
+    Array properties are FBXArray, only decompressed when accessed.
+    The mapping is released once no FBXArray of the file is referenced anymore.
+    """
+    root_elems = []
+
+    buf, fbx_version, elem_head, offset = _open_lazy(fn)
+
+    while True:
+        elem, offset = read_elem_lazy(buf, offset, elem_head, use_namedtuple)
+        if elem is None:
+            break
+        root_elems.append(elem)
+
+    args = (b'', [], bytearray(0), root_elems)
+    return FBXElem(*args) if use_namedtuple else args, fbx_version
+
+
+def parse(fn, use_namedtuple=True, lazy=False):
+    if lazy:
+        return parse_lazy(fn, use_namedtuple)
+
     root_elems = []
 
     with open(fn, 'rb') as f:
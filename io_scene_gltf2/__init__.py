@@ -289,6 +289,34 @@ class ExportGLTF2_Base:
         default=False,
     )
 
+    export_quantize: BoolProperty(
+        name='Quantize',
+        description=(
+            'Store vertex attributes as normalized integers (KHR_mesh_quantization). '
+            'Smaller files, but the extension is required to load them'
+        ),
+        default=False
+    )
+
+    export_optimize_vertex_order: BoolProperty(
+        name='Optimize Vertex Order',
+        description=(
+            'Reorder triangles and vertices spatially, '
+            'for better vertex cache and fetch locality when rendering'
+        ),
+        default=False
+    )
+
+    export_deduplicate_meshes: BoolProperty(
+        name='Deduplicate Meshes',
+        description=(
+            'Share the data of meshes with identical exported geometry, '
+            'even when they come from different Blender meshes. '
+            'Shared meshes keep the name of the first one exported'
+        ),
+        default=False
+    )
+
     export_cameras: BoolProperty(
         name='Cameras',
         description='Export cameras',
@@ -537,6 +565,8 @@ class ExportGLTF2_Base:
         export_settings['gltf_tangents'] = self.export_tangents and self.export_normals
         export_settings['gltf_loose_edges'] = self.use_mesh_edges
         export_settings['gltf_loose_points'] = self.use_mesh_vertices
+        export_settings['gltf_optimize_vertex_order'] = self.export_optimize_vertex_order
+        export_settings['gltf_deduplicate_meshes'] = self.export_deduplicate_meshes
 
         if self.is_draco_available:
             export_settings['gltf_draco_mesh_compression'] = self.export_draco_mesh_compression_enable
@@ -549,6 +579,9 @@ class ExportGLTF2_Base:
         else:
             export_settings['gltf_draco_mesh_compression'] = False
 
+        # Draco has its own quantization
+        export_settings['gltf_quantize'] = self.export_quantize and not export_settings['gltf_draco_mesh_compression']
+
         export_settings['gltf_materials'] = self.export_materials
         export_settings['gltf_colors'] = self.export_colors
         export_settings['gltf_cameras'] = self.export_cameras
@@ -765,6 +798,11 @@ class GLTF_PT_export_geometry(bpy.types.Panel):
         col.prop(operator, 'use_mesh_edges')
         col.prop(operator, 'use_mesh_vertices')
 
+        col = layout.column()
+        col.prop(operator, 'export_quantize')
+        col.prop(operator, 'export_optimize_vertex_order')
+        col.prop(operator, 'export_deduplicate_meshes')
+
         layout.prop(operator, 'export_materials')
         col = layout.column()
         col.active = operator.export_materials == "EXPORT"
@@ -1087,8 +1125,8 @@ class ImportGLTF2(Operator, ImportHelper):
         from .io.imp.gltf2_io_gltf import glTFImporter, ImportError
         from .blender.imp.gltf2_blender_gltf import BlenderGlTF
 
+        gltf_importer = glTFImporter(filename, import_settings)
         try:
-            gltf_importer = glTFImporter(filename, import_settings)
             gltf_importer.read()
             gltf_importer.checks()
 
@@ -1099,14 +1137,17 @@ class ImportGLTF2(Operator, ImportHelper):
             elapsed_s = "{:.2f}s".format(time.time() - start_time)
             print("glTF import finished in " + elapsed_s)
 
-            gltf_importer.log.removeHandler(gltf_importer.log_handler)
-
             return {'FINISHED'}
 
         except ImportError as e:
             self.report({'ERROR'}, e.args[0])
             return {'CANCELLED'}
 
+        finally:
+            # Release the file maps even on errors, they would keep the files locked (on Windows)
+            gltf_importer.close()
+            gltf_importer.log.removeHandler(gltf_importer.log_handler)
+
     def set_debug_log(self):
         import logging
         if bpy.app.debug_value == 0:
@@ -0,0 +1,318 @@
+# Copyright 2018-2021 The glTF-Blender-IO authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Export benchmark, generating a parametrised scene and recording the export report of each run.
+
+Usage:
+
+    blender --background --factory-startup --python benchmark_export.py -- [options]
+
+For example, to record a baseline and compare a later version against it:
+
+    blender -b --factory-startup --python benchmark_export.py -- --objects 200 --output base.json
+    blender -b --factory-startup --python benchmark_export.py -- --objects 200 --compare base.json
+
+With --check-quantization, the meshes are stretched and exported with and without quantization, the script exits
+with an error code if the normals (as transformed by the node scales) differ.
+"""
+
+import argparse
+import ast
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import addon_utils
+import bmesh
+import bpy
+import numpy as np
+from mathutils import Matrix
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the glTF 2.0 exporter on a generated scene")
+    parser.add_argument("--objects", type=int, default=100, help="number of mesh objects")
+    parser.add_argument("--segments", type=int, default=64, help="segments of each UV sphere")
+    parser.add_argument("--linked", action="store_true", help="share a single mesh between all objects")
+    parser.add_argument("--materials", type=int, default=4, help="number of textured materials")
+    parser.add_argument("--texture-size", type=int, default=512, help="size of the texture of each material")
+    parser.add_argument("--frames", type=int, default=0, help="number of animated frames of each object")
+    parser.add_argument("--bones", type=int, default=0, help="number of animated bones deforming the objects")
+    parser.add_argument("--format", default="GLB", choices=("GLB", "GLTF_SEPARATE", "GLTF_EMBEDDED"))
+    parser.add_argument("--option", action="append", default=[], metavar="NAME=VALUE",
+                        help="extra export operator option, e.g. export_draco_mesh_compression_enable=True")
+    parser.add_argument("--repeat", type=int, default=3, help="number of exports, the median is reported")
+    parser.add_argument("--label", default="", help="label stored with the results")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare the results with a previous JSON file")
+    parser.add_argument("--threshold", type=float, default=1.1,
+                        help="ratio to the compared duration above which a stage is reported as regressed")
+    parser.add_argument("--check-quantization", action="store_true",
+                        help="check that quantized meshes export the same normals, instead of benchmarking")
+    return parser.parse_args(argv)
+
+
+def create_scene(args):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    scene = bpy.context.scene
+
+    materials = []
+    for i in range(args.materials):
+        image = bpy.data.images.new("Texture.%d" % i, args.texture_size, args.texture_size)
+        image.generated_type = 'COLOR_GRID'
+
+        material = bpy.data.materials.new("Material.%d" % i)
+        material.use_nodes = True
+        tex_node = material.node_tree.nodes.new('ShaderNodeTexImage')
+        tex_node.image = image
+        bsdf = material.node_tree.nodes['Principled BSDF']
+        material.node_tree.links.new(bsdf.inputs['Base Color'], tex_node.outputs['Color'])
+        materials.append(material)
+
+    def create_mesh(name):
+        mesh = bpy.data.meshes.new(name)
+        bm = bmesh.new()
+        bmesh.ops.create_uvsphere(bm, u_segments=args.segments, v_segments=max(args.segments // 2, 3),
+                                  radius=1.0, calc_uvs=True)
+        bm.to_mesh(mesh)
+        bm.free()
+        if materials:
+            mesh.materials.append(materials[len(bpy.data.meshes) % len(materials)])
+        return mesh
+
+    armature_object = None
+    if args.bones > 0:
+        armature = bpy.data.armatures.new("Armature")
+        armature_object = bpy.data.objects.new("Armature", armature)
+        scene.collection.objects.link(armature_object)
+        bpy.context.view_layer.objects.active = armature_object
+        bpy.ops.object.mode_set(mode='EDIT')
+        parent = None
+        for i in range(args.bones):
+            bone = armature.edit_bones.new("Bone.%d" % i)
+            bone.head = (0.0, 0.0, i)
+            bone.tail = (0.0, 0.0, i + 1)
+            bone.parent = parent
+            parent = bone
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    shared_mesh = create_mesh("Sphere") if args.linked else None
+    side = max(int(args.objects ** 0.5), 1)
+    for i in range(args.objects):
+        mesh = shared_mesh or create_mesh("Sphere.%d" % i)
+        obj = bpy.data.objects.new("Object.%d" % i, mesh)
+        obj.location = (3.0 * (i % side), 3.0 * (i // side), 0.0)
+        scene.collection.objects.link(obj)
+
+        if armature_object is not None:
+            obj.parent = armature_object
+            modifier = obj.modifiers.new("Armature", 'ARMATURE')
+            modifier.object = armature_object
+            group = obj.vertex_groups.new(name="Bone.%d" % (i % args.bones))
+            group.add(range(len(mesh.vertices)), 1.0, 'REPLACE')
+
+        for frame in range(args.frames):
+            obj.location.z = (frame % 10) * 0.1
+            obj.rotation_euler.z = frame * 0.1
+            obj.keyframe_insert("location", frame=frame + 1)
+            obj.keyframe_insert("rotation_euler", frame=frame + 1)
+
+    if armature_object is not None:
+        for frame in range(max(args.frames, 1)):
+            for pose_bone in armature_object.pose.bones:
+                pose_bone.rotation_mode = 'XYZ'
+                pose_bone.rotation_euler.x = frame * 0.05
+                pose_bone.keyframe_insert("rotation_euler", frame=frame + 1)
+
+    scene.frame_start = 1
+    scene.frame_end = max(args.frames, 1)
+
+
+def run_exports(args):
+    from io_scene_gltf2.blender.exp import gltf2_blender_export
+
+    options = {}
+    for option in args.option:
+        name, _, value = option.partition("=")
+        options[name] = ast.literal_eval(value)
+
+    extension = ".glb" if args.format == "GLB" else ".gltf"
+    runs = []
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "benchmark" + extension)
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            bpy.ops.export_scene.gltf(filepath=filepath, export_format=args.format, **options)
+            wall = time.perf_counter() - start
+            run = gltf2_blender_export.last_report.to_dict()
+            run['stages']['wall'] = wall
+            runs.append(run)
+    return runs
+
+
+def read_glb(filepath):
+    with open(filepath, "rb") as f:
+        data = f.read()
+    json_length = int.from_bytes(data[12:16], "little")
+    gltf = json.loads(data[20:20 + json_length].decode("utf8"))
+    binary = data[20 + json_length + 8:]
+    return gltf, binary
+
+
+def read_accessor(gltf, binary, index):
+    """Read an accessor as floats, applying normalization."""
+    accessor = gltf['accessors'][index]
+    buffer_view = gltf['bufferViews'][accessor['bufferView']]
+    dtype = np.dtype({5120: np.int8, 5121: np.uint8, 5122: np.int16, 5123: np.uint16,
+                      5125: np.uint32, 5126: np.float32}[accessor['componentType']])
+    num_elems = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4}[accessor['type']]
+    stride = buffer_view.get('byteStride', dtype.itemsize * num_elems)
+    start = buffer_view.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+    count = accessor['count']
+    array = np.frombuffer(binary, dtype=dtype, count=(count - 1) * stride // dtype.itemsize + num_elems,
+                          offset=start)
+    array = np.lib.stride_tricks.as_strided(array, (count, num_elems), (stride, dtype.itemsize)).astype(np.float32)
+    if accessor.get('normalized'):
+        array = np.maximum(array / np.iinfo(dtype).max, -1.0)
+    return array
+
+
+def node_normals(filepath):
+    """Get the normals of each mesh node, transformed by the inverse transpose of the node scale."""
+    gltf, binary = read_glb(filepath)
+    normals = {}
+    for node in gltf['nodes']:
+        if node.get('mesh') is None:
+            continue
+        # The parent object nodes are the same in both exports, only the scale of the mesh node matters
+        inverse_scale = 1.0 / np.array(node.get('scale', (1.0, 1.0, 1.0)), dtype=np.float32)
+        arrays = []
+        for primitive in gltf['meshes'][node['mesh']]['primitives']:
+            normal = read_accessor(gltf, binary, primitive['attributes']['NORMAL']) * inverse_scale
+            arrays.append(normal / np.linalg.norm(normal, axis=1, keepdims=True))
+        normals[node['name'].replace('_Dequantization', '')] = np.concatenate(arrays)
+    return normals
+
+
+def check_quantization(args):
+    """Export the stretched scene with and without quantization. Returns whether the normals are the same."""
+    options = {}
+    for option in args.option:
+        name, _, value = option.partition("=")
+        options[name] = ast.literal_eval(value)
+
+    # Normals must not depend on the (per axis) extent of the mesh
+    for mesh in bpy.data.meshes:
+        mesh.transform(Matrix.Diagonal((1.0, 0.25, 3.0, 1.0)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepaths = []
+        for quantize in (False, True):
+            filepath = os.path.join(directory, "quantize_%d.glb" % quantize)
+            bpy.ops.export_scene.gltf(filepath=filepath, export_format="GLB", **dict(options, export_quantize=quantize))
+            filepaths.append(filepath)
+        reference, quantized = (node_normals(filepath) for filepath in filepaths)
+
+    ok = True
+    for name, normals in reference.items():
+        if name not in quantized or len(quantized[name]) != len(normals):
+            print("QUANTIZATION MISMATCH {}: different vertices".format(name))
+            ok = False
+            continue
+        cosines = np.clip(np.sum(normals * quantized[name], axis=1), -1.0, 1.0)
+        error = math.degrees(float(np.arccos(cosines.min()))) if len(cosines) else 0.0
+        # Normalized bytes are precise to about one degree
+        if error > 2.0:
+            print("QUANTIZATION MISMATCH {}: normals differ by up to {:.2f} degrees".format(name, error))
+            ok = False
+    print("Quantized normals {}".format("OK" if ok else "FAILED"))
+    return ok
+
+
+def median_run(runs):
+    stages = {name: statistics.median(run['stages'].get(name, 0.0) for run in runs) for name in runs[0]['stages']}
+    return {'stages': stages, 'counters': runs[0]['counters']}
+
+
+def compare(result, baseline, threshold):
+    """Print the stage durations next to the baseline ones. Returns the names of the regressed stages."""
+    regressed = []
+    base_stages = baseline['median']['stages']
+    print("{:<24} {:>10} {:>10} {:>8}".format("stage", "base (s)", "new (s)", "ratio"))
+    for name, duration in result['median']['stages'].items():
+        base = base_stages.get(name)
+        if base is None:
+            print("{:<24} {:>10} {:10.3f}".format(name, "-", duration))
+            continue
+        ratio = duration / base if base > 0.0 else float('inf') if duration > 0.0 else 1.0
+        flag = ""
+        if ratio > threshold:
+            flag = "  REGRESSED"
+            regressed.append(name)
+        print("{:<24} {:10.3f} {:10.3f} {:8.2f}{}".format(name, base, duration, ratio, flag))
+
+    base_counters = baseline['median']['counters']
+    for name, value in result['median']['counters'].items():
+        if base_counters.get(name, value) != value:
+            print("{:<24} {:>10} {:>10}".format(name, base_counters[name], value))
+    return regressed
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    args = parse_args(argv)
+
+    addon_utils.enable("io_scene_gltf2", default_set=True)
+
+    create_scene(args)
+    if args.check_quantization:
+        if not check_quantization(args):
+            sys.exit(1)
+        return
+
+    runs = run_exports(args)
+    result = {
+        'label': args.label,
+        'blender_version': bpy.app.version_string,
+        'addon_version': ".".join(str(v) for v in addon_utils.module_bl_info(sys.modules['io_scene_gltf2'])['version']),
+        'parameters': {name: value for name, value in vars(args).items() if name not in ('label', 'output', 'compare', 'threshold', 'check_quantization')},
+        'runs': runs,
+        'median': median_run(runs),
+    }
+
+    for name, duration in result['median']['stages'].items():
+        print("{:<24} {:10.3f} s".format(name, duration))
+    for name, value in result['median']['counters'].items():
+        print("{:<24} {:>10}".format(name, value))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf8") as f:
+            json.dump(result, f, indent=4)
+
+    if args.compare:
+        with open(args.compare, encoding="utf8") as f:
+            baseline = json.load(f)
+        if baseline['parameters'] != result['parameters']:
+            print("WARNING: the compared results were recorded with other parameters")
+        if compare(result, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
 import time
 
 import bpy
@@ -21,14 +22,22 @@ from io_scene_gltf2.blender.com import gltf2_blender_json
 from io_scene_gltf2.blender.exp import gltf2_blender_export_keys
 from io_scene_gltf2.blender.exp import gltf2_blender_gather
 from io_scene_gltf2.blender.exp.gltf2_blender_gltf2_exporter import GlTF2Exporter
-from io_scene_gltf2.io.com.gltf2_io_debug import print_console, print_newline
+from io_scene_gltf2.blender.exp.gltf2_blender_image import ImageEncoder
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import GatherCache
+from io_scene_gltf2.io.com.gltf2_io_debug import print_console, print_newline, ProfileReport
 from io_scene_gltf2.io.exp import gltf2_io_export
 from io_scene_gltf2.io.exp import gltf2_io_draco_compression_extension
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
 
 
+# Report of the last export, for scripts and benchmarks
+last_report = None
+
+
 def save(context, export_settings):
     """Start the glTF 2.0 export and saves to content either to a .gltf or .glb file."""
+    global last_report
+
     if bpy.context.active_object is not None:
         if bpy.context.active_object.mode != "OBJECT": # For linked object, you can't force OBJECT mode
             bpy.ops.object.mode_set(mode='OBJECT')
@@ -39,18 +48,29 @@ def save(context, export_settings):
 
     __notify_start(context)
     start_time = time.time()
-    pre_export_callbacks = export_settings["pre_export_callbacks"]
-    for callback in pre_export_callbacks:
-        callback(export_settings)
+    report = ProfileReport()
+    export_settings[gltf2_blender_export_keys.REPORT] = report
+    try:
+        with report.stage('export'):
+            pre_export_callbacks = export_settings["pre_export_callbacks"]
+            for callback in pre_export_callbacks:
+                callback(export_settings)
+
+            json, buffer = __export(export_settings)
 
-    json, buffer = __export(export_settings)
+            post_export_callbacks = export_settings["post_export_callbacks"]
+            for callback in post_export_callbacks:
+                callback(export_settings)
+            with report.stage('write'):
+                __write_file(json, buffer, export_settings)
+    finally:
+        export_settings.pop(gltf2_blender_export_keys.REPORT, None)
 
-    post_export_callbacks = export_settings["post_export_callbacks"]
-    for callback in post_export_callbacks:
-        callback(export_settings)
-    __write_file(json, buffer, export_settings)
+    __count_bytes_written(report, export_settings)
+    last_report = report
 
     end_time = time.time()
+    report.print_report('Export report:')
     __notify_end(context, end_time - start_time)
 
     if not export_settings['gltf_current_frame']:
@@ -59,16 +79,36 @@ def save(context, export_settings):
 
 
 def __export(export_settings):
+    report = export_settings[gltf2_blender_export_keys.REPORT]
     exporter = GlTF2Exporter(export_settings)
-    __gather_gltf(exporter, export_settings)
-    buffer = __create_buffer(exporter, export_settings)
-    exporter.finalize_images()
+    # Images are compressed in worker threads while the rest of the scene is gathered
+    image_encoder = ImageEncoder()
+    export_settings[gltf2_blender_export_keys.IMAGE_ENCODER] = image_encoder
+    gather_cache = GatherCache()
+    export_settings[gltf2_blender_export_keys.GATHER_CACHE] = gather_cache
+    try:
+        with report.stage('gather'):
+            __gather_gltf(exporter, export_settings)
+        with report.stage('buffer'):
+            buffer = __create_buffer(exporter, export_settings)
+        with report.stage('images'):
+            report.count('image_bytes', exporter.finalize_images())
+    finally:
+        image_encoder.shutdown()
+        export_settings.pop(gltf2_blender_export_keys.IMAGE_ENCODER, None)
+        report.count('cache_hits', sum(gather_cache.hits.values()))
+        report.count('cache_misses', sum(gather_cache.misses.values()))
+        gather_cache.teardown()
+        export_settings.pop(gltf2_blender_export_keys.GATHER_CACHE, None)
 
     export_user_extensions('gather_gltf_hook', export_settings, exporter.glTF)
     exporter.traverse_extensions()
 
     # now that addons possibly add some fields in json, we can fix in needed
-    json = __fix_json(exporter.glTF.to_dict())
+    with report.stage('json'):
+        json = __fix_json(exporter.glTF.to_dict())
+
+    __count_gltf(report, exporter.glTF)
 
     return json, buffer
 
@@ -77,9 +117,13 @@ def __gather_gltf(exporter, export_settings):
     active_scene_idx, scenes, animations = gltf2_blender_gather.gather_gltf2(export_settings)
 
     if export_settings['gltf_draco_mesh_compression']:
-        gltf2_io_draco_compression_extension.encode_scene_primitives(scenes, export_settings)
+        with export_settings[gltf2_blender_export_keys.REPORT].stage('draco'):
+            gltf2_io_draco_compression_extension.encode_scene_primitives(scenes, export_settings)
         exporter.add_draco_extension()
 
+    if export_settings[gltf2_blender_export_keys.QUANTIZE]:
+        exporter.add_mesh_quantization_extension()
+
     for idx, scene in enumerate(scenes):
         exporter.add_scene(scene, idx==active_scene_idx)
     for animation in animations:
@@ -100,6 +144,35 @@ def __create_buffer(exporter, export_settings):
     return buffer
 
 
+def __count_gltf(report, gltf):
+    report.count('nodes', len(gltf.nodes))
+    report.count('meshes', len(gltf.meshes))
+    report.count('primitives', sum(len(mesh.primitives) for mesh in gltf.meshes))
+    report.count('vertices', sum(
+        gltf.accessors[primitive.attributes['POSITION']].count
+        for mesh in gltf.meshes
+        for primitive in mesh.primitives
+        if 'POSITION' in primitive.attributes
+    ))
+    report.count('accessors', len(gltf.accessors))
+    report.count('materials', len(gltf.materials))
+    report.count('images', len(gltf.images))
+    report.count('animations', len(gltf.animations))
+    report.count('buffer_bytes', sum(buffer.byte_length for buffer in gltf.buffers))
+
+
+def __count_bytes_written(report, export_settings):
+    paths = [export_settings['gltf_filepath']]
+    if export_settings[gltf2_blender_export_keys.FORMAT] == 'GLTF_SEPARATE':
+        paths.append(export_settings[gltf2_blender_export_keys.FILE_DIRECTORY] +
+                     export_settings[gltf2_blender_export_keys.BINARY_FILENAME])
+    bytes_written = report.counters.get('image_bytes', 0)
+    for path in paths:
+        if os.path.isfile(path):
+            bytes_written += os.path.getsize(path)
+    report.count('bytes_written', bytes_written)
+
+
 def __fix_json(obj):
     # TODO: move to custom JSON encoder
     fixed = obj
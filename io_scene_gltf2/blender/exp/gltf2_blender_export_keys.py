@@ -57,6 +57,12 @@ EMBED_IMAGES = 'gltf_embed_images'
 BINARY = 'gltf_binary'
 EMBED_BUFFERS = 'gltf_embed_buffers'
 USE_NO_COLOR = 'gltf_use_no_color'
+IMAGE_ENCODER = 'gltf_image_encoder'
+QUANTIZE = 'gltf_quantize'
+OPTIMIZE_VERTEX_ORDER = 'gltf_optimize_vertex_order'
+DEDUPLICATE_MESHES = 'gltf_deduplicate_meshes'
+GATHER_CACHE = 'gltf_gather_cache'
+REPORT = 'gltf_report'
 
 METALLIC_ROUGHNESS_IMAGE = "metallic_roughness_image"
 GROUP_INDEX = 'group_index'
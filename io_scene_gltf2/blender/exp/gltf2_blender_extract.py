@@ -84,6 +84,7 @@ def extract_primitives(glTF, blender_mesh, library, blender_object, blender_vert
         ]
 
     use_materials = export_settings[gltf2_blender_export_keys.MATERIALS]
+    use_vertex_order = export_settings[gltf2_blender_export_keys.OPTIMIZE_VERTEX_ORDER]
 
     # Fetch vert positions and bone data (joint,weights)
 
@@ -208,6 +209,10 @@ def extract_primitives(glTF, blender_mesh, library, blender_object, blender_vert
         if len(prim_dots) == 0:
             continue
 
+        if use_vertex_order:
+            vertex_order, indices = __optimize_vertex_order(indices, locs[prim_dots['vertex_index']])
+            prim_dots = prim_dots[vertex_order]
+
         # Now just move all the data for prim_dots into attribute arrays
 
         attributes = {}
@@ -372,6 +377,44 @@ def extract_primitives(glTF, blender_mesh, library, blender_object, blender_vert
     return primitives
 
 
+def __optimize_vertex_order(indices, positions):
+    """
+    Reorder triangles along a Morton curve through their centroids, then vertices by first use.
+
+    Spatially close triangles share vertices, so this keeps them in the post-transform cache,
+    and vertices are fetched in increasing order.
+    Returns the new order of the vertices, and the remapped indices.
+    """
+    tris = indices.reshape(-1, 3)
+
+    centroids = positions[tris].mean(axis=1)
+    cmin = centroids.min(axis=0)
+    extent = (centroids.max(axis=0) - cmin).max()
+    if extent == 0.0:
+        extent = 1.0
+    grid = ((centroids - cmin) * (1023.0 / extent)).astype(np.uint32)
+
+    def spread_bits(x):
+        # Insert two zero bits between each of the 10 low bits of x
+        x = (x | (x << 16)) & 0x030000FF
+        x = (x | (x << 8)) & 0x0300F00F
+        x = (x | (x << 4)) & 0x030C30C3
+        x = (x | (x << 2)) & 0x09249249
+        return x
+
+    codes = spread_bits(grid[:, 0]) | (spread_bits(grid[:, 1]) << 1) | (spread_bits(grid[:, 2]) << 2)
+    tris = tris[np.argsort(codes, kind='stable')]
+
+    # Every vertex is used by some triangle; order them by first occurrence
+    flat = tris.reshape(-1)
+    vertices, first_use = np.unique(flat, return_index=True)
+    vertex_order = vertices[np.argsort(first_use)]
+    remap = np.empty(len(positions), dtype=np.uint32)
+    remap[vertex_order] = np.arange(len(vertex_order), dtype=np.uint32)
+
+    return vertex_order, remap[flat]
+
+
 def __get_positions(blender_mesh, key_blocks, armature, blender_object, export_settings):
     locs = np.empty(len(blender_mesh.vertices) * 3, dtype=np.float32)
     source = key_blocks[0].relative_key.data if key_blocks else blender_mesh.vertices
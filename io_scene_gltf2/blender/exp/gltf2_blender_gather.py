@@ -18,6 +18,7 @@ from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.com.gltf2_io_debug import print_console
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_nodes
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_animations
+from io_scene_gltf2.blender.exp import gltf2_blender_gather_animation_sampler_keyframes
 from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
 from ..com.gltf2_blender_extras import generate_extras
 from io_scene_gltf2.blender.exp import gltf2_blender_export_keys
@@ -33,10 +34,13 @@ def gather_gltf2(export_settings):
     scenes = []
     animations = []  # unfortunately animations in gltf2 are just as 'root' as scenes.
     active_scene = None
+    report = export_settings[gltf2_blender_export_keys.REPORT]
     for blender_scene in bpy.data.scenes:
-        scenes.append(__gather_scene(blender_scene, export_settings))
+        with report.stage('scenes'):
+            scenes.append(__gather_scene(blender_scene, export_settings))
         if export_settings[gltf2_blender_export_keys.ANIMATIONS]:
-            animations += __gather_animations(blender_scene, export_settings)
+            with report.stage('animations'):
+                animations += __gather_animations(blender_scene, export_settings)
         if bpy.context.scene.name == blender_scene.name:
             active_scene = len(scenes) -1
     return active_scene, scenes, animations
@@ -70,6 +74,7 @@ def __gather_animations(blender_scene, export_settings):
     animations = []
     merged_tracks = {}
 
+    animated_objects = []
     for _blender_object in blender_scene.objects:
 
         blender_object = _blender_object.proxy if _blender_object.proxy else _blender_object
@@ -80,8 +85,17 @@ def __gather_animations(blender_scene, export_settings):
             blender_scene, None, export_settings)
         if obj_node is not None:
             # Check was done on armature, but use here the _proxy object, because this is where the animation is
-            animations_, merged_tracks = gltf2_blender_gather_animations.gather_animations(_blender_object, merged_tracks, len(animations), export_settings)
-            animations += animations_
+            animated_objects.append(_blender_object)
+
+    # Evaluate the scene once per frame for all armatures, instead of once per frame for each of them
+    gltf2_blender_gather_animation_sampler_keyframes.reset_baked_armatures()
+    gltf2_blender_gather_animations.bake_armature_animations(animated_objects, export_settings)
+
+    for _blender_object in animated_objects:
+        animations_, merged_tracks = gltf2_blender_gather_animations.gather_animations(_blender_object, merged_tracks, len(animations), export_settings)
+        animations += animations_
+
+    gltf2_blender_gather_animation_sampler_keyframes.reset_baked_armatures()
 
     if export_settings['gltf_nla_strips'] is False:
         # Fake an animation with all animations of the scene
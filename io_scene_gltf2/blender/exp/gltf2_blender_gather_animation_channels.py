@@ -38,20 +38,7 @@ def gather_animation_channels(blender_action: bpy.types.Action,
 
     # First calculate range of animation for baking
     # This is need if user set 'Force sampling' and in case we need to bake
-    bake_range_start = None
-    bake_range_end = None
-    groups = __get_channel_groups(blender_action, blender_object, export_settings)
-    # Note: channels has some None items only for SK if some SK are not animated
-    for chans in groups:
-        ranges = [channel.range() for channel in chans  if channel is not None]
-        if bake_range_start is None:
-            bake_range_start = min([channel.range()[0] for channel in chans  if channel is not None])
-        else:
-            bake_range_start = min(bake_range_start, min([channel.range()[0] for channel in chans  if channel is not None]))
-        if bake_range_end is None:
-            bake_range_end = max([channel.range()[1] for channel in chans  if channel is not None])
-        else:
-            bake_range_end = max(bake_range_end, max([channel.range()[1] for channel in chans  if channel is not None]))
+    bake_range_start, bake_range_end = get_bake_range(blender_action, blender_object, export_settings)
 
 
     if blender_object.type == "ARMATURE" and export_settings['gltf_force_sampling'] is True:
@@ -150,6 +137,28 @@ def gather_animation_channels(blender_action: bpy.types.Action,
 
     return channels
 
+def get_bake_range(blender_action: bpy.types.Action,
+                   blender_object: bpy.types.Object,
+                   export_settings
+                   ) -> typing.Tuple[typing.Optional[float], typing.Optional[float]]:
+    """Get the frame range covered by all channels of the action, or (None, None) if nothing is animated."""
+    bake_range_start = None
+    bake_range_end = None
+    groups = __get_channel_groups(blender_action, blender_object, export_settings)
+    # Note: channels has some None items only for SK if some SK are not animated
+    for chans in groups:
+        if bake_range_start is None:
+            bake_range_start = min([channel.range()[0] for channel in chans  if channel is not None])
+        else:
+            bake_range_start = min(bake_range_start, min([channel.range()[0] for channel in chans  if channel is not None]))
+        if bake_range_end is None:
+            bake_range_end = max([channel.range()[1] for channel in chans  if channel is not None])
+        else:
+            bake_range_end = max(bake_range_end, max([channel.range()[1] for channel in chans  if channel is not None]))
+
+    return bake_range_start, bake_range_end
+
+
 def __get_channel_group_sorted(channels: typing.Tuple[bpy.types.FCurve], blender_object: bpy.types.Object):
     # if this is shapekey animation, we need to sort in same order than shapekeys
     # else, no need to sort
@@ -162,12 +162,7 @@ def get_bone_matrix(blender_object_if_armature: typing.Optional[bpy.types.Object
             if bake_bone is None:
                 matrix = pbone.matrix_basis.copy()
             else:
-                if (pbone.bone.use_inherit_rotation == False or pbone.bone.inherit_scale != "FULL") and pbone.parent != None:
-                    rest_mat = (pbone.parent.bone.matrix_local.inverted_safe() @ pbone.bone.matrix_local)
-                    matrix = (rest_mat.inverted_safe() @ pbone.parent.matrix.inverted_safe() @ pbone.matrix)
-                else:
-                    matrix = pbone.matrix
-                    matrix = blender_object_if_armature.convert_space(pose_bone=pbone, matrix=matrix, from_space='POSE', to_space='LOCAL')
+                matrix = get_pose_bone_local_matrix(blender_object_if_armature, pbone)
 
 
             data[frame][pbone.name] = matrix
@@ -183,6 +178,124 @@ def get_bone_matrix(blender_object_if_armature: typing.Optional[bpy.types.Object
 
     return data
 
+def get_pose_bone_local_matrix(blender_object_if_armature: bpy.types.Object, pbone: bpy.types.PoseBone) -> mathutils.Matrix:
+    """Get the current matrix of a pose bone, relative to its parent, as exported in glTF."""
+    if (pbone.bone.use_inherit_rotation == False or pbone.bone.inherit_scale != "FULL") and pbone.parent != None:
+        rest_mat = (pbone.parent.bone.matrix_local.inverted_safe() @ pbone.bone.matrix_local)
+        return (rest_mat.inverted_safe() @ pbone.parent.matrix.inverted_safe() @ pbone.matrix)
+    return blender_object_if_armature.convert_space(pose_bone=pbone, matrix=pbone.matrix, from_space='POSE', to_space='LOCAL')
+
+
+class BakedArmature:
+    """
+    Pose bone transforms and shape key driver values of an armature, sampled for one action.
+
+    Transforms are stored as location, rotation quaternion and scale in a (frames, bones, 10) array.
+    """
+    def __init__(self, blender_object_if_armature: bpy.types.Object,
+                 bake_range_start,
+                 bake_range_end,
+                 step):
+        self.bake_range_start = bake_range_start
+        self.bake_range_end = bake_range_end
+
+        # Use the same frame accumulation as the samplers, so that frames can be looked up exactly
+        self.frames = {}
+        frame = bake_range_start
+        while frame <= bake_range_end:
+            self.frames[frame] = len(self.frames)
+            frame += step
+
+        self.bones = {pbone.name: i for i, pbone in enumerate(blender_object_if_armature.pose.bones)}
+        self.transforms = np.empty((len(self.frames), len(self.bones), 10), dtype=np.float32)
+
+        obj_driver = blender_object_if_armature.proxy if blender_object_if_armature.proxy else blender_object_if_armature
+        self.drivers = get_sk_drivers(obj_driver)
+        self.driver_values = {
+            dr_obj.name: np.empty((len(self.frames), len([f for f in dr_fcurves if f is not None])), dtype=np.float32)
+            for dr_obj, dr_fcurves in self.drivers
+        }
+
+    def record(self, blender_object_if_armature: bpy.types.Object, frame):
+        idx = self.frames[frame]
+        for pbone in blender_object_if_armature.pose.bones:
+            trans, rot, scale = get_pose_bone_local_matrix(blender_object_if_armature, pbone).decompose()
+            row = self.transforms[idx, self.bones[pbone.name]]
+            row[0:3] = trans
+            row[3:7] = rot
+            row[7:10] = scale
+        for dr_obj, dr_fcurves in self.drivers:
+            self.driver_values[dr_obj.name][idx] = get_sk_driver_values(dr_obj, frame, dr_fcurves)
+
+
+# Baked data, by (armature name, action name). Filled by bake_armatures before gathering animations
+__baked_armatures = {}
+
+
+def bake_armatures(armature_actions: typing.List[typing.Tuple[bpy.types.Object, str, float, float]], export_settings):
+    """
+    Sample all given armatures in a single walk over the frame range.
+
+    The scene is evaluated once per frame, and the pose of every armature needing this frame is recorded.
+    Each armature must already have the given action active.
+    """
+    step = export_settings['gltf_frame_step']
+
+    frames = {}
+    for blender_object_if_armature, action_name, bake_range_start, bake_range_end in armature_actions:
+        baked = BakedArmature(blender_object_if_armature, bake_range_start, bake_range_end, step)
+        __baked_armatures[(blender_object_if_armature.name, action_name)] = baked
+        for frame in baked.frames.keys():
+            frames.setdefault(int(frame), []).append((blender_object_if_armature, baked, frame))
+
+    if not frames:
+        return
+
+    original_frame = bpy.context.scene.frame_current
+    for int_frame in sorted(frames.keys()):
+        # we need to bake in the constraints
+        bpy.context.scene.frame_set(int_frame)
+        for blender_object_if_armature, baked, frame in frames[int_frame]:
+            baked.record(blender_object_if_armature, frame)
+    bpy.context.scene.frame_set(original_frame)
+
+
+def reset_baked_armatures():
+    __baked_armatures.clear()
+
+
+def __get_baked_armature(blender_object_if_armature, action_name, bake_range_start, bake_range_end):
+    baked = __baked_armatures.get((blender_object_if_armature.name, action_name))
+    if baked is None or baked.bake_range_start != bake_range_start or baked.bake_range_end != bake_range_end:
+        return None
+    return baked
+
+
+def get_baked_bone_transform(blender_object_if_armature: bpy.types.Object,
+                             bake_bone: str,
+                             bake_range_start,
+                             bake_range_end,
+                             action_name: str,
+                             frame):
+    baked = __get_baked_armature(blender_object_if_armature, action_name, bake_range_start, bake_range_end)
+    if baked is None or frame not in baked.frames:
+        return None
+    row = baked.transforms[baked.frames[frame], baked.bones[bake_bone]]
+    return mathutils.Vector(row[0:3]), mathutils.Quaternion(row[3:7]), mathutils.Vector(row[7:10])
+
+
+def get_baked_sk_driver_values(blender_object_if_armature: bpy.types.Object,
+                               driver_obj,
+                               bake_range_start,
+                               bake_range_end,
+                               action_name: str,
+                               frame):
+    baked = __get_baked_armature(blender_object_if_armature, action_name, bake_range_start, bake_range_end)
+    if baked is None or frame not in baked.frames or driver_obj.name not in baked.driver_values:
+        return None
+    return tuple(baked.driver_values[driver_obj.name][baked.frames[frame]].tolist())
+
+
 # cache for performance reasons
 @cached
 def gather_keyframes(blender_object_if_armature: typing.Optional[bpy.types.Object],
@@ -230,18 +343,31 @@ def gather_keyframes(blender_object_if_armature: typing.Optional[bpy.types.Objec
             key = Keyframe(channels, frame, bake_channel)
             if isinstance(pose_bone_if_armature, bpy.types.PoseBone):
 
-                mat = get_bone_matrix(
-                    blender_object_if_armature,
-                    channels,
-                    bake_bone,
-                    bake_channel,
-                    bake_range_start,
-                    bake_range_end,
-                    action_name,
-                    frame,
-                    step
-                )
-                trans, rot, scale = mat.decompose()
+                baked = None
+                if bake_bone is not None:
+                    baked = get_baked_bone_transform(
+                        blender_object_if_armature,
+                        bake_bone,
+                        bake_range_start,
+                        bake_range_end,
+                        action_name,
+                        frame
+                    )
+                if baked is not None:
+                    trans, rot, scale = baked
+                else:
+                    mat = get_bone_matrix(
+                        blender_object_if_armature,
+                        channels,
+                        bake_bone,
+                        bake_channel,
+                        bake_range_start,
+                        bake_range_end,
+                        action_name,
+                        frame,
+                        step
+                    )
+                    trans, rot, scale = mat.decompose()
 
                 if bake_channel is None:
                     target_property = channels[0].data_path.split('.')[-1]
@@ -260,7 +386,15 @@ def gather_keyframes(blender_object_if_armature: typing.Optional[bpy.types.Objec
                     key.value = [c.evaluate(frame) for c in channels if c is not None]
                     complete_key(key, non_keyed_values)
                 else:
-                    key.value = get_sk_driver_values(driver_obj, frame, channels)
+                    values = get_baked_sk_driver_values(
+                        blender_object_if_armature,
+                        driver_obj,
+                        bake_range_start,
+                        bake_range_end,
+                        action_name,
+                        frame
+                    )
+                    key.value = values if values is not None else get_sk_driver_values(driver_obj, frame, channels)
                     complete_key(key, non_keyed_values)
             keyframes.append(key)
             frame += step
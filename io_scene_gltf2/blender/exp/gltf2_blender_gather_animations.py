@@ -17,6 +17,7 @@ import typing
 
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_animation_channels
+from io_scene_gltf2.blender.exp import gltf2_blender_gather_animation_sampler_keyframes
 from io_scene_gltf2.io.com.gltf2_io_debug import print_console
 from ..com.gltf2_blender_extras import generate_extras
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
@@ -102,6 +103,37 @@ def gather_animations(blender_object: bpy.types.Object,
     return animations, tracks
 
 
+def bake_armature_animations(blender_objects: typing.List[bpy.types.Object], export_settings):
+    """
+    Sample the active action of all given armatures in a single pass over the frame range.
+
+    Other actions (NLA strips) are still baked one armature at a time while gathering, as they need
+    to be set active on their armature.
+    """
+    if export_settings['gltf_force_sampling'] is False:
+        return
+
+    armature_actions = []
+    for blender_object in blender_objects:
+        if blender_object.type != "ARMATURE" \
+                or blender_object.animation_data is None \
+                or blender_object.animation_data.action is None:
+            continue
+        # Solo tracks are disabled while gathering, so the pose would not match here
+        if any(track.is_solo for track in blender_object.animation_data.nla_tracks):
+            continue
+        blender_action = blender_object.animation_data.action
+        if not __filter_animation(blender_action, blender_object, export_settings):
+            continue
+        bake_range_start, bake_range_end = gltf2_blender_gather_animation_channels.get_bake_range(
+            blender_action, blender_object, export_settings)
+        if bake_range_start is None:
+            continue
+        armature_actions.append((blender_object, blender_action.name, bake_range_start, bake_range_end))
+
+    gltf2_blender_gather_animation_sampler_keyframes.bake_armatures(armature_actions, export_settings)
+
+
 def __gather_animation(blender_action: bpy.types.Action,
                        blender_object: bpy.types.Object,
                        export_settings
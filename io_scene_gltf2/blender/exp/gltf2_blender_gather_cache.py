@@ -12,17 +12,75 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import functools
 import bpy
 from io_scene_gltf2.blender.exp import gltf2_blender_get
+from io_scene_gltf2.blender.exp.gltf2_blender_export_keys import GATHER_CACHE
+from io_scene_gltf2.io.com.gltf2_io_debug import print_console
+
+
+class GatherCache:
+    """
+    Results of the gather functions for a single export.
+
+    It is stored in export_settings when the export starts, and torn down when it ends,
+    so that nothing is kept alive from one export to the next.
+    """
+
+    def __init__(self):
+        self.__results = {}
+        self.__stores = {}
+        self.hits = collections.Counter()
+        self.misses = collections.Counter()
+
+    def call(self, func, cache_key, args, kwargs):
+        results = self.__results.setdefault(func, {})
+        if cache_key in results:
+            self.hits[func.__qualname__] += 1
+            return results[cache_key]
+        self.misses[func.__qualname__] += 1
+        result = func(*args, **kwargs)
+        results[cache_key] = result
+        return result
+
+    def store(self, name):
+        """Get a dict living as long as the export, for caches needing custom keys."""
+        return self.__stores.setdefault(name, {})
+
+    def teardown(self):
+        for name in sorted(self.misses.keys(), key=lambda n: -self.misses[n]):
+            print_console('DEBUG', '  {}: {} hits, {} misses'.format(name, self.hits[name], self.misses[name]))
+        self.__results = {}
+        self.__stores = {}
+        self.hits.clear()
+        self.misses.clear()
+
+
+def cache_key(value):
+    """
+    Get a key identifying a gather function argument.
+
+    Datablocks are identified by type, name and library, which Blender keeps unique. Their pointers are not
+    stable for the temporary meshes created while exporting, and their name alone is ambiguous for linked data.
+    """
+    if isinstance(value, bpy.types.ID):
+        return (type(value).__name__, value.name, value.library.name if value.library else None)
+    if isinstance(value, bpy.types.PoseBone):
+        return (cache_key(value.id_data), value.name)
+    return value
+
+
+def get_gather_cache(export_settings):
+    return export_settings.get(GATHER_CACHE)
 
 
 def cached(func):
     """
     Decorate the cache gather functions results.
 
-    The gather function is only executed if its result isn't in the cache yet
-    :param func: the function to be decorated. It will have a static __cache member afterwards
+    The gather function is only executed if its result isn't in the cache of the current export yet
+    :param func: the function to be decorated
     :return:
     """
     @functools.wraps(func)
@@ -39,32 +97,14 @@ def cached(func):
             export_settings = args[-1]
             cache_key_args = args[:-1]
 
-        __by_name = [bpy.types.Object, bpy.types.Scene, bpy.types.Material, bpy.types.Action, bpy.types.Mesh, bpy.types.PoseBone]
+        gather_cache = get_gather_cache(export_settings)
+        if gather_cache is None:
+            # Called outside of an export
+            return func(*args, **kwargs)
 
         # we make a tuple from the function arguments so that they can be used as a key to the cache
-        cache_key = ()
-        for i in cache_key_args:
-            if type(i) in __by_name:
-                cache_key += (i.name,)
-            else:
-                cache_key += (i,)
-        for i in cache_key_kwargs.values():
-            if type(i) in __by_name:
-                cache_key += (i.name,)
-            else:
-                cache_key += (i,)
-
-        # invalidate cache if export settings have changed
-        if not hasattr(func, "__export_settings") or export_settings != func.__export_settings:
-            func.__cache = {}
-            func.__export_settings = export_settings
-        # use or fill cache
-        if cache_key in func.__cache:
-            return func.__cache[cache_key]
-        else:
-            result = func(*args)
-            func.__cache[cache_key] = result
-            return result
+        key = tuple(cache_key(i) for i in cache_key_args) + tuple(cache_key(i) for i in cache_key_kwargs.values())
+        return gather_cache.call(func, key, args, kwargs)
     return wrapper_cached
 
 def bonecache(func):
@@ -106,7 +106,13 @@ def __filter_image(sockets, export_settings):
 @cached
 def __gather_buffer_view(image_data, mime_type, name, export_settings):
     if export_settings[gltf2_blender_export_keys.FORMAT] != 'GLTF_SEPARATE':
-        return gltf2_io_binary_data.BinaryData(data=image_data.encode(mime_type))
+        encoder = export_settings.get(gltf2_blender_export_keys.IMAGE_ENCODER)
+        if encoder is None:
+            return gltf2_io_binary_data.BinaryData(data=image_data.encode(mime_type))
+        future = image_data.encode_deferred(mime_type, encoder)
+        if future.done():
+            return gltf2_io_binary_data.BinaryData(data=future.result())
+        return gltf2_io_binary_data.DeferredBinaryData(future, image_data.deferred_key(mime_type))
     return None
 
 
@@ -173,8 +179,23 @@ def __gather_name(export_image, export_settings):
 def __gather_uri(image_data, mime_type, name, export_settings):
     if export_settings[gltf2_blender_export_keys.FORMAT] == 'GLTF_SEPARATE':
         # as usual we just store the data in place instead of already resolving the references
-        return gltf2_io_image_data.ImageData(
-            data=image_data.encode(mime_type=mime_type),
+        encoder = export_settings.get(gltf2_blender_export_keys.IMAGE_ENCODER)
+        if encoder is None:
+            return gltf2_io_image_data.ImageData(
+                data=image_data.encode(mime_type=mime_type),
+                mime_type=mime_type,
+                name=name
+            )
+        future = image_data.encode_deferred(mime_type, encoder)
+        if future.done():
+            return gltf2_io_image_data.ImageData(
+                data=future.result(),
+                mime_type=mime_type,
+                name=name
+            )
+        return gltf2_io_image_data.DeferredImageData(
+            future,
+            image_data.deferred_key(mime_type),
             mime_type=mime_type,
             name=name
         )
@@ -15,7 +15,7 @@
 import bpy
 from typing import Optional, Dict, List, Any, Tuple
 from .gltf2_blender_export_keys import MORPH
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached, get_gather_cache
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_primitives
 from ..com.gltf2_blender_extras import generate_extras
@@ -48,6 +48,17 @@ def gather_mesh(blender_mesh: bpy.types.Mesh,
         print_console("WARNING", "Mesh '{}' has no primitives and will be omitted.".format(mesh.name))
         return None
 
+    # Share a previously exported mesh with the same geometry, materials and morph data
+    geometry_hash = gltf2_blender_gather_primitives.gather_primitives_geometry_hash(
+        blender_mesh, library, blender_object, vertex_groups, modifiers, export_settings)
+    same_geometry_meshes = None
+    if geometry_hash is not None:
+        same_geometry_meshes = get_gather_cache(export_settings).store('mesh').setdefault(
+            (geometry_hash, material_names), [])
+        for same_geometry_mesh in same_geometry_meshes:
+            if same_geometry_mesh.weights == mesh.weights and same_geometry_mesh.extras == mesh.extras:
+                return same_geometry_mesh
+
     export_user_extensions('gather_mesh_hook',
                            export_settings,
                            mesh,
@@ -58,9 +69,31 @@ def gather_mesh(blender_mesh: bpy.types.Mesh,
                            skip_filter,
                            material_names)
 
+    if same_geometry_meshes is not None:
+        same_geometry_meshes.append(mesh)
+
     return mesh
 
 
+@cached
+def gather_mesh_dequantization(blender_mesh: bpy.types.Mesh,
+                               library: Optional[str],
+                               blender_object: Optional[bpy.types.Object],
+                               vertex_groups: Optional[bpy.types.VertexGroups],
+                               modifiers: Optional[bpy.types.ObjectModifiers],
+                               export_settings
+                               ) -> Optional[Tuple[List[float], List[float]]]:
+    """
+    Get the translation and scale a node must apply to the mesh, when its positions are quantized.
+    """
+    return gltf2_blender_gather_primitives.gather_primitives_dequantization(blender_mesh,
+                                                                           library,
+                                                                           blender_object,
+                                                                           vertex_groups,
+                                                                           modifiers,
+                                                                           export_settings)
+
+
 def __filter_mesh(blender_mesh: bpy.types.Mesh,
                   library: Optional[str],
                   vertex_groups: Optional[bpy.types.VertexGroups],
@@ -18,7 +18,7 @@ from mathutils import Matrix, Quaternion, Vector
 
 from . import gltf2_blender_export_keys
 from io_scene_gltf2.blender.com import gltf2_blender_math
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached, get_gather_cache
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_skins
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_cameras
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_mesh
@@ -34,17 +34,14 @@ from io_scene_gltf2.io.com.gltf2_io_debug import print_console
 def gather_node(blender_object, library, blender_scene, dupli_object_parent, export_settings):
     # custom cache to avoid cache miss when called from animation
     # with blender_scene=None
+    gather_cache = get_gather_cache(export_settings)
+    nodes = gather_cache.store('gather_node') if gather_cache is not None else {}
 
-    # invalidate cache if export settings have changed
-    if not hasattr(gather_node, "__export_settings") or export_settings != gather_node.__export_settings:
-        gather_node.__cache = {}
-        gather_node.__export_settings = export_settings
-
-    if blender_scene is None and (blender_object.name, library) in gather_node.__cache:
-        return gather_node.__cache[(blender_object.name, library)]
+    if blender_scene is None and (blender_object.name, library) in nodes:
+        return nodes[(blender_object.name, library)]
 
     node = __gather_node(blender_object, library, blender_scene, dupli_object_parent, export_settings)
-    gather_node.__cache[(blender_object.name, library)] = node
+    nodes[(blender_object.name, library)] = node
     return node
 
 @cached
@@ -53,6 +50,7 @@ def __gather_node(blender_object, library, blender_scene, dupli_object_parent, e
 
     camera = None
     mesh = None
+    dequantization = None
     skin = None
     weights = None
 
@@ -77,7 +75,7 @@ def __gather_node(blender_object, library, blender_scene, dupli_object_parent, e
     else:
         # This node is being fully exported.
         camera = __gather_camera(blender_object, export_settings)
-        mesh = __gather_mesh(blender_object, library, export_settings)
+        mesh, dequantization = __gather_mesh(blender_object, library, export_settings)
         skin = __gather_skin(blender_object, export_settings)
         weights = __gather_weights(blender_object, export_settings)
 
@@ -100,6 +98,13 @@ def __gather_node(blender_object, library, blender_scene, dupli_object_parent, e
     if node.skin is None:
         node.translation, node.rotation, node.scale = __gather_trans_rot_scale(blender_object, export_settings)
 
+    # Quantized positions are mapped back by a child node, keeping the transform of this node free for animation
+    if node.mesh is not None and dequantization is not None and node.skin is None:
+        dequantization_node = __get_dequantization_node(blender_object, dequantization, export_settings)
+        dequantization_node.mesh = node.mesh
+        node.mesh = None
+        node.children.append(dequantization_node)
+
     if export_settings[gltf2_blender_export_keys.YUP]:
         # Checking node.extensions is making sure that the type of lamp is managed, and will be exported
         if blender_object.type == 'LIGHT' and export_settings[gltf2_blender_export_keys.LIGHTS] and node.extensions:
@@ -301,7 +306,7 @@ def __gather_mesh(blender_object, library, export_settings):
         return __gather_mesh_from_nonmesh(blender_object, library, export_settings)
 
     if blender_object.type != "MESH":
-        return None
+        return None, None
 
     # Be sure that object is valid (no NaN for example)
     blender_object.data.validate()
@@ -367,11 +372,19 @@ def __gather_mesh(blender_object, library, export_settings):
                                                    skip_filter,
                                                    material_names,
                                                    export_settings)
+    dequantization = None
+    if result is not None:
+        dequantization = gltf2_blender_gather_mesh.gather_mesh_dequantization(blender_mesh,
+                                                                             library,
+                                                                             blender_object_for_skined_data,
+                                                                             vertex_groups,
+                                                                             modifiers,
+                                                                             export_settings)
 
     if export_settings[gltf2_blender_export_keys.APPLY]:
         blender_mesh_owner.to_mesh_clear()
 
-    return result
+    return result, dequantization
 
 
 def __gather_mesh_from_nonmesh(blender_object, library, export_settings):
@@ -392,10 +405,10 @@ def __gather_mesh_from_nonmesh(blender_object, library, export_settings):
 
             # In some cases (for example curve with single vertice), no blender_mesh is created (without crash)
             if blender_mesh is None:
-                return None
+                return None, None
 
         except Exception:
-            return None
+            return None, None
 
         needs_to_mesh_clear = True
 
@@ -413,12 +426,20 @@ def __gather_mesh_from_nonmesh(blender_object, library, export_settings):
                                                        skip_filter,
                                                        material_names,
                                                        export_settings)
+        dequantization = None
+        if result is not None:
+            dequantization = gltf2_blender_gather_mesh.gather_mesh_dequantization(blender_mesh,
+                                                                                 library,
+                                                                                 blender_object_for_skined_data,
+                                                                                 vertex_groups,
+                                                                                 modifiers,
+                                                                                 export_settings)
 
     finally:
         if needs_to_mesh_clear:
             blender_mesh_owner.to_mesh_clear()
 
-    return result
+    return result, dequantization
 
 
 def __gather_name(blender_object, export_settings):
@@ -542,6 +563,24 @@ def __get_correction_node(blender_object, export_settings):
     )
 
 
+def __get_dequantization_node(blender_object, dequantization, export_settings):
+    translation, scale = dequantization
+    return gltf2_io.Node(
+        camera=None,
+        children=[],
+        extensions=None,
+        extras=None,
+        matrix=None,
+        mesh=None,
+        name=blender_object.name + '_Dequantization',
+        rotation=None,
+        scale=scale,
+        skin=None,
+        translation=translation,
+        weights=None
+    )
+
+
 def __convert_swizzle_location(loc, export_settings):
     """Convert a location from Blender coordinate system to glTF coordinate system."""
     if export_settings[gltf2_blender_export_keys.YUP]:
@@ -37,7 +37,7 @@ def gather_primitive_attributes(blender_primitive, export_settings):
     return attributes
 
 
-def array_to_accessor(array, component_type, data_type, include_max_and_min=False):
+def array_to_accessor(array, component_type, data_type, include_max_and_min=False, normalized=None):
     dtype = gltf2_io_constants.ComponentType.to_numpy_dtype(component_type)
     num_elems = gltf2_io_constants.DataType.num_elements(data_type)
 
@@ -54,8 +54,17 @@ def array_to_accessor(array, component_type, data_type, include_max_and_min=Fals
         amax = np.amax(array, axis=0).tolist()
         amin = np.amin(array, axis=0).tolist()
 
+    # Vertex attribute elements must be aligned to 4 bytes, pad them if needed (quantized data)
+    byte_stride = None
+    element_size = array.itemsize * num_elems
+    if element_size % 4 != 0:
+        byte_stride = (element_size + 3) // 4 * 4
+        padded = np.zeros((len(array), byte_stride // array.itemsize), dtype=dtype)
+        padded[:, :num_elems] = array
+        array = padded
+
     return gltf2_io.Accessor(
-        buffer_view=gltf2_io_binary_data.BinaryData(array.tobytes()),
+        buffer_view=gltf2_io_binary_data.BinaryData(array.tobytes(), byte_stride),
         byte_offset=None,
         component_type=component_type,
         count=len(array),
@@ -64,14 +73,35 @@ def array_to_accessor(array, component_type, data_type, include_max_and_min=Fals
         max=amax,
         min=amin,
         name=None,
-        normalized=None,
+        normalized=normalized,
         sparse=None,
         type=data_type,
     )
 
 
+def __quantize_normalized(array, dtype):
+    """Convert floats in [-1, 1] (signed) or [0, 1] (unsigned) to normalized integers."""
+    info = np.iinfo(dtype)
+    lowest = -info.max if info.min < 0 else 0
+    return np.clip(np.round(array * info.max), lowest, info.max).astype(dtype)
+
+
 def __gather_position(blender_primitive, export_settings):
     position = blender_primitive["attributes"]["POSITION"]
+    dequantization = blender_primitive.get("dequantization")
+    if dequantization is not None:
+        # Positions are mapped to [-1, 1] in the bounding box of the mesh, the node transform maps them back
+        offset, scale = dequantization
+        position = __quantize_normalized((position - offset) / scale, np.int16)
+        return {
+            "POSITION": array_to_accessor(
+                position,
+                component_type=gltf2_io_constants.ComponentType.Short,
+                data_type=gltf2_io_constants.DataType.Vec3,
+                include_max_and_min=True,
+                normalized=True
+            )
+        }
     return {
         "POSITION": array_to_accessor(
             position,
@@ -88,6 +118,15 @@ def __gather_normal(blender_primitive, export_settings):
     if 'NORMAL' not in blender_primitive["attributes"]:
         return {}
     normal = blender_primitive["attributes"]['NORMAL']
+    if export_settings[gltf2_blender_export_keys.QUANTIZE]:
+        return {
+            "NORMAL": array_to_accessor(
+                __quantize_normalized(normal, np.int8),
+                component_type=gltf2_io_constants.ComponentType.Byte,
+                data_type=gltf2_io_constants.DataType.Vec3,
+                normalized=True
+            )
+        }
     return {
         "NORMAL": array_to_accessor(
             normal,
@@ -103,6 +142,15 @@ def __gather_tangent(blender_primitive, export_settings):
     if 'TANGENT' not in blender_primitive["attributes"]:
         return {}
     tangent = blender_primitive["attributes"]['TANGENT']
+    if export_settings[gltf2_blender_export_keys.QUANTIZE]:
+        return {
+            "TANGENT": array_to_accessor(
+                __quantize_normalized(tangent, np.int8),
+                component_type=gltf2_io_constants.ComponentType.Byte,
+                data_type=gltf2_io_constants.DataType.Vec4,
+                normalized=True
+            )
+        }
     return {
         "TANGENT": array_to_accessor(
             tangent,
@@ -119,11 +167,21 @@ def __gather_texcoord(blender_primitive, export_settings):
         tex_coord_id = 'TEXCOORD_' + str(tex_coord_index)
         while blender_primitive["attributes"].get(tex_coord_id) is not None:
             tex_coord = blender_primitive["attributes"][tex_coord_id]
-            attributes[tex_coord_id] = array_to_accessor(
-                tex_coord,
-                component_type=gltf2_io_constants.ComponentType.Float,
-                data_type=gltf2_io_constants.DataType.Vec2,
-            )
+            # Only UVs inside the texture can be quantized without a texture transform
+            if export_settings[gltf2_blender_export_keys.QUANTIZE] \
+                    and len(tex_coord) > 0 and tex_coord.min() >= 0.0 and tex_coord.max() <= 1.0:
+                attributes[tex_coord_id] = array_to_accessor(
+                    __quantize_normalized(tex_coord, np.uint16),
+                    component_type=gltf2_io_constants.ComponentType.UnsignedShort,
+                    data_type=gltf2_io_constants.DataType.Vec2,
+                    normalized=True
+                )
+            else:
+                attributes[tex_coord_id] = array_to_accessor(
+                    tex_coord,
+                    component_type=gltf2_io_constants.ComponentType.Float,
+                    data_type=gltf2_io_constants.DataType.Vec2,
+                )
             tex_coord_index += 1
             tex_coord_id = 'TEXCOORD_' + str(tex_coord_index)
     return attributes
@@ -13,12 +13,14 @@
 # limitations under the License.
 
 import bpy
+import hashlib
 from typing import List, Optional, Tuple
 import numpy as np
 
-from .gltf2_blender_export_keys import NORMALS, MORPH_NORMAL, TANGENTS, MORPH_TANGENT, MORPH
+from .gltf2_blender_export_keys import NORMALS, MORPH_NORMAL, TANGENTS, MORPH_TANGENT, MORPH, QUANTIZE, \
+    DEDUPLICATE_MESHES, REPORT
 
-from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
+from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached, get_gather_cache
 from io_scene_gltf2.blender.exp import gltf2_blender_extract
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_accessors
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_primitive_attributes
@@ -94,8 +96,25 @@ def __gather_cache_primitives(
     """
     primitives = []
 
-    blender_primitives = gltf2_blender_extract.extract_primitives(
-        None, blender_mesh, library, blender_object, vertex_groups, modifiers, export_settings)
+    with export_settings[REPORT].stage('extract'):
+        blender_primitives = gltf2_blender_extract.extract_primitives(
+            None, blender_mesh, library, blender_object, vertex_groups, modifiers, export_settings)
+
+    # All primitives of a mesh share the same dequantization, as it is done by the node transform
+    dequantization = __gather_dequantization(blender_primitives, blender_object, export_settings)
+    if dequantization is not None:
+        for internal_primitive in blender_primitives:
+            internal_primitive['dequantization'] = dequantization
+
+    # Reuse the accessors of a previously exported mesh with the same geometry
+    geometry_hash = None
+    geometries = None
+    gather_cache = get_gather_cache(export_settings)
+    if export_settings[DEDUPLICATE_MESHES] and gather_cache is not None and blender_primitives:
+        geometry_hash = __hash_geometry(blender_primitives)
+        geometries = gather_cache.store('geometry')
+        if geometry_hash in geometries:
+            return geometries[geometry_hash]
 
     for internal_primitive in blender_primitives:
         primitive = {
@@ -103,12 +122,91 @@ def __gather_cache_primitives(
             "indices": __gather_indices(internal_primitive, blender_mesh, modifiers, export_settings),
             "mode": internal_primitive.get('mode'),
             "material": internal_primitive.get('material'),
-            "targets": __gather_targets(internal_primitive, blender_mesh, modifiers, export_settings)
+            "targets": __gather_targets(internal_primitive, blender_mesh, modifiers, export_settings),
+            "dequantization": dequantization,
+            "geometry_hash": geometry_hash
         }
         primitives.append(primitive)
 
+    if geometries is not None:
+        geometries[geometry_hash] = primitives
+
     return primitives
 
+
+@cached
+def gather_primitives_dequantization(
+        blender_mesh: bpy.types.Mesh,
+        library: Optional[str],
+        blender_object: Optional[bpy.types.Object],
+        vertex_groups: Optional[bpy.types.VertexGroups],
+        modifiers: Optional[bpy.types.ObjectModifiers],
+        export_settings
+) -> Optional[Tuple[List[float], List[float]]]:
+    """
+    Get the translation and scale mapping the quantized positions of the mesh back, if they are quantized.
+    """
+    primitives = __gather_cache_primitives(blender_mesh, library, blender_object,
+        vertex_groups, modifiers, export_settings)
+    if not primitives or primitives[0]["dequantization"] is None:
+        return None
+    offset, scale = primitives[0]["dequantization"]
+    return offset.tolist(), scale.tolist()
+
+
+@cached
+def gather_primitives_geometry_hash(
+        blender_mesh: bpy.types.Mesh,
+        library: Optional[str],
+        blender_object: Optional[bpy.types.Object],
+        vertex_groups: Optional[bpy.types.VertexGroups],
+        modifiers: Optional[bpy.types.ObjectModifiers],
+        export_settings
+) -> Optional[bytes]:
+    """
+    Get the hash of the exported geometry of the mesh, if meshes are deduplicated.
+    """
+    primitives = __gather_cache_primitives(blender_mesh, library, blender_object,
+        vertex_groups, modifiers, export_settings)
+    if not primitives:
+        return None
+    return primitives[0]["geometry_hash"]
+
+
+def __hash_geometry(blender_primitives):
+    geometry_hash = hashlib.blake2b(digest_size=20)
+    for blender_primitive in blender_primitives:
+        geometry_hash.update(repr((blender_primitive.get('mode'), blender_primitive.get('material'))).encode())
+        arrays = sorted(blender_primitive['attributes'].items())
+        if blender_primitive.get('indices') is not None:
+            arrays.append(('indices', blender_primitive['indices']))
+        for name, array in arrays:
+            array = np.ascontiguousarray(array)
+            geometry_hash.update(repr((name, array.dtype.str, array.shape)).encode())
+            geometry_hash.update(array.data)
+    return geometry_hash.digest()
+
+
+def __gather_dequantization(blender_primitives, blender_object, export_settings):
+    if not export_settings[QUANTIZE] or not blender_primitives:
+        return None
+
+    # Skinned meshes ignore their node transform, and morph targets animate the node weights
+    if blender_object is not None:
+        return None
+    if any('MORPH_POSITION_0' in p['attributes'] for p in blender_primitives):
+        return None
+
+    positions = [p['attributes']['POSITION'] for p in blender_primitives]
+    pmin = np.amin([np.amin(p, axis=0) for p in positions], axis=0)
+    pmax = np.amax([np.amax(p, axis=0) for p in positions], axis=0)
+
+    # The scale is uniform: a non uniform node scale would change the direction of the (unscaled) normals and tangents
+    offset = ((pmin + pmax) / 2).astype(np.float32)
+    half_extent = float(np.amax(pmax - pmin)) / 2 or 1.0
+    scale = np.full(3, half_extent, dtype=np.float32)
+    return offset, scale
+
 def __gather_indices(blender_primitive, blender_mesh, modifiers, export_settings):
     indices = blender_primitive.get('indices')
     if indices is None:
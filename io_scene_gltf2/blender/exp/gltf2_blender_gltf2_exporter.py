@@ -125,7 +125,7 @@ class GlTF2Exporter:
                 uri = None
             elif output_path and buffer_name:
                 with open(output_path + buffer_name, 'wb') as f:
-                    f.write(self.__buffer.to_bytes())
+                    self.__buffer.write_to(f)
                 uri = buffer_name
             else:
                 uri = self.__buffer.to_embed_string()
@@ -142,7 +142,7 @@ class GlTF2Exporter:
         self.__finalized = True
 
         if is_glb:
-            return self.__buffer.to_bytes()
+            return self.__buffer
 
     def add_draco_extension(self):
         """
@@ -153,19 +153,33 @@ class GlTF2Exporter:
         self.__gltf.extensions_required.append('KHR_draco_mesh_compression')
         self.__gltf.extensions_used.append('KHR_draco_mesh_compression')
 
+    def add_mesh_quantization_extension(self):
+        """
+        Register mesh quantization extension as *used* and *required*.
+
+        :return:
+        """
+        self.__gltf.extensions_required.append('KHR_mesh_quantization')
+        self.__gltf.extensions_used.append('KHR_mesh_quantization')
+
     def finalize_images(self):
         """
         Write all images.
+
+        :return: the number of bytes written
         """
         output_path = self.export_settings[gltf2_blender_export_keys.TEXTURE_DIRECTORY]
 
         if self.__images:
             os.makedirs(output_path, exist_ok=True)
 
+        byte_length = 0
         for name, image in self.__images.items():
             dst_path = output_path + "/" + name + image.file_extension
             with open(dst_path, 'wb') as f:
                 f.write(image.data)
+            byte_length += len(image.data)
+        return byte_length
 
     def add_scene(self, scene: gltf2_io.Scene, active: bool = False):
         """
@@ -18,6 +18,13 @@ from typing import Optional, Tuple
 import numpy as np
 import tempfile
 import enum
+import collections
+import concurrent.futures
+import struct
+import zlib
+
+# zlib level used by the NumPy PNG encoder of the worker threads
+PNG_COMPRESSION_LEVEL = 6
 
 
 class Channel(enum.IntEnum):
@@ -127,6 +134,68 @@ class ExportImage:
         # Unhappy path = we need to create the image self.fills describes.
         return self.__encode_unhappy()
 
+    def encode_deferred(self, mime_type: Optional[str], encoder: 'ImageEncoder') -> concurrent.futures.Future:
+        """Like encode, but return a future, compressing the image in a worker thread of encoder if possible.
+
+        Blender data is always read right away, on the calling thread.
+        """
+        self.file_format = {
+            "image/jpeg": "JPEG",
+            "image/png": "PNG"
+        }.get(mime_type, "PNG")
+
+        # Existing images and JPEG encoding need Blender, which can't be used from other threads
+        if self.__on_happy_path() or self.file_format != "PNG":
+            return encoder.completed(self.encode(mime_type))
+
+        width, height, channels = self.__extract_channels()
+        return encoder.submit(_pack_and_encode_png, channels, width, height, Channel.A in self.fills)
+
+    def deferred_key(self, mime_type: Optional[str]) -> tuple:
+        """Key identifying the encoded image, usable before the encoding is done."""
+        fills = []
+        for dst_chan, fill in sorted(self.fills.items()):
+            if isinstance(fill, FillImage):
+                fills.append((int(dst_chan), fill.image.name, int(fill.src_chan)))
+            else:
+                fills.append((int(dst_chan), None, None))
+        return (tuple(fills), mime_type)
+
+    def __extract_channels(self):
+        # Read the channels used by the fills, packing and encoding is left to _pack_and_encode_png
+        images = []
+        for fill in self.fills.values():
+            if isinstance(fill, FillImage):
+                if fill.image not in images:
+                    images.append(fill.image)
+
+        if not images:
+            # No ImageFills; use a 1x1 white pixel
+            return 1, 1, {}
+
+        width = max(image.size[0] for image in images)
+        height = max(image.size[1] for image in images)
+
+        channels = {}
+        tmp_buf = np.empty(width * height * 4, np.float32)
+
+        for image in images:
+            if image.size[0] == width and image.size[1] == height:
+                image.pixels.foreach_get(tmp_buf)
+            else:
+                # Image is the wrong size; make a temp copy and scale it.
+                with TmpImageGuard() as guard:
+                    _make_temp_image_copy(guard, src_image=image)
+                    tmp_image = guard.image
+                    tmp_image.scale(width, height)
+                    tmp_image.pixels.foreach_get(tmp_buf)
+
+            for dst_chan, fill in self.fills.items():
+                if isinstance(fill, FillImage) and fill.image == image:
+                    channels[int(dst_chan)] = tmp_buf[int(fill.src_chan)::4].copy()
+
+        return width, height, channels
+
     def __encode_happy(self) -> bytes:
         return self.__encode_from_image(self.blender_image())
 
@@ -214,6 +283,70 @@ class ExportImage:
             return _encode_temp_image(tmp_image, self.file_format)
 
 
+def _pack_and_encode_png(channels: dict, width: int, height: int, alpha: bool) -> bytes:
+    """Assemble an image from single channel arrays and encode it as PNG. Does not use Blender."""
+    pixels = np.ones(width * height * 4, np.float32)
+    for dst_chan, values in channels.items():
+        pixels[dst_chan::4] = values
+    return _encode_png(pixels, width, height, alpha)
+
+
+def _encode_png(pixels: np.ndarray, width: int, height: int, alpha: bool) -> bytes:
+    """Encode float RGBA pixels, bottom row first like Blender, as an 8 bit PNG."""
+    num_channels = 4 if alpha else 3
+
+    # Same float to byte conversion as Blender does for byte images
+    data = np.clip(pixels.reshape(height, width, 4)[::-1, :, :num_channels] * 255.0 + 0.5, 0.0, 255.0)
+    data = data.astype(np.uint8).reshape(height, width * num_channels)
+
+    # Use the 'Up' filter on every scanline
+    scanlines = np.empty((height, width * num_channels + 1), np.uint8)
+    scanlines[:, 0] = 2
+    scanlines[0, 1:] = data[0]
+    np.subtract(data[1:], data[:-1], out=scanlines[1:, 1:])
+
+    def chunk(chunk_type: bytes, chunk_data: bytes) -> bytes:
+        return struct.pack(">I", len(chunk_data)) + chunk_type + chunk_data + \
+            struct.pack(">I", zlib.crc32(chunk_type + chunk_data))
+
+    color_type = 6 if alpha else 2
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        chunk(b'IHDR', struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)),
+        chunk(b'IDAT', zlib.compress(scanlines.tobytes(), PNG_COMPRESSION_LEVEL)),
+        chunk(b'IEND', b''),
+    ])
+
+
+class ImageEncoder:
+    """Worker threads encoding images while the rest of the scene is gathered."""
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        self.__pending = collections.deque()
+
+    def submit(self, fn, *args) -> concurrent.futures.Future:
+        # Bound the number of extracted images waiting in memory
+        while self.__pending and self.__pending[0].done():
+            self.__pending.popleft()
+        if len(self.__pending) >= 2 * self.max_workers:
+            concurrent.futures.wait([self.__pending.popleft()])
+
+        future = self.__executor.submit(fn, *args)
+        self.__pending.append(future)
+        return future
+
+    @staticmethod
+    def completed(data: bytes) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        future.set_result(data)
+        return future
+
+    def shutdown(self):
+        self.__executor.shutdown(wait=True)
+        self.__pending.clear()
+
+
 def _encode_temp_image(tmp_image: bpy.types.Image, file_format: str) -> bytes:
     with tempfile.TemporaryDirectory() as tmpdirname:
         tmpfilename = tmpdirname + '/img'
@@ -15,6 +15,7 @@
 import bpy
 from mathutils import Vector, Quaternion, Matrix
 from .gltf2_blender_scene import BlenderScene
+from .gltf2_io_draco_compression_extension import decode_primitives
 
 
 class BlenderGlTF():
@@ -162,6 +163,9 @@ class BlenderGlTF():
             for mesh in gltf.data.meshes:
                 mesh.blender_name = {}  # caches Blender mesh name
 
+            # Decode all Draco compressed primitives at once, in parallel
+            decode_primitives(gltf)
+
         # Calculate names for each mesh's shapekeys
         for mesh in gltf.data.meshes or []:
             mesh.shapekey_names = []
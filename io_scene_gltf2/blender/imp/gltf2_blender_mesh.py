@@ -435,14 +435,15 @@ def points_edges_tris(mode, indices):
         # 0---2---4
         #  \ / \ /
         #   1---3
-        # TODO: numpyify
-        def alternate(i, xs):
-            even = i % 2 == 0
-            return xs if even else (xs[0], xs[2], xs[1])
-        tris = np.array([
-            alternate(i, (indices[i], indices[i + 1], indices[i + 2]))
-            for i in range(0, len(indices) - 2)
-        ])
+        # Triangle i is (i, i+1, i+2), with the last two swapped on odd
+        # triangles to keep a consistent winding.
+        num_tris = max(len(indices) - 2, 0)
+        tris = np.empty((num_tris, 3), dtype=np.uint32)
+        tris[:, 0] = indices[:num_tris]
+        tris[0::2, 1] = indices[1:num_tris + 1:2]
+        tris[0::2, 2] = indices[2:num_tris + 2:2]
+        tris[1::2, 1] = indices[3:num_tris + 2:2]
+        tris[1::2, 2] = indices[2:num_tris + 1:2]
         tris = squish(tris)
 
     elif mode == 6:
@@ -450,11 +451,12 @@ def points_edges_tris(mode, indices):
         #   3---2
         #  / \ / \
         # 4---0---1
-        # TODO: numpyify
-        tris = np.array([
-            (indices[0], indices[i], indices[i + 1])
-            for i in range(1, len(indices) - 1)
-        ])
+        num_tris = max(len(indices) - 2, 0)
+        tris = np.empty((num_tris, 3), dtype=np.uint32)
+        if num_tris:
+            tris[:, 0] = indices[0]
+        tris[:, 1] = indices[1:num_tris + 1]
+        tris[:, 2] = indices[2:num_tris + 2]
         tris = squish(tris)
 
     else:
@@ -614,8 +616,9 @@ def merge_duplicate_verts(vert_locs, vert_normals, vert_joints, vert_weights, sk
     # Ideally normals would be treated as per-loop data, but that has problems,
     # so we currently treat the normal as per-vert.
     #
-    # Strategy is simple: put all the per-vert data into an array of structs
-    # ("dots"), dedupe with np.unique, then take all the data back out.
+    # Strategy is simple: put all the per-vert data into the columns of an
+    # array of 32-bit keys, dedupe its rows, then gather the data of the first
+    # vert of each group.
 
     # Very often two verts that "morally" should be merged will have normals
     # with very small differences. Round off the normals to smooth this over.
@@ -624,72 +627,51 @@ def merge_duplicate_verts(vert_locs, vert_normals, vert_joints, vert_weights, sk
         vert_normals[:] = np.trunc(vert_normals)
         vert_normals *= (1/50000)
 
-    dot_fields = [('x', np.float32), ('y', np.float32), ('z', np.float32)]
+    columns = [vert_locs]
     if len(vert_normals) != 0:
-        dot_fields += [('nx', np.float32), ('ny', np.float32), ('nz', np.float32)]
-    for i, _ in enumerate(vert_joints):
-        dot_fields += [
-            ('joint%dx' % i, np.uint32), ('joint%dy' % i, np.uint32),
-            ('joint%dz' % i, np.uint32), ('joint%dw' % i, np.uint32),
-            ('weight%dx' % i, np.float32), ('weight%dy' % i, np.float32),
-            ('weight%dz' % i, np.float32), ('weight%dw' % i, np.float32),
-        ]
-    for i, _ in enumerate(sk_vert_locs):
-        dot_fields += [
-            ('sk%dx' % i, np.float32), ('sk%dy' % i, np.float32), ('sk%dz' % i, np.float32),
-        ]
-    dots = np.empty(len(vert_locs), dtype=np.dtype(dot_fields))
-
-    dots['x'] = vert_locs[:, 0]
-    dots['y'] = vert_locs[:, 1]
-    dots['z'] = vert_locs[:, 2]
-    if len(vert_normals) != 0:
-        dots['nx'] = vert_normals[:, 0]
-        dots['ny'] = vert_normals[:, 1]
-        dots['nz'] = vert_normals[:, 2]
-    for i, (joints, weights) in enumerate(zip(vert_joints, vert_weights)):
-        dots['joint%dx' % i] = joints[:, 0]
-        dots['joint%dy' % i] = joints[:, 1]
-        dots['joint%dz' % i] = joints[:, 2]
-        dots['joint%dw' % i] = joints[:, 3]
-        dots['weight%dx' % i] = weights[:, 0]
-        dots['weight%dy' % i] = weights[:, 1]
-        dots['weight%dz' % i] = weights[:, 2]
-        dots['weight%dw' % i] = weights[:, 3]
-    for i, locs in enumerate(sk_vert_locs):
-        dots['sk%dx' % i] = locs[:, 0]
-        dots['sk%dy' % i] = locs[:, 1]
-        dots['sk%dz' % i] = locs[:, 2]
-
-    unique_dots, inv_indices = np.unique(dots, return_inverse=True)
+        columns.append(vert_normals)
+    for joints, weights in zip(vert_joints, vert_weights):
+        columns += [joints, weights]
+    columns += sk_vert_locs
+
+    num_cols = sum(col.shape[1] for col in columns)
+    keys = np.empty((len(vert_locs), num_cols), dtype=np.uint32)
+    c = 0
+    for col in columns:
+        if col.dtype.kind == 'f':
+            # Adding 0 turns -0.0 into 0.0, so both get the same bits
+            keys[:, c:c + col.shape[1]] = (col.astype(np.float32) + np.float32(0)).view(np.uint32)
+        else:
+            keys[:, c:c + col.shape[1]] = col
+        c += col.shape[1]
+
+    first_indices, inv_indices = unique_rows(keys)
 
     loop_vidxs = inv_indices[loop_vidxs]
     edge_vidxs = inv_indices[edge_vidxs]
 
-    vert_locs = np.empty((len(unique_dots), 3), dtype=np.float32)
-    vert_locs[:, 0] = unique_dots['x']
-    vert_locs[:, 1] = unique_dots['y']
-    vert_locs[:, 2] = unique_dots['z']
+    vert_locs = vert_locs[first_indices]
     if len(vert_normals) != 0:
-        vert_normals = np.empty((len(unique_dots), 3), dtype=np.float32)
-        vert_normals[:, 0] = unique_dots['nx']
-        vert_normals[:, 1] = unique_dots['ny']
-        vert_normals[:, 2] = unique_dots['nz']
+        vert_normals = vert_normals[first_indices]
     for i in range(len(vert_joints)):
-        vert_joints[i] = np.empty((len(unique_dots), 4), dtype=np.uint32)
-        vert_joints[i][:, 0] = unique_dots['joint%dx' % i]
-        vert_joints[i][:, 1] = unique_dots['joint%dy' % i]
-        vert_joints[i][:, 2] = unique_dots['joint%dz' % i]
-        vert_joints[i][:, 3] = unique_dots['joint%dw' % i]
-        vert_weights[i] = np.empty((len(unique_dots), 4), dtype=np.float32)
-        vert_weights[i][:, 0] = unique_dots['weight%dx' % i]
-        vert_weights[i][:, 1] = unique_dots['weight%dy' % i]
-        vert_weights[i][:, 2] = unique_dots['weight%dz' % i]
-        vert_weights[i][:, 3] = unique_dots['weight%dw' % i]
+        vert_joints[i] = vert_joints[i][first_indices]
+        vert_weights[i] = vert_weights[i][first_indices]
     for i in range(len(sk_vert_locs)):
-        sk_vert_locs[i] = np.empty((len(unique_dots), 3), dtype=np.float32)
-        sk_vert_locs[i][:, 0] = unique_dots['sk%dx' % i]
-        sk_vert_locs[i][:, 1] = unique_dots['sk%dy' % i]
-        sk_vert_locs[i][:, 2] = unique_dots['sk%dz' % i]
+        sk_vert_locs[i] = sk_vert_locs[i][first_indices]
 
     return vert_locs, vert_normals, vert_joints, vert_weights, sk_vert_locs, loop_vidxs, edge_vidxs
+
+
+def unique_rows(keys):
+    """
+    Find the unique rows of a 2D array.
+
+    Returns the index of the first occurrence of each unique row and, for each
+    row, the index of its unique row.
+    """
+    # Compare whole rows as opaque bytes, much faster to sort than records
+    # made of one field per column
+    keys = np.ascontiguousarray(keys)
+    rows = keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1]))).reshape(len(keys))
+    _, first_indices, inv_indices = np.unique(rows, return_index=True, return_inverse=True)
+    return first_indices, inv_indices.reshape(len(keys))
@@ -13,6 +13,8 @@
 # limitations under the License.
 
 from ctypes import *
+import concurrent.futures
+import os
 
 from io_scene_gltf2.io.com.gltf2_io import BufferView
 from io_scene_gltf2.io.imp.gltf2_io_binary import BinaryData
@@ -20,12 +22,44 @@ from ...io.com.gltf2_io_debug import print_console
 from io_scene_gltf2.io.com.gltf2_io_draco_compression_extension import dll_path
 
 
+def decode_primitives(gltf):
+    """
+    Handles draco compression of all primitives of the file at once.
+    The primitives are decoded in worker threads, as the decoder releases the GIL,
+    then their decoded data is moved into new buffers and buffer views.
+    """
+    prims = [
+        prim
+        for mesh in gltf.data.meshes or []
+        for prim in mesh.primitives
+        if prim.extensions is not None and 'KHR_draco_mesh_compression' in prim.extensions
+    ]
+    if not prims:
+        return
+
+    dll = __load_dll()
+    jobs = [__prepare_primitive(gltf, prim) for prim in prims]
+
+    print_console('INFO', 'Draco Decoder: Decode {} primitives'.format(len(prims)))
+    max_workers = min(len(jobs), os.cpu_count() or 1)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        decoded = list(executor.map(lambda job: __decode_primitive(dll, job), jobs))
+
+    for prim, job, result in zip(prims, jobs, decoded):
+        __apply_decoded_primitive(gltf, prim, job, result)
+
+
 def decode_primitive(gltf, prim):
     """
     Handles draco compression.
     Moves decoded data into new buffers and buffer views held by the accessors of the given primitive.
     """
+    dll = __load_dll()
+    job = __prepare_primitive(gltf, prim)
+    __apply_decoded_primitive(gltf, prim, job, __decode_primitive(dll, job))
+
 
+def __load_dll():
     # Load DLL and setup function signatures.
     dll = cdll.LoadLibrary(str(dll_path().resolve()))
 
@@ -65,15 +99,78 @@ def decode_primitive(gltf, prim):
     dll.decoderCopyIndices.restype = None
     dll.decoderCopyIndices.argtypes = [c_void_p, c_void_p]
 
-    decoder = dll.decoderCreate()
+    return dll
+
+
+def __prepare_primitive(gltf, prim):
+    """Read everything the decoder needs from the glTF data, which is not thread safe."""
     extension = prim.extensions['KHR_draco_mesh_compression']
 
-    name = prim.name if hasattr(prim, 'name') else '[unnamed]'
+    attributes = []
+    for attr in extension['attributes']:
+        if attr not in prim.attributes:
+            attributes = None
+            break
+        accessor = gltf.data.accessors[prim.attributes[attr]]
+        attributes.append((attr, extension['attributes'][attr], accessor.component_type, accessor.type.encode()))
+
+    return {
+        'name': prim.name if hasattr(prim, 'name') else '[unnamed]',
+        'draco_buffer': bytes(BinaryData.get_buffer_view(gltf, extension['bufferView'])),
+        'index_component_type': gltf.data.accessors[prim.indices].component_type,
+        'attributes': attributes,
+    }
+
+
+def __decode_primitive(dll, job):
+    """Decode a primitive. Only calls the decoder, so that it can run in a worker thread."""
+    result = {'error': None}
+    name = job['name']
 
     # Create Draco decoder.
-    draco_buffer = bytes(BinaryData.get_buffer_view(gltf, extension['bufferView']))
-    if not dll.decoderDecode(decoder, draco_buffer, len(draco_buffer)):
-        print_console('ERROR', 'Draco Decoder: Unable to decode. Skipping primitive {}.'.format(name))
+    decoder = dll.decoderCreate()
+    try:
+        draco_buffer = job['draco_buffer']
+        if not dll.decoderDecode(decoder, draco_buffer, len(draco_buffer)):
+            result['error'] = 'Draco Decoder: Unable to decode. Skipping primitive {}.'.format(name)
+            return result
+
+        # Read indices.
+        result['index_count'] = dll.decoderGetIndexCount(decoder)
+        if not dll.decoderReadIndices(decoder, job['index_component_type']):
+            result['error'] = 'Draco Decoder: Unable to decode indices. Skipping primitive {}.'.format(name)
+            return result
+
+        indices_byte_length = dll.decoderGetIndicesByteLength(decoder)
+        result['indices'] = bytes(indices_byte_length)
+        dll.decoderCopyIndices(decoder, result['indices'])
+
+        # Read each attribute.
+        result['vertex_count'] = dll.decoderGetVertexCount(decoder)
+        result['attributes'] = []
+        for attr, dracoId, component_type, data_type in job['attributes'] or []:
+            if not dll.decoderReadAttribute(decoder, dracoId, component_type, data_type):
+                result['error'] = 'Draco Decoder: Could not decode attribute {}. Skipping primitive {}.'.format(attr, name)
+                return result
+
+            byte_length = dll.decoderGetAttributeByteLength(decoder, dracoId)
+            decoded_data = bytes(byte_length)
+            dll.decoderCopyAttribute(decoder, dracoId, decoded_data)
+            result['attributes'].append((attr, decoded_data))
+
+        return result
+    finally:
+        dll.decoderRelease(decoder)
+
+
+def __apply_decoded_primitive(gltf, prim, job, result):
+    """Move the decoded data into new buffers and buffer views held by the accessors of the primitive."""
+    extension = prim.extensions.pop('KHR_draco_mesh_compression')
+    name = job['name']
+
+    if job['attributes'] is None:
+        missing = [attr for attr in extension['attributes'] if attr not in prim.attributes]
+        print_console('ERROR', 'Draco Decoder: Draco attribute {} not in primitive attributes. Skipping primitive {}.'.format(missing[0], name))
         return
 
     # Choose a buffer index which does not yet exist, skipping over existing glTF buffers yet to be loaded
@@ -83,49 +180,30 @@ def decode_primitive(gltf, prim):
         if base_buffer_idx <= existing_buffer_idx:
             base_buffer_idx = existing_buffer_idx + 1
 
-    # Read indices.
-    index_accessor = gltf.data.accessors[prim.indices]
-    if dll.decoderGetIndexCount(decoder) != index_accessor.count:
-        print_console('WARNING', 'Draco Decoder: Index count of accessor and decoded index count does not match. Updating accessor.')
-        index_accessor.count = dll.decoderGetIndexCount(decoder)
-    if not dll.decoderReadIndices(decoder, index_accessor.component_type):
-        print_console('ERROR', 'Draco Decoder: Unable to decode indices. Skipping primitive {}.'.format(name))
-        return
-
-    indices_byte_length = dll.decoderGetIndicesByteLength(decoder)
-    decoded_data = bytes(indices_byte_length)
-    dll.decoderCopyIndices(decoder, decoded_data)
-
-    # Generate a new buffer holding the decoded indices.
-    gltf.buffers[base_buffer_idx] = decoded_data
+    if 'index_count' in result:
+        index_accessor = gltf.data.accessors[prim.indices]
+        if result['index_count'] != index_accessor.count:
+            print_console('WARNING', 'Draco Decoder: Index count of accessor and decoded index count does not match. Updating accessor.')
+            index_accessor.count = result['index_count']
 
-    # Create a buffer view referencing the new buffer.
-    gltf.data.buffer_views.append(BufferView.from_dict({
-        'buffer': base_buffer_idx,
-        'byteLength': indices_byte_length
-    }))
+    if 'indices' in result:
+        # Generate a new buffer holding the decoded indices.
+        gltf.buffers[base_buffer_idx] = result['indices']
 
-    # Update accessor to point to the new buffer view.
-    index_accessor.buffer_view = len(gltf.data.buffer_views) - 1
+        # Create a buffer view referencing the new buffer.
+        gltf.data.buffer_views.append(BufferView.from_dict({
+            'buffer': base_buffer_idx,
+            'byteLength': len(result['indices'])
+        }))
 
-    # Read each attribute.
-    for attr_idx, attr in enumerate(extension['attributes']):
-        dracoId = extension['attributes'][attr]
-        if attr not in prim.attributes:
-            print_console('ERROR', 'Draco Decoder: Draco attribute {} not in primitive attributes. Skipping primitive {}.'.format(attr, name))
-            return
+        # Update accessor to point to the new buffer view.
+        index_accessor.buffer_view = len(gltf.data.buffer_views) - 1
 
+    for attr_idx, (attr, decoded_data) in enumerate(result.get('attributes', [])):
         accessor = gltf.data.accessors[prim.attributes[attr]]
-        if dll.decoderGetVertexCount(decoder) != accessor.count:
+        if result['vertex_count'] != accessor.count:
             print_console('WARNING', 'Draco Decoder: Vertex count of accessor and decoded vertex count does not match for attribute {}. Updating accessor.'.format(attr, name))
-            accessor.count = dll.decoderGetVertexCount(decoder)
-        if not dll.decoderReadAttribute(decoder, dracoId, accessor.component_type, accessor.type.encode()):
-            print_console('ERROR', 'Draco Decoder: Could not decode attribute {}. Skipping primitive {}.'.format(attr, name))
-            return
-
-        byte_length = dll.decoderGetAttributeByteLength(decoder, dracoId)
-        decoded_data = bytes(byte_length)
-        dll.decoderCopyAttribute(decoder, dracoId, decoded_data)
+            accessor.count = result['vertex_count']
 
         # Generate a new buffer holding the decoded vertex data.
         buffer_idx = base_buffer_idx + 1 + attr_idx
@@ -134,10 +212,11 @@ def decode_primitive(gltf, prim):
         # Create a buffer view referencing the new buffer.
         gltf.data.buffer_views.append(BufferView.from_dict({
             'buffer': buffer_idx,
-            'byteLength': byte_length
+            'byteLength': len(decoded_data)
         }))
 
         # Update accessor to point to the new buffer view.
         accessor.buffer_view = len(gltf.data.buffer_views) - 1
 
-    dll.decoderRelease(decoder)
+    if result['error'] is not None:
+        print_console('ERROR', result['error'])
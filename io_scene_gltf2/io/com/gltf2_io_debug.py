@@ -16,6 +16,7 @@
 # Imports
 #
 
+import contextlib
 import time
 import logging
 
@@ -114,6 +115,37 @@ def profile_end(label=None):
     print_console('PROFILE', output)
 
 
+class ProfileReport:
+    """Durations of the stages of an export, and counters of what it produced."""
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a stage. A stage entered several times accumulates its durations, and stages can be nested."""
+        self.stages.setdefault(name, 0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - start
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self):
+        return {'stages': dict(self.stages), 'counters': dict(self.counters)}
+
+    def print_report(self, title):
+        print_console('INFO', title)
+        for name, duration in self.stages.items():
+            print_console('INFO', '  {:<24} {:10.3f} s'.format(name, duration))
+        for name, value in self.counters.items():
+            print_console('INFO', '  {:<24} {:>10}'.format(name, value))
+
+
 # TODO: need to have a unique system for logging importer/exporter
 # TODO: this logger is used for importer, but in io and in blender part, but is written here in a _io_ file
 class Log:
@@ -20,10 +20,11 @@ from io_scene_gltf2.io.com import gltf2_io_constants
 class BinaryData:
     """Store for gltf binary data that can later be stored in a buffer."""
 
-    def __init__(self, data: bytes):
+    def __init__(self, data: bytes, byte_stride: typing.Optional[int] = None):
         if not isinstance(data, bytes):
             raise TypeError("Data is not a bytes array")
         self.data = data
+        self.byte_stride = byte_stride
 
     def __eq__(self, other):
         return self.data == other.data
@@ -39,3 +40,28 @@ class BinaryData:
     @property
     def byte_length(self):
         return len(self.data)
+
+
+class DeferredBinaryData(BinaryData):
+    """Store for gltf binary data still being computed, e.g. in a worker thread.
+
+    The data is waited for when first accessed. Until then, equality is decided by the given key,
+    which must identify the data.
+    """
+
+    def __init__(self, future, key):
+        self.__future = future
+        self.__key = key
+        self.byte_stride = None
+
+    @property
+    def data(self):
+        return self.__future.result()
+
+    def __eq__(self, other):
+        if isinstance(other, DeferredBinaryData):
+            return self.__key == other.__key
+        return self.data == other.data
+
+    def __hash__(self):
+        return hash(self.__key)
@@ -13,34 +13,44 @@
 # limitations under the License.
 
 import base64
+import shutil
+import tempfile
 
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.exp import gltf2_io_binary_data
 
+# Binary data is kept in memory up to this size, then spooled to a temporary file
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+# Size of the blocks used when copying the spooled data
+COPY_BLOCK_SIZE = 1024 * 1024
+
 
 class Buffer:
     """Class representing binary data for use in a glTF file as 'buffer' property."""
 
     def __init__(self, buffer_index=0):
-        self.__data = bytearray(b"")
+        self.__data = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.__byte_length = 0
         self.__buffer_index = buffer_index
 
     def add_and_get_view(self, binary_data: gltf2_io_binary_data.BinaryData) -> gltf2_io.BufferView:
         """Add binary data to the buffer. Return a glTF BufferView."""
-        offset = len(self.__data)
-        self.__data.extend(binary_data.data)
+        offset = self.__byte_length
+        self.__data.write(binary_data.data)
 
         length = binary_data.byte_length
 
         # offsets should be a multiple of 4 --> therefore add padding if necessary
         padding = (4 - (length % 4)) % 4
-        self.__data.extend(b"\x00" * padding)
+        self.__data.write(b"\x00" * padding)
+        self.__byte_length += length + padding
 
         buffer_view = gltf2_io.BufferView(
             buffer=self.__buffer_index,
             byte_length=length,
             byte_offset=offset,
-            byte_stride=None,
+            byte_stride=binary_data.byte_stride,
             extensions=None,
             extras=None,
             name=None,
@@ -50,13 +60,24 @@ class Buffer:
 
     @property
     def byte_length(self):
-        return len(self.__data)
+        return self.__byte_length
 
     def to_bytes(self):
-        return self.__data
+        self.__data.seek(0)
+        data = self.__data.read()
+        self.__data.seek(0, 2)
+        return data
+
+    def write_to(self, file):
+        """Copy the buffer into a binary file object, without loading it in memory as a whole."""
+        self.__data.seek(0)
+        shutil.copyfileobj(self.__data, file, COPY_BLOCK_SIZE)
+        self.__data.seek(0, 2)
 
     def to_embed_string(self):
-        return 'data:application/octet-stream;base64,' + base64.b64encode(self.__data).decode('ascii')
+        return 'data:application/octet-stream;base64,' + base64.b64encode(self.to_bytes()).decode('ascii')
 
     def clear(self):
-        self.__data = b""
+        self.__data.close()
+        self.__data = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.__byte_length = 0
@@ -14,6 +14,8 @@
 
 from ctypes import *
 from pathlib import Path
+import concurrent.futures
+import os
 
 from io_scene_gltf2.io.exp.gltf2_io_binary_data import BinaryData
 from ...io.com.gltf2_io_debug import print_console
@@ -24,6 +26,7 @@ def encode_scene_primitives(scenes, export_settings):
     """
     Handles draco compression.
     Moves position, normal and texture coordinate attributes into a Draco encoded buffer.
+    Primitives are encoded in worker threads, as the encoder releases the GIL.
     """
 
     # Load DLL and setup function signatures.
@@ -63,12 +66,22 @@ def encode_scene_primitives(scenes, export_settings):
     dll.encoderCopy.argtypes = [c_void_p, c_void_p]
 
     # Don't encode the same primitive multiple times.
-    encoded_primitives_cache = {}
+    primitives = {}
 
-    # Compress meshes into Draco buffers.
+    # Collect the primitives to compress into Draco buffers.
     for scene in scenes:
         for node in scene.nodes:
-            __traverse_node(node, lambda node: __encode_node(node, dll, export_settings, encoded_primitives_cache))
+            __traverse_node(node, lambda node: __collect_node(node, primitives))
+
+    if primitives:
+        max_workers = min(len(primitives), os.cpu_count() or 1)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            encoded = list(executor.map(
+                lambda primitive: __encode_primitive(primitive, dll, export_settings),
+                primitives.values()))
+
+        for primitive, result in zip(primitives.values(), encoded):
+            __apply_encoded_primitive(primitive, result)
 
     # Release uncompressed index and attribute buffers.
     # Since those buffers may be shared across nodes, this step must happen after all meshes have been compressed.
@@ -98,23 +111,19 @@ def __traverse_node(node, f):
             __traverse_node(child, f)
 
 
-def __encode_node(node, dll, export_settings, encoded_primitives_cache):
+def __collect_node(node, primitives):
     if node.mesh is not None:
         print_console('INFO', 'Draco encoder: Encoding mesh {}.'.format(node.name))
         for primitive in node.mesh.primitives:
-            __encode_primitive(primitive, dll, export_settings, encoded_primitives_cache)
+            __collect_primitive(primitive, primitives)
 
 
-def __encode_primitive(primitive, dll, export_settings, encoded_primitives_cache):
+def __collect_primitive(primitive, primitives):
     attributes = primitive.attributes
-    indices = primitive.indices
 
-    # Check if this primitive has already been encoded.
+    # Check if this primitive has already been collected.
     # This usually happens when nodes are duplicated in Blender, thus their indices/attributes are shared data.
-    if primitive in encoded_primitives_cache:
-        if primitive.extensions is None:
-            primitive.extensions = {}
-        primitive.extensions['KHR_draco_mesh_compression'] = encoded_primitives_cache[primitive]
+    if id(primitive) in primitives:
         return
 
     # Only do TRIANGLES primitives
@@ -125,55 +134,74 @@ def __encode_primitive(primitive, dll, export_settings, encoded_primitives_cache
         print_console('WARNING', 'Draco encoder: Primitive without positions encountered. Skipping.')
         return
 
-    positions = attributes['POSITION']
-
     # Skip nodes without a position buffer, e.g. a primitive from a Blender shared instance.
     if attributes['POSITION'].buffer_view is None:
         return
 
-    encoder = dll.encoderCreate(positions.count)
+    primitives[id(primitive)] = primitive
 
-    draco_ids = {}
-    for attr_name in attributes:
-        attr = attributes[attr_name]
-        draco_id = dll.encoderSetAttribute(encoder, attr_name.encode(), attr.component_type, attr.type.encode(), attr.buffer_view.data)
-        draco_ids[attr_name] = draco_id
-
-    dll.encoderSetIndices(encoder, indices.component_type, indices.count, indices.buffer_view.data)
-
-    dll.encoderSetCompressionLevel(encoder, export_settings['gltf_draco_mesh_compression_level'])
-    dll.encoderSetQuantizationBits(encoder,
-        export_settings['gltf_draco_position_quantization'],
-        export_settings['gltf_draco_normal_quantization'],
-        export_settings['gltf_draco_texcoord_quantization'],
-        export_settings['gltf_draco_color_quantization'],
-        export_settings['gltf_draco_generic_quantization'])
-
-    preserve_triangle_order = primitive.targets is not None and len(primitive.targets) > 0
-    if not dll.encoderEncode(encoder, preserve_triangle_order):
-        print_console('ERROR', 'Could not encode primitive. Skipping primitive.')
 
-    byte_length = dll.encoderGetByteLength(encoder)
-    encoded_data = bytes(byte_length)
-    dll.encoderCopy(encoder, encoded_data)
+def __encode_primitive(primitive, dll, export_settings):
+    """Encode a primitive. Only reads the primitive, so that it can run in a worker thread."""
+    attributes = primitive.attributes
+    indices = primitive.indices
+
+    encoder = dll.encoderCreate(attributes['POSITION'].count)
+    try:
+        draco_ids = {}
+        for attr_name in attributes:
+            attr = attributes[attr_name]
+            draco_id = dll.encoderSetAttribute(encoder, attr_name.encode(), attr.component_type, attr.type.encode(), attr.buffer_view.data)
+            draco_ids[attr_name] = draco_id
+
+        dll.encoderSetIndices(encoder, indices.component_type, indices.count, indices.buffer_view.data)
+
+        dll.encoderSetCompressionLevel(encoder, export_settings['gltf_draco_mesh_compression_level'])
+        dll.encoderSetQuantizationBits(encoder,
+            export_settings['gltf_draco_position_quantization'],
+            export_settings['gltf_draco_normal_quantization'],
+            export_settings['gltf_draco_texcoord_quantization'],
+            export_settings['gltf_draco_color_quantization'],
+            export_settings['gltf_draco_generic_quantization'])
+
+        preserve_triangle_order = primitive.targets is not None and len(primitive.targets) > 0
+        success = dll.encoderEncode(encoder, preserve_triangle_order)
+
+        byte_length = dll.encoderGetByteLength(encoder)
+        encoded_data = bytes(byte_length)
+        dll.encoderCopy(encoder, encoded_data)
+
+        return {
+            'success': success,
+            'encoded_data': encoded_data,
+            'draco_ids': draco_ids,
+            'index_count': dll.encoderGetEncodedIndexCount(encoder),
+            'vertex_count': dll.encoderGetEncodedVertexCount(encoder),
+        }
+    finally:
+        dll.encoderRelease(encoder)
+
+
+def __apply_encoded_primitive(primitive, result):
+    attributes = primitive.attributes
+    indices = primitive.indices
+
+    if not result['success']:
+        print_console('ERROR', 'Could not encode primitive. Skipping primitive.')
 
     if primitive.extensions is None:
         primitive.extensions = {}
 
     extension_info = {
-        'bufferView': BinaryData(encoded_data),
-        'attributes': draco_ids
+        'bufferView': BinaryData(result['encoded_data']),
+        'attributes': result['draco_ids']
     }
     primitive.extensions['KHR_draco_mesh_compression'] = extension_info
-    encoded_primitives_cache[primitive] = extension_info
 
     # Set to triangle list mode.
     primitive.mode = 4
 
     # Update accessors to match encoded data.
-    indices.count = dll.encoderGetEncodedIndexCount(encoder)
-    encoded_vertices = dll.encoderGetEncodedVertexCount(encoder)
+    indices.count = result['index_count']
     for attr_name in attributes:
-        attributes[attr_name].count = encoded_vertices
-
-    dll.encoderRelease(encoder)
+        attributes[attr_name].count = result['vertex_count']
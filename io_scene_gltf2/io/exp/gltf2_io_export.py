@@ -19,6 +19,8 @@
 import json
 import struct
 
+from io_scene_gltf2.io.exp import gltf2_io_buffer
+
 #
 # Globals
 #
@@ -86,7 +88,11 @@ def save_gltf(gltf, export_settings, encoder, glb_buffer):
         spaces_gltf = (4 - (length_gltf & 3)) & 3
         length_gltf += spaces_gltf
 
-        length_bin = len(binary)
+        # The binary chunk is either raw bytes, or a buffer streamed to the file without being loaded in memory
+        if isinstance(binary, gltf2_io_buffer.Buffer):
+            length_bin = binary.byte_length
+        else:
+            length_bin = len(binary)
         zeros_bin = (4 - (length_bin & 3)) & 3
         length_bin += zeros_bin
 
@@ -109,7 +115,10 @@ def save_gltf(gltf, export_settings, encoder, glb_buffer):
         if length_bin > 0:
             file.write(struct.pack("I", length_bin))
             file.write('BIN\0'.encode())
-            file.write(binary)
+            if isinstance(binary, gltf2_io_buffer.Buffer):
+                binary.write_to(file)
+            else:
+                file.write(binary)
             file.write(b'\0' * zeros_bin)
 
         file.close()
@@ -53,3 +53,32 @@ class ImageData:
     @property
     def byte_length(self):
         return len(self._data)
+
+
+class DeferredImageData(ImageData):
+    """Contains an image still being encoded, e.g. in a worker thread.
+
+    The data is waited for when first accessed. Until then, equality is decided by the given key,
+    which must identify the encoded image.
+    """
+
+    def __init__(self, future, key, mime_type: str, name: str):
+        super().__init__(None, mime_type, name)
+        self.__future = future
+        self.__key = key
+
+    def __eq__(self, other):
+        if isinstance(other, DeferredImageData):
+            return self.__key == other.__key
+        return self.data == other.data
+
+    def __hash__(self):
+        return hash(self.__key)
+
+    @property
+    def data(self):
+        return self.__future.result()
+
+    @property
+    def byte_length(self):
+        return len(self.data)
@@ -109,6 +109,7 @@ class BinaryData():
             stride = bufferView.byte_stride or default_stride
 
             if stride == default_stride:
+                # Zero-copy view into the (memory-mapped) buffer.
                 array = np.frombuffer(
                     buffer_data,
                     dtype=np.dtype(dtype).newbyteorder('<'),
@@ -137,6 +138,11 @@ class BinaryData():
                     strides=(stride, bytes_per_elem),
                 )
 
+            # Views at offsets that aren't a multiple of the component size
+            # are slow to process, copy them once instead.
+            if not array.flags.aligned:
+                array = array.copy()
+
         else:
             # No buffer view; initialize to zeros
             array = np.zeros((accessor.count, component_nb), dtype=dtype)
@@ -16,6 +16,7 @@ from ..com.gltf2_io import gltf_from_dict
 from ..com.gltf2_io_debug import Log
 import logging
 import json
+import mmap
 import struct
 import base64
 from os.path import dirname, join, isfile
@@ -36,6 +37,7 @@ class glTFImporter():
         self.import_settings = import_settings
         self.glb_buffer = None
         self.buffers = {}
+        self.file_maps = []
         self.accessor_cache = {}
         self.decode_accessor_cache = {}
 
@@ -134,13 +136,46 @@ class glTFImporter():
 
         return data_type, data_length, data, offset + 8 + data_length
 
+    def map_file(self, path):
+        """
+        Memory-map a file, returning a read-only memoryview of its content.
+
+        Pages are only read when touched, so slicing buffer views and
+        decoding accessors with np.frombuffer never loads unused data.
+        Falls back to reading the whole file when it can't be mapped
+        (empty files, some network file systems).
+        """
+        with open(path, 'rb') as f:
+            try:
+                file_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                return memoryview(f.read())
+
+        self.file_maps.append(file_map)
+        return memoryview(file_map)
+
+    def close(self):
+        """Release buffers and file maps once the import is done."""
+        self.glb_buffer = None
+        self.buffers.clear()
+        self.accessor_cache.clear()
+        self.decode_accessor_cache.clear()
+
+        for file_map in self.file_maps:
+            try:
+                file_map.close()
+            except BufferError:
+                # Some decoded arrays are still alive, the map is released
+                # when they are garbage collected.
+                pass
+        self.file_maps.clear()
+
     def read(self):
         """Read file."""
         if not isfile(self.filename):
             raise ImportError("Please select a file")
 
-        with open(self.filename, 'rb') as f:
-            content = memoryview(f.read())
+        content = self.map_file(self.filename)
 
         if content[:4] == b'glTF':
             gltf, self.glb_buffer = self.load_glb(content)
@@ -184,8 +219,7 @@ class glTFImporter():
 
         path = join(dirname(self.filename), unquote(uri))
         try:
-            with open(path, 'rb') as f_:
-                return memoryview(f_.read())
+            return self.map_file(path)
         except Exception:
             self.log.error("Couldn't read file: " + path)
             return None
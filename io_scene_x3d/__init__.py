@@ -42,6 +42,7 @@ from bpy.props import (
         BoolProperty,
         EnumProperty,
         FloatProperty,
+        IntProperty,
         StringProperty,
         )
 from bpy_extras.io_utils import (
@@ -63,6 +64,19 @@ class ImportX3D(bpy.types.Operator, ImportHelper):
     filename_ext = ".x3d"
     filter_glob: StringProperty(default="*.x3d;*.wrl", options={'HIDDEN'})
 
+    use_merge_shapes: BoolProperty(
+            name="Merge Shapes",
+            description=("Join static shapes sharing a material and "
+                         "top level Transform into a single mesh"),
+            default=False,
+            )
+    use_shape_names: BoolProperty(
+            name="Shape Names",
+            description=("Store the source shape of each face of merged "
+                         "meshes in an 'x3d_shape' face attribute"),
+            default=False,
+            )
+
     def execute(self, context):
         from . import import_x3d
 
@@ -106,6 +120,8 @@ class X3D_PT_export_include(bpy.types.Panel):
         layout.prop(operator, "use_hierarchy")
         layout.prop(operator, "name_decorations")
         layout.prop(operator, "use_h3d")
+        layout.prop(operator, "use_incremental")
+        layout.prop(operator, "use_animation")
 
 
 class X3D_PT_export_transform(bpy.types.Panel):
@@ -161,6 +177,40 @@ class X3D_PT_export_geometry(bpy.types.Panel):
         layout.prop(operator, "use_compress")
 
 
+class X3D_PT_export_lod(bpy.types.Panel):
+    bl_space_type = 'FILE_BROWSER'
+    bl_region_type = 'TOOL_PROPS'
+    bl_label = "Level of Detail"
+    bl_parent_id = "FILE_PT_operator"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        sfile = context.space_data
+        operator = sfile.active_operator
+
+        return operator.bl_idname == "EXPORT_SCENE_OT_x3d"
+
+    def draw_header(self, context):
+        sfile = context.space_data
+        operator = sfile.active_operator
+
+        self.layout.prop(operator, "use_lod", text="")
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False  # No animation.
+
+        sfile = context.space_data
+        operator = sfile.active_operator
+
+        layout.enabled = operator.use_lod
+        layout.prop(operator, "lod_levels")
+        layout.prop(operator, "lod_ratio")
+        layout.prop(operator, "lod_vertex_threshold")
+
+
 @orientation_helper(axis_forward='Z', axis_up='Y')
 class ExportX3D(bpy.types.Operator, ExportHelper):
     """Export selection to Extensible 3D file (.x3d)"""
@@ -212,6 +262,42 @@ class ExportX3D(bpy.types.Operator, ExportHelper):
             description="Export shaders for H3D",
             default=False,
             )
+    use_incremental: BoolProperty(
+            name="Incremental",
+            description=("Reuse the XML of objects unchanged since the previous "
+                         "export, cached in a file next to the exported one"),
+            default=False,
+            )
+    use_animation: BoolProperty(
+            name="Animation",
+            description=("Export animated object transforms as interpolators "
+                         "sampled over the frame range (requires Hierarchy)"),
+            default=False,
+            )
+    use_lod: BoolProperty(
+            name="Level of Detail",
+            description=("Write decimated levels of large meshes "
+                         "into an 'LOD' node"),
+            default=False,
+            )
+    lod_levels: IntProperty(
+            name="Levels",
+            description="Number of decimated levels written after the full resolution mesh",
+            min=1, max=8,
+            default=2,
+            )
+    lod_ratio: FloatProperty(
+            name="Ratio",
+            description="Decimation ratio applied between consecutive levels",
+            min=0.05, max=0.95,
+            default=0.5,
+            )
+    lod_vertex_threshold: IntProperty(
+            name="Vertex Threshold",
+            description="Only meshes with more vertices than this get levels of detail",
+            min=0,
+            default=5000,
+            )
 
     global_scale: FloatProperty(
             name="Scale",
@@ -268,6 +354,33 @@ class X3D_PT_import_transform(bpy.types.Panel):
         layout.prop(operator, "axis_up")
 
 
+class X3D_PT_import_geometry(bpy.types.Panel):
+    bl_space_type = 'FILE_BROWSER'
+    bl_region_type = 'TOOL_PROPS'
+    bl_label = "Geometry"
+    bl_parent_id = "FILE_PT_operator"
+
+    @classmethod
+    def poll(cls, context):
+        sfile = context.space_data
+        operator = sfile.active_operator
+
+        return operator.bl_idname == "IMPORT_SCENE_OT_x3d"
+
+    def draw(self, context):
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False  # No animation.
+
+        sfile = context.space_data
+        operator = sfile.active_operator
+
+        layout.prop(operator, "use_merge_shapes")
+        sub = layout.column()
+        sub.enabled = operator.use_merge_shapes
+        sub.prop(operator, "use_shape_names")
+
+
 def menu_func_import(self, context):
     self.layout.operator(ImportX3D.bl_idname,
                          text="X3D Extensible 3D (.x3d/.wrl)")
@@ -283,8 +396,10 @@ classes = (
     X3D_PT_export_include,
     X3D_PT_export_transform,
     X3D_PT_export_geometry,
+    X3D_PT_export_lod,
     ImportX3D,
     X3D_PT_import_transform,
+    X3D_PT_import_geometry,
 )
 
 
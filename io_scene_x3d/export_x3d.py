@@ -33,6 +33,9 @@ Known issues:
     Can't get the texture array associated with material * not the UV ones;
 """
 
+import array
+import hashlib
+import json
 import math
 import os
 
@@ -47,6 +50,19 @@ H3D_TOP_LEVEL = 'TOP_LEVEL_TI'
 H3D_CAMERA_FOLLOW = 'CAMERA_FOLLOW_TRANSFORM'
 H3D_VIEW_MATRIX = 'view_matrix'
 
+# LOD defines
+# switch distance of the first decimated level, in multiples of the
+# bounding radius, each following level switches at twice the distance.
+LOD_RANGE_SCALE = 4.0
+
+# animation defines
+# keys closer than this to the interpolation of their neighbours are removed.
+ANIM_LOC_EPSILON = 1e-4
+ANIM_ROT_EPSILON = 1e-4  # radians
+ANIM_SCALE_EPSILON = 1e-4
+# segments of up to this many keys are fully checked when removing keys.
+ANIM_FULL_CHECK_SPAN = 16
+
 
 def clamp_color(col):
     return tuple([max(min(c, 1.0), 0.0) for c in col])
@@ -126,6 +142,185 @@ def clean_def(txt):
         })
 
 
+# -----------------------------------------------------------------------------
+# Incremental Export
+# -----------------------------------------------------------------------------
+X3D_FRAGMENT_CACHE_VERSION = 2
+
+
+class RecordingDict(dict):
+    """Dictionary appending every assignment to *log* as (self, key, value)."""
+    __slots__ = ("log",)
+
+    def __init__(self, log):
+        super().__init__()
+        self.log = log
+
+    def __setitem__(self, key, value):
+        self.log.append((self, key, value))
+        super().__setitem__(key, value)
+
+
+class RecordingSet(set):
+    """Set appending every addition to *log* as (self, value, None)."""
+    __slots__ = ("log",)
+
+    def __init__(self, log):
+        super().__init__()
+        self.log = log
+
+    def add(self, value):
+        self.log.append((self, value, None))
+        super().add(value)
+
+
+def matrix_key(matrix):
+    return tuple(v for col in matrix for v in col)
+
+
+def material_images(material):
+    """Images of the image texture nodes of *material*, which its export may write as ImageTexture."""
+    if material is None or not material.use_nodes or material.node_tree is None:
+        return []
+    return [node.image for node in material.node_tree.nodes if node.type == 'TEX_IMAGE' and node.image]
+
+
+def mesh_fingerprint(hasher, mesh):
+    """Feed all mesh data written by the exporter into *hasher*."""
+    def hash_foreach(seq, attr, size, typecode):
+        data = array.array(typecode, [0]) * (len(seq) * size)
+        seq.foreach_get(attr, data)
+        hasher.update(data)
+
+    hash_foreach(mesh.vertices, "co", 3, 'f')
+    hash_foreach(mesh.vertices, "normal", 3, 'f')
+    hash_foreach(mesh.loops, "vertex_index", 1, 'i')
+    hash_foreach(mesh.polygons, "loop_total", 1, 'i')
+    hash_foreach(mesh.polygons, "material_index", 1, 'i')
+
+    use_smooth = [False] * len(mesh.polygons)
+    mesh.polygons.foreach_get("use_smooth", use_smooth)
+    hasher.update(bytes(use_smooth))
+
+    if mesh.uv_layers.active:
+        hash_foreach(mesh.uv_layers.active.data, "uv", 2, 'f')
+    if mesh.vertex_colors.active:
+        hash_foreach(mesh.vertex_colors.active.data, "color", 4, 'f')
+
+    hasher.update(repr((
+        mesh.use_auto_smooth,
+        mesh.auto_smooth_angle,
+        [(ma.name_full,
+          ma.diffuse_color[:],
+          ma.specular_intensity,
+          ma.specular_color[:],
+          ma.use_backface_culling,
+          [(im.name_full,
+            im.filepath,
+            im.library.filepath if im.library else None) for im in material_images(ma)]) if ma else None
+         for ma in mesh.materials],
+    )).encode())
+
+
+class X3DFragmentCache:
+    """
+    Sidecar cache of the XML written for each top level object.
+
+    Entries are keyed by object name and hold the fingerprint of the object,
+    the writer state it was written in, the XML text and the names, tags and
+    files to copy it created, so the fragment can be reused verbatim on the
+    next export.
+    """
+    __slots__ = (
+        "filepath",
+        "settings",
+        "entries",
+        "entries_used",
+        "hits",
+        "misses",
+    )
+
+    def __init__(self, filepath, settings):
+        self.filepath = filepath
+        self.settings = hashlib.sha1(repr((X3D_FRAGMENT_CACHE_VERSION, settings)).encode()).hexdigest()
+        self.entries = {}
+        self.entries_used = {}
+        self.hits = 0
+        self.misses = 0
+
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get("settings") == self.settings:
+            self.entries = data.get("objects", {})
+
+    def state_init(self, delta):
+        return self.state_advance(self.settings, delta)
+
+    @staticmethod
+    def state_advance(state, delta):
+        return hashlib.sha1((state + json.dumps(delta)).encode()).hexdigest()
+
+    def get(self, key, fingerprint, state):
+        entry = self.entries.get(key)
+        if entry is None or entry["fingerprint"] != fingerprint or entry["state"] != state:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries_used[key] = entry
+        return entry
+
+    def set(self, key, fingerprint, state, text, delta):
+        self.entries_used[key] = {
+            "fingerprint": fingerprint,
+            "state": state,
+            "text": text,
+            "delta": delta,
+        }
+
+    def save(self):
+        # Only keep objects from this export, so removed objects don't accumulate.
+        with open(self.filepath, 'w', encoding='utf-8') as f:
+            json.dump({"settings": self.settings, "objects": self.entries_used}, f)
+
+
+def simplify_linear_keys(values, interpolate, distance, threshold):
+    """
+    Return the indices of the keys in *values* to keep, removing keys that
+    linear interpolation between the kept keys approximately reproduces within
+    *threshold*. The first and last keys are always kept.
+
+    Segments of up to ANIM_FULL_CHECK_SPAN keys are checked entirely, so
+    the threshold holds there. Longer ones only check their newest key and
+    the keys at a quarter, half and three quarters of them (a smooth curve
+    deviates the most from the segment there), so the threshold may be
+    exceeded in between, but this stays linear in the number of keys.
+    """
+    tot = len(values)
+    if tot <= 2:
+        return list(range(tot))
+
+    keep = [0]
+    for i in range(1, tot - 1):
+        k = keep[-1]
+        value_prev = values[k]
+        value_next = values[i + 1]
+        span = i + 1 - k
+        if span <= ANIM_FULL_CHECK_SPAN:
+            checked = range(k + 1, i + 1)
+        else:
+            checked = {i, *(k + span * q // 4 for q in (1, 2, 3))}
+        for j in checked:
+            if distance(interpolate(value_prev, value_next, (j - k) / span), values[j]) > threshold:
+                keep.append(i)
+                break
+    keep.append(tot - 1)
+    return keep
+
+
 def build_hierarchy(objects):
     """ returns parent child relationships, skipping
     """
@@ -228,6 +423,12 @@ def export(file,
            use_h3d=False,
            path_mode='AUTO',
            name_decorations=True,
+           use_lod=False,
+           lod_levels=2,
+           lod_ratio=0.5,
+           lod_vertex_threshold=5000,
+           use_incremental=False,
+           use_animation=False,
            ):
 
     # -------------------------------------------------------------------------
@@ -237,18 +438,28 @@ def export(file,
     from bpy_extras.io_utils import unique_name
     from xml.sax.saxutils import quoteattr, escape
 
+    # Incremental export records the names and tags created while writing
+    # each object, so they can be replayed when its fragment is reused.
+    fragment_log = []
+    use_incremental = use_incremental and not use_h3d
+    if use_incremental:
+        def uuid_cache_new():
+            return RecordingDict(fragment_log)
+    else:
+        uuid_cache_new = dict
+
     if name_decorations:
         # If names are decorated, the uuid map can be split up
         # by type for efficiency of collision testing
         # since objects of different types will always have
         # different decorated names.
-        uuid_cache_object = {}    # object
-        uuid_cache_light = {}      # 'LA_' + object.name
-        uuid_cache_view = {}      # object, different namespace
-        uuid_cache_mesh = {}      # mesh
-        uuid_cache_material = {}  # material
-        uuid_cache_image = {}     # image
-        uuid_cache_world = {}     # world
+        uuid_cache_object = uuid_cache_new()    # object
+        uuid_cache_light = uuid_cache_new()      # 'LA_' + object.name
+        uuid_cache_view = uuid_cache_new()      # object, different namespace
+        uuid_cache_mesh = uuid_cache_new()      # mesh
+        uuid_cache_material = uuid_cache_new()  # material
+        uuid_cache_image = uuid_cache_new()     # image
+        uuid_cache_world = uuid_cache_new()     # world
         CA_ = 'CA_'
         OB_ = 'OB_'
         ME_ = 'ME_'
@@ -261,7 +472,7 @@ def export(file,
         # If names are not decorated, it may be possible for two objects to
         # have the same name, so there has to be a unified dictionary to
         # prevent uuid collisions.
-        uuid_cache = {}
+        uuid_cache = uuid_cache_new()
         uuid_cache_object = uuid_cache           # object
         uuid_cache_light = uuid_cache             # 'LA_' + object.name
         uuid_cache_view = uuid_cache             # object, different namespace
@@ -282,10 +493,49 @@ def export(file,
     _TRANSFORM = '_TRANSFORM'
 
     # store files to copy
-    copy_set = set()
+    copy_set = RecordingSet(fragment_log) if use_incremental else set()
 
     # store names of newly cerated meshes, so we dont overlap
-    mesh_name_set = set()
+    mesh_name_set = RecordingSet(fragment_log) if use_incremental else set()
+
+    # decimated meshes per object, [level 1, level 2, ...]
+    lod_meshes = {}
+
+    if use_incremental:
+        fragment_cache = X3DFragmentCache(file.name + ".cache", (
+            matrix_key(global_matrix),
+            use_mesh_modifiers,
+            use_triangulate,
+            use_normals,
+            use_hierarchy,
+            name_decorations,
+            use_lod,
+            lod_levels,
+            lod_ratio,
+            lod_vertex_threshold,
+            path_mode,
+        ))
+        fragment_state = None  # set once the header is written
+        uuid_caches = []
+        for uuid_cache in (uuid_cache_object,
+                           uuid_cache_light,
+                           uuid_cache_view,
+                           uuid_cache_mesh,
+                           uuid_cache_material,
+                           uuid_cache_image,
+                           uuid_cache_world):
+            if not any(uuid_cache is uc for uc in uuid_caches):
+                uuid_caches.append(uuid_cache)
+        id_collections = {
+            'OBJECT': bpy.data.objects,
+            'MESH': bpy.data.meshes,
+            'MATERIAL': bpy.data.materials,
+            'IMAGE': bpy.data.images,
+            'WORLD': bpy.data.worlds,
+        }
+    else:
+        fragment_cache = None
+        fragment_state = None
 
     fw = file.write
     base_src = os.path.dirname(bpy.data.filepath)
@@ -499,8 +749,9 @@ def export(file,
         fw(ident_step + 'location="%.4f %.4f %.4f"\n' % location)
         fw(ident_step + '/>\n')
 
-    def writeIndexedFaceSet(ident, obj, mesh, mesh_name, matrix, world):
+    def writeIndexedFaceSet(ident, obj, mesh, mesh_name, matrix, world, lod_level=0):
         obj_id = quoteattr(unique_name(obj, OB_ + obj.name, uuid_cache_object, clean_func=clean_def, sep="_"))
+        ifs_suffix = "_ifs_lod%d" % lod_level if lod_level else "_ifs"
         mesh_id = quoteattr(unique_name(mesh, ME_ + mesh_name, uuid_cache_mesh, clean_func=clean_def, sep="_"))
         mesh_id_group = prefix_quoted_str(mesh_id, group_)
         mesh_id_coords = prefix_quoted_str(mesh_id, 'coords_')
@@ -521,7 +772,7 @@ def export(file,
 
         # use _ifs_TRANSFORM suffix so we dont collide with transform node when
         # hierarchys are used.
-        ident = writeTransform_begin(ident, matrix, suffix_quoted_str(obj_id, "_ifs" + _TRANSFORM))
+        ident = writeTransform_begin(ident, matrix, suffix_quoted_str(obj_id, ifs_suffix + _TRANSFORM))
 
         if mesh.tag:
             fw('%s<Group USE=%s />\n' % (ident, mesh_id_group))
@@ -948,6 +1199,31 @@ def export(file,
             ident = ident[:-1]
             fw('%s</Collision>\n' % ident)
 
+    def writeLOD(ident, obj, mesh, mesh_name, matrix, world):
+        obj_id = quoteattr(unique_name(obj, OB_ + obj.name, uuid_cache_object, clean_func=clean_def, sep="_"))
+
+        # bounding sphere of the evaluated geometry, in the space of the LOD node
+        bound_box = [matrix @ mathutils.Vector(corner) for corner in obj.evaluated_get(depsgraph).bound_box]
+        center = sum(bound_box, mathutils.Vector()) / len(bound_box)
+        radius = max((corner - center).length for corner in bound_box)
+
+        lod_range = [radius * LOD_RANGE_SCALE * (2.0 ** i) for i in range(len(lod_meshes[obj]))]
+
+        ident_step = ident + (' ' * (-len(ident) + \
+        fw('%s<LOD ' % ident)))
+        fw('DEF=%s\n' % suffix_quoted_str(obj_id, "_lod"))
+        fw(ident_step + 'center="%.6f %.6f %.6f"\n' % center[:])
+        fw(ident_step + 'range="%s"\n' % ' '.join('%.6f' % r for r in lod_range))
+        fw(ident_step + '>\n')
+        ident += '\t'
+
+        writeIndexedFaceSet(ident, obj, mesh, mesh_name, matrix, world)
+        for lod_level, me_lod in enumerate(lod_meshes[obj], 1):
+            writeIndexedFaceSet(ident, obj, me_lod, "%s_LOD%d" % (mesh_name, lod_level), matrix, world, lod_level=lod_level)
+
+        ident = ident[:-1]
+        fw('%s</LOD>\n' % ident)
+
     def writeMaterial(ident, material, world):
         material_id = quoteattr(unique_name(material, MA_ + material.name, uuid_cache_material, clean_func=clean_def, sep="_"))
 
@@ -1376,11 +1652,32 @@ def export(file,
     # Export Object Hierarchy (recursively called)
     # -------------------------------------------------------------------------
     def export_object(ident, obj_main_parent, obj_main, obj_children):
-        matrix_fallback = mathutils.Matrix()
-        world = scene.world
         derived_dict = create_derived_objects(depsgraph, [obj_main])
         derived = derived_dict.get(obj_main)
 
+        if fragment_cache is None:
+            ident, is_dummy_tx = export_object_begin(ident, obj_main_parent, obj_main, derived)
+        else:
+            ident, is_dummy_tx = export_object_begin_cached(ident, obj_main_parent, obj_main, derived)
+
+        # ---------------------------------------------------------------------
+        # write out children recursively
+        # ---------------------------------------------------------------------
+        for obj_child, obj_child_children in obj_children:
+            export_object(ident, obj_main, obj_child, obj_child_children)
+
+        if is_dummy_tx:
+            ident = ident[:-1]
+            fw('%s</Transform>\n' % ident)
+            is_dummy_tx = False
+
+        if use_hierarchy:
+            ident = writeTransform_end(ident)
+
+    def export_object_begin(ident, obj_main_parent, obj_main, derived):
+        matrix_fallback = mathutils.Matrix()
+        world = scene.world
+
         if use_hierarchy:
             obj_main_matrix_world = obj_main.matrix_world
             if obj_main_parent:
@@ -1449,7 +1746,10 @@ def export(file,
                         mesh_name = me.name
                     # done
 
-                    writeIndexedFaceSet(ident, obj, me, mesh_name, obj_matrix, world)
+                    if obj in lod_meshes:
+                        writeLOD(ident, obj, me, mesh_name, obj_matrix, world)
+                    else:
+                        writeIndexedFaceSet(ident, obj, me, mesh_name, obj_matrix, world)
 
                     # free mesh created with to_mesh()
                     if do_remove:
@@ -1470,24 +1770,310 @@ def export(file,
                 #print "Info: Ignoring [%s], object type [%s] not handle yet" % (object.name,object.getType)
                 pass
 
-        # ---------------------------------------------------------------------
-        # write out children recursively
-        # ---------------------------------------------------------------------
-        for obj_child, obj_child_children in obj_children:
-            export_object(ident, obj_main, obj_child, obj_child_children)
+        return ident, is_dummy_tx
 
-        if is_dummy_tx:
-            ident = ident[:-1]
-            fw('%s</Transform>\n' % ident)
+    # -------------------------------------------------------------------------
+    # Incremental Export (cached object fragments)
+    # -------------------------------------------------------------------------
+    def object_fingerprint(ident, obj_main_parent, obj_main, derived):
+        hasher = hashlib.sha1()
+        hasher.update(repr((
+            ident,
+            obj_main.name_full,
+            matrix_key(obj_main.matrix_world),
+            obj_main_parent.name_full if obj_main_parent else None,
+            matrix_key(obj_main_parent.matrix_world) if obj_main_parent else None,
+        )).encode())
+
+        for obj, obj_matrix in (() if derived is None else derived):
+            obj_type = obj.type
+            hasher.update(repr((obj.name_full, obj_type, matrix_key(obj_matrix))).encode())
+
+            if obj_type in {'MESH', 'CURVE', 'SURFACE', 'FONT'}:
+                hasher.update(repr([(mod.type, mod.show_viewport) for mod in obj.modifiers]).encode())
+                if (obj_type != 'MESH') or (use_mesh_modifiers and obj.is_modified(scene, 'PREVIEW')):
+                    obj_for_mesh = obj.evaluated_get(depsgraph) if use_mesh_modifiers else obj
+                    try:
+                        me = obj_for_mesh.to_mesh()
+                    except:
+                        me = None
+                    if me is not None:
+                        mesh_fingerprint(hasher, me)
+                        obj_for_mesh.to_mesh_clear()
+                else:
+                    hasher.update(obj.data.name_full.encode())
+                    mesh_fingerprint(hasher, obj.data)
+            elif obj_type == 'CAMERA':
+                hasher.update(repr(obj.data.angle).encode())
+            elif obj_type == 'LIGHT':
+                data = obj.data
+                hasher.update(repr((
+                    data.type,
+                    data.energy,
+                    data.color[:],
+                    data.distance,
+                    data.spot_size if data.type == 'SPOT' else None,
+                )).encode())
+
+        return hasher.hexdigest()
+
+    def id_key_from_id(id_data):
+        # Only persistent IDs can be looked up again,
+        # temporary meshes are replaced by a placeholder key.
+        id_coll = id_collections.get(id_data.id_type)
+        if id_coll is None or not id_data.users:
+            return None
+        lib_path = id_data.library.filepath if id_data.library else None
+        if id_coll.get((id_data.name, lib_path) if lib_path else id_data.name) != id_data:
+            return None
+        return [id_data.id_type, id_data.name, lib_path]
+
+    def id_from_id_key(id_key):
+        if id_key is None:
+            return None
+        id_type, name, lib_path = id_key
+        return id_collections[id_type].get((name, lib_path) if lib_path else name)
+
+    def fragment_tag_candidates(derived):
+        ids = []
+        materials = []
+        for obj, _obj_matrix in (() if derived is None else derived):
+            if obj.type == 'MESH':
+                ids.append(obj.data)
+                materials.extend(ma for ma in obj.data.materials if ma)
+            materials.extend(slot.material for slot in obj.material_slots if slot.material)
+        ids.extend(materials)
+        for ma in materials:
+            ids.extend(material_images(ma))
+        return ids
+
+    def fragment_delta(tags_before):
+        names = []
+        for container, key, value in fragment_log:
+            if container is mesh_name_set:
+                names.append([-1, None, key])
+            elif container is copy_set:
+                names.append([-2, None, key])
+            else:
+                cache_index = next(i for i, uuid_cache in enumerate(uuid_caches) if uuid_cache is container)
+                names.append([cache_index, id_key_from_id(key), value])
+        tags = [id_key_from_id(id_data) for id_data in tags_before if id_data.tag and not tags_before[id_data]]
+        return {"names": names, "tags": [id_key for id_key in tags if id_key is not None]}
+
+    def fragment_delta_replay(delta):
+        for cache_index, id_key, value in delta["names"]:
+            if cache_index == -1:
+                set.add(mesh_name_set, value)
+            elif cache_index == -2:
+                # Files referenced by the fragment still have to be copied (path_mode 'COPY').
+                set.add(copy_set, tuple(value))
+            else:
+                key = id_from_id_key(id_key)
+                dict.__setitem__(uuid_caches[cache_index], object() if key is None else key, value)
+        for id_key in delta["tags"]:
+            id_data = id_from_id_key(id_key)
+            if id_data is not None:
+                id_data.tag = True
+
+    def export_object_begin_cached(ident, obj_main_parent, obj_main, derived):
+        nonlocal fw, fragment_state
+
+        key = obj_main.name_full
+        fingerprint = object_fingerprint(ident, obj_main_parent, obj_main, derived)
+        entry = fragment_cache.get(key, fingerprint, fragment_state)
+
+        if entry is not None:
+            fw(entry["text"])
+            fragment_delta_replay(entry["delta"])
+            delta = entry["delta"]
+            if use_hierarchy:
+                ident += '\t'
             is_dummy_tx = False
+        else:
+            tags_before = {id_data: id_data.tag for id_data in fragment_tag_candidates(derived)}
+            fragment_log.clear()
+            fragment = []
+            fw_file = fw
+            fw = fragment.append
+            try:
+                ident, is_dummy_tx = export_object_begin(ident, obj_main_parent, obj_main, derived)
+            finally:
+                fw = fw_file
+            text = ''.join(fragment)
+            fw(text)
+            delta = fragment_delta(tags_before)
+            fragment_cache.set(key, fingerprint, fragment_state, text, delta)
+
+        fragment_state = fragment_cache.state_advance(fragment_state, delta)
+        return ident, is_dummy_tx
 
-        if use_hierarchy:
-            ident = writeTransform_end(ident)
+    # -------------------------------------------------------------------------
+    # Animation (sampled transforms)
+    # -------------------------------------------------------------------------
+    def sample_animation(objects_hierarchy):
+        """
+        Sample the transform nodes of animated objects over the frame range.
+
+        The scene is evaluated once per frame for all objects, returning
+        {object: (frames, locations, rotations, scales)} in the space of the
+        transform node written by export_object.
+        """
+        animated = {}
+
+        def collect(obj_main_parent, hierarchy):
+            for obj_main, obj_main_children in hierarchy:
+                anim_data = obj_main.animation_data
+                if anim_data and (anim_data.action or anim_data.nla_tracks or anim_data.drivers):
+                    animated[obj_main] = obj_main_parent
+                collect(obj_main, obj_main_children)
+
+        collect(None, objects_hierarchy)
+        if not animated:
+            return {}
+
+        frame_current = scene.frame_current
+        subframe_current = scene.frame_subframe
+        frames = range(scene.frame_start, scene.frame_end + 1, scene.frame_step)
+        samples = {obj: ([], [], []) for obj in animated}
+        matrix_fallback = mathutils.Matrix()
+
+        for frame in frames:
+            scene.frame_set(frame)
+            for obj, obj_parent in animated.items():
+                if obj_parent:
+                    matrix = obj_parent.matrix_world.inverted(matrix_fallback) @ obj.matrix_world
+                else:
+                    matrix = global_matrix @ obj.matrix_world
+                loc, rot, sca = matrix.decompose()
+                locs, rots, scas = samples[obj]
+                # keep quaternions in the same hemisphere, for interpolation
+                if rots and rots[-1].dot(rot) < 0.0:
+                    rot.negate()
+                locs.append(loc)
+                rots.append(rot)
+                scas.append(sca)
+
+        scene.frame_set(frame_current, subframe=subframe_current)
+
+        return {obj: (frames, *channels) for obj, channels in samples.items()}
+
+    def writeAnimation(ident, animation):
+        if not animation:
+            return
+
+        frames = next(iter(animation.values()))[0]
+        frame_tot = max(frames[-1] - frames[0], 1)
+        fps = scene.render.fps / scene.render.fps_base
+
+        time_id = quoteattr(unique_name(scene, 'TS_' + scene.name, uuid_cache_object, clean_func=clean_def, sep="_"))
+        ident_step = ident + (' ' * (-len(ident) + \
+        fw('%s<TimeSensor ' % ident)))
+        fw('DEF=%s\n' % time_id)
+        fw(ident_step + 'cycleInterval="%.6f"\n' % (frame_tot / fps))
+        fw(ident_step + 'loop="true"\n')
+        fw(ident_step + '/>\n')
+
+        routes = []
+        for obj, (frames, locs, rots, scas) in animation.items():
+            tx_id = suffix_quoted_str(quoteattr(unique_name(obj, obj.name, uuid_cache_object, clean_func=clean_def, sep="_")), _TRANSFORM)
+            fractions = [(frame - frames[0]) / frame_tot for frame in frames]
+
+            for prefix, interp_type, to_field, values, interpolate, distance, threshold, value_as_str in (
+                    ('PI_', 'PositionInterpolator', 'set_translation', locs,
+                     mathutils.Vector.lerp, lambda a, b: (a - b).length, ANIM_LOC_EPSILON,
+                     lambda v: '%.6f %.6f %.6f' % v[:]),
+                    ('OI_', 'OrientationInterpolator', 'set_rotation', rots,
+                     mathutils.Quaternion.slerp, lambda a, b: a.rotation_difference(b).angle, ANIM_ROT_EPSILON,
+                     lambda q: '%.6f %.6f %.6f %.6f' % (*q.axis, q.angle)),
+                    ('SI_', 'PositionInterpolator', 'set_scale', scas,
+                     mathutils.Vector.lerp, lambda a, b: (a - b).length, ANIM_SCALE_EPSILON,
+                     lambda v: '%.6f %.6f %.6f' % v[:]),
+            ):
+                keep = simplify_linear_keys(values, interpolate, distance, threshold)
+                if len(keep) == 2 and distance(values[keep[0]], values[keep[1]]) <= threshold:
+                    # not animated, the static transform is enough
+                    continue
+
+                interp_id = prefix_quoted_str(tx_id, prefix)
+                ident_step = ident + (' ' * (-len(ident) + \
+                fw('%s<%s ' % (ident, interp_type))))
+                fw('DEF=%s\n' % interp_id)
+                fw(ident_step + 'key="%s"\n' % ' '.join('%.6f' % fractions[i] for i in keep))
+                fw(ident_step + 'keyValue="%s"\n' % ' '.join(value_as_str(values[i]) for i in keep))
+                fw(ident_step + '/>\n')
+
+                routes.append('<ROUTE fromNode=%s fromField="fraction_changed" toNode=%s toField="set_fraction" />' % (time_id, interp_id))
+                routes.append('<ROUTE fromNode=%s fromField="value_changed" toNode=%s toField="%s" />' % (interp_id, tx_id, to_field))
+
+        for route in routes:
+            fw('%s%s\n' % (ident, route))
+
+    # -------------------------------------------------------------------------
+    # Level of Detail Meshes
+    # -------------------------------------------------------------------------
+    def create_lod_meshes(objects):
+        """
+        Decimate every mesh above the vertex threshold into ``lod_levels``
+        meshes, stored in ``lod_meshes``.
+
+        All levels are evaluated by a single depsgraph update, through temporary
+        objects holding a Decimate modifier, so meshes owned by the depsgraph
+        are not invalidated while writing.
+        """
+        obs = {}
+        for derived in create_derived_objects(depsgraph, objects).values():
+            for obj, _obj_matrix in derived:
+                if obj.type == 'MESH':
+                    obs[obj] = None
+
+        tmp_meshes = []
+        tmp_objects = []
+        tmp_levels = {}
+        # Temporary data must not be left in the file if anything fails.
+        try:
+            for obj in obs:
+                obj_eval = obj.evaluated_get(depsgraph)
+                if len(obj_eval.data.vertices if use_mesh_modifiers else obj.data.vertices) <= lod_vertex_threshold:
+                    continue
+
+                if use_mesh_modifiers:
+                    me_src = bpy.data.meshes.new_from_object(obj_eval)
+                else:
+                    me_src = obj.data.copy()
+                tmp_meshes.append(me_src)
+
+                levels = tmp_levels[obj] = []
+                for lod_level in range(1, lod_levels + 1):
+                    tmp_ob = bpy.data.objects.new("X3D_LOD_TMP", me_src)
+                    tmp_objects.append(tmp_ob)
+                    mod = tmp_ob.modifiers.new("X3D_LOD", 'DECIMATE')
+                    mod.ratio = lod_ratio ** lod_level
+                    scene.collection.objects.link(tmp_ob)
+                    levels.append(tmp_ob)
+
+            if not tmp_objects:
+                return
+
+            depsgraph.update()
+
+            for obj, levels in tmp_levels.items():
+                # Stored as they are created, so they are removed by the global cleanup whatever happens.
+                me_levels = lod_meshes[obj] = []
+                for tmp_ob in levels:
+                    me_levels.append(bpy.data.meshes.new_from_object(tmp_ob.evaluated_get(depsgraph)))
+        finally:
+            for tmp_ob in tmp_objects:
+                bpy.data.objects.remove(tmp_ob)
+            for me_src in tmp_meshes:
+                bpy.data.meshes.remove(me_src)
+
+        depsgraph.update()
 
     # -------------------------------------------------------------------------
     # Main Export Function
     # -------------------------------------------------------------------------
     def export_main():
+        nonlocal fragment_state
         world = scene.world
 
         # tag un-exported IDs
@@ -1501,6 +2087,9 @@ def export(file,
         else:
             objects = [obj for obj in view_layer.objects if obj.visible_get(view_layer=view_layer)]
 
+        if use_lod:
+            create_lod_meshes(objects)
+
         print('Info: starting X3D export to %r...' % file.name)
         ident = ''
         ident = writeHeader(ident)
@@ -1509,6 +2098,9 @@ def export(file,
         writeBackground(ident, world)
         writeFog(ident, world)
 
+        if fragment_cache is not None:
+            fragment_state = fragment_cache.state_init(fragment_delta({}))
+
         ident = '\t\t'
 
         if use_hierarchy:
@@ -1516,12 +2108,27 @@ def export(file,
         else:
             objects_hierarchy = ((obj, []) for obj in objects)
 
+        # Animation is written on the transform nodes of the hierarchy.
+        if use_animation and use_hierarchy:
+            animation = sample_animation(objects_hierarchy)
+        else:
+            animation = {}
+
         for obj_main, obj_main_children in objects_hierarchy:
             export_object(ident, None, obj_main, obj_main_children)
 
+        writeAnimation(ident, animation)
+
         ident = writeFooter(ident)
 
-    export_main()
+    try:
+        export_main()
+    finally:
+        # Decimated meshes are not user data, never leave them in the file.
+        for levels in lod_meshes.values():
+            for me_lod in levels:
+                bpy.data.meshes.remove(me_lod)
+        lod_meshes.clear()
 
     # -------------------------------------------------------------------------
     # global cleanup
@@ -1531,6 +2138,11 @@ def export(file,
     if use_h3d:
         bpy.data.materials.remove(gpu_shader_dummy_mat)
 
+    if fragment_cache is not None:
+        fragment_cache.save()
+        print('Info: reused %d of %d cached objects' %
+              (fragment_cache.hits, fragment_cache.hits + fragment_cache.misses))
+
     # copy all collected files.
     # print(copy_set)
     bpy_extras.io_utils.path_reference_copy(copy_set)
@@ -1572,7 +2184,13 @@ def save(context,
          use_h3d=False,
          global_matrix=None,
          path_mode='AUTO',
-         name_decorations=True
+         name_decorations=True,
+         use_lod=False,
+         lod_levels=2,
+         lod_ratio=0.5,
+         lod_vertex_threshold=5000,
+         use_incremental=False,
+         use_animation=False,
          ):
 
     bpy.path.ensure_ext(filepath, '.x3dz' if use_compress else '.x3d')
@@ -1601,6 +2219,12 @@ def save(context,
            use_h3d=use_h3d,
            path_mode=path_mode,
            name_decorations=name_decorations,
+           use_lod=use_lod,
+           lod_levels=lod_levels,
+           lod_ratio=lod_ratio,
+           lod_vertex_threshold=lod_vertex_threshold,
+           use_incremental=use_incremental,
+           use_animation=use_animation,
            )
 
     return {'FINISHED'}
@@ -1488,7 +1488,8 @@ for i, f in enumerate(files):
 # -----------------------------------------------------------------------------------
 import bpy
 from bpy_extras import image_utils, node_shader_utils
-from mathutils import Vector, Matrix, Quaternion
+from mathutils import Vector, Matrix
+import numpy as np
 
 GLOBALS = {'CIRCLE_DETAIL': 16}
 
@@ -2079,29 +2080,33 @@ def importMesh_ElevationGrid(geom, ancestry):
     z_spacing = geom.getFieldAsFloat('zSpacing', 1, ancestry)
     ccw = geom.getFieldAsBool('ccw', True, ancestry)
 
-    # The spec assumes a certain ordering of quads; outer loop by z, inner by x
+    # The spec assumes a certain ordering of heights; outer loop by z,
+    # inner by x. Vertices follow the same order, so the vertex index of the
+    # grid point (x, z) is z * x_dim + x.
     bpymesh = bpy.data.meshes.new(name="ElevationGrid")
+    co = np.empty((z_dim, x_dim, 3), dtype=np.float32)
+    co[:, :, 0] = np.arange(x_dim, dtype=np.float32)[np.newaxis, :] * x_spacing
+    co[:, :, 1] = np.asarray(height[:x_dim * z_dim], dtype=np.float32).reshape(z_dim, x_dim)
+    co[:, :, 2] = np.arange(z_dim, dtype=np.float32)[:, np.newaxis] * z_spacing
     bpymesh.vertices.add(x_dim * z_dim)
-    co = [w for x in range(x_dim) for z in range(z_dim)
-          for w in (x * x_spacing, height[x_dim * z + x], z * z_spacing)]
-    bpymesh.vertices.foreach_set("co", co)
+    bpymesh.vertices.foreach_set("co", co.ravel())
 
+    # Quads are in the same order as heights too, so the face index of the
+    # quad at (x, z) is z * (x_dim - 1) + x, as the per-face colors expect.
+    # If the ccw is off, we flip the 2nd and the 4th vertices of each face.
     num_polys = (x_dim - 1) * (z_dim - 1)
+    v00 = (np.arange(z_dim - 1, dtype=np.int32)[:, np.newaxis] * x_dim +
+           np.arange(x_dim - 1, dtype=np.int32)[np.newaxis, :]).ravel()
+    if ccw:
+        verts = np.stack((v00, v00 + x_dim, v00 + x_dim + 1, v00 + 1), axis=1).ravel()
+    else:
+        verts = np.stack((v00, v00 + 1, v00 + x_dim + 1, v00 + x_dim), axis=1).ravel()
+
     bpymesh.loops.add(num_polys * 4)
     bpymesh.polygons.add(num_polys)
-    bpymesh.polygons.foreach_set("loop_start", range(0, num_polys * 4, 4))
-    bpymesh.polygons.foreach_set("loop_total", (4,) * num_polys)
-    # If the ccw is off, we flip the 2nd and the 4th vertices of each face.
-    # For quad tessfaces, it was important that the final vertex index was not 0
-    # (Blender treated it as a triangle then).
-    # So simply reversing the face was not an option.
-    # With bmesh polygons, this has no importance anymore, but keep existing code for now.
-    verts = [i for x in range(x_dim - 1) for z in range(z_dim - 1)
-             for i in (z * x_dim + x,
-                       z * x_dim + x + 1 if ccw else (z + 1) * x_dim + x,
-                       (z + 1) * x_dim + x + 1,
-                       (z + 1) * x_dim + x if ccw else z * x_dim + x + 1)]
-    bpymesh.polygons.foreach_set("vertices", verts)
+    bpymesh.polygons.foreach_set("loop_start", np.arange(0, num_polys * 4, 4, dtype=np.int32))
+    bpymesh.polygons.foreach_set("loop_total", np.full(num_polys, 4, dtype=np.int32))
+    bpymesh.loops.foreach_set("vertex_index", verts)
 
     importMesh_ApplyNormals(bpymesh, geom, ancestry)
     # ApplyColors won't work here; faces are quads, and also per-face
@@ -2109,48 +2114,33 @@ def importMesh_ElevationGrid(geom, ancestry):
     colors = geom.getChildBySpec(['ColorRGBA', 'Color'])
     if colors:
         if colors.getSpec() == 'ColorRGBA':
-            rgb = [c[:3] for c
-                   in colors.getFieldAsArray('color', 4, ancestry)]
-            # Array of arrays; no need to flatten
+            rgb = np.asarray(colors.getFieldAsArray('color', 0, ancestry), dtype=np.float32).reshape(-1, 4)
         else:
-            rgb = colors.getFieldAsArray('color', 3, ancestry)
+            rgb = np.asarray(colors.getFieldAsArray('color', 0, ancestry), dtype=np.float32).reshape(-1, 3)
+        rgba = np.ones((len(rgb), 4), dtype=np.float32)
+        rgba[:, :rgb.shape[1]] = rgb
 
         tc = bpymesh.vertex_colors.new().data
         if geom.getFieldAsBool('colorPerVertex', True, ancestry):
-            # Per-vertex coloring
-            # Note the 2/4 flip here
-            tc.foreach_set("color",
-                           [c for x in range(x_dim - 1)
-                              for z in range(z_dim - 1)
-                              for rgb_idx in (z * x_dim + x,
-                                              z * x_dim + x + 1 if ccw else (z + 1) * x_dim + x,
-                                              (z + 1) * x_dim + x + 1,
-                                              (z + 1) * x_dim + x if ccw else z * x_dim + x + 1)
-                              for c in rgb[rgb_idx]])
+            # Per-vertex coloring, colors are in the order of vertices
+            tc.foreach_set("color", rgba[verts].ravel())
         else:  # Coloring per face
-            tc.foreach_set("color",
-                           [c for x in range(x_dim - 1)
-                              for z in range(z_dim - 1)
-                              for rgb_idx in (z * (x_dim - 1) + x,) * 4
-                              for c in rgb[rgb_idx]])
+            tc.foreach_set("color", np.repeat(rgba[:num_polys], 4, axis=0).ravel())
 
     # Textures also need special treatment; it's all quads,
     # and there's a builtin algorithm for coordinate generation
     tex_coord = geom.getChildBySpec('TextureCoordinate')
     if tex_coord:
-        uvs = tex_coord.getFieldAsArray('point', 2, ancestry)
+        uvs = np.asarray(tex_coord.getFieldAsArray('point', 0, ancestry), dtype=np.float32).reshape(-1, 2)
     else:
-        uvs = [(i / (x_dim - 1), j / (z_dim - 1))
-                        for i in range(x_dim)
-                        for j in range(z_dim)]
+        uvs = np.empty((z_dim, x_dim, 2), dtype=np.float32)
+        uvs[:, :, 0] = np.arange(x_dim, dtype=np.float32)[np.newaxis, :] / max(x_dim - 1, 1)
+        uvs[:, :, 1] = np.arange(z_dim, dtype=np.float32)[:, np.newaxis] / max(z_dim - 1, 1)
+        uvs = uvs.reshape(-1, 2)
 
+    # UVs are per vertex, spread them over the loops.
     d = bpymesh.uv_layers.new().data
-    # Rather than repeat the face/vertex algorithm from above, we read
-    # the vertex index back from polygon. Might be suboptimal.
-    uvs = [i for poly in bpymesh.polygons
-            for vidx in poly.vertices
-            for i in uvs[vidx]]
-    d.foreach_set('uv', uv)
+    d.foreach_set('uv', uvs[verts].ravel())
 
     bpymesh.validate()
     bpymesh.update()
@@ -2160,8 +2150,8 @@ def importMesh_ElevationGrid(geom, ancestry):
 def importMesh_Extrusion(geom, ancestry):
     # Interestingly, the spec doesn't allow for vertex/face colors in this
     # element, nor for normals.
-    # Since coloring and normals are not supported here, and also large
-    # polygons for caps might be required, we shall use from_pydata().
+    # Large polygons for caps might be required, they are kept as n-gons
+    # and left to Blender's tessellation.
 
     ccw = geom.getFieldAsBool('ccw', True, ancestry)
     begin_cap = geom.getFieldAsBool('beginCap', True, ancestry)
@@ -2173,188 +2163,191 @@ def importMesh_Extrusion(geom, ancestry):
     if not spine:
         spine = ((0, 0, 0), (0, 1, 0))
     orient = geom.getFieldAsArray('orientation', 4, ancestry)
-    if orient:
-        orient = [Quaternion(o[:3], o[3]).to_matrix()
-                  if o[3] else None for o in orient]
     scale = geom.getFieldAsArray('scale', 2, ancestry)
-    if scale:
-        scale = [Matrix(((s[0], 0, 0), (0, 1, 0), (0, 0, s[1])))
-                 if s[0] != 1 or s[1] != 1 else None for s in scale]
 
     # Special treatment for the closed spine and cross section.
     # Let's save some memory by not creating identical but distinct vertices;
     # later we'll introduce conditional logic to link the last vertex with
     # the first one where necessary.
-    cross_closed = cross[0] == cross[-1]
+    cross = np.asarray(cross, dtype=np.float64).reshape(-1, 2)
+    cross_closed = np.array_equal(cross[0], cross[-1])
     if cross_closed:
         cross = cross[:-1]
     nc = len(cross)
-    cross = [Vector((c[0], 0, c[1])) for c in cross]
     ncf = nc if cross_closed else nc - 1
     # Face count along the cross; for closed cross, it's the same as the
     # respective vertex count
 
-    spine_closed = spine[0] == spine[-1]
+    spine = np.asarray(spine, dtype=np.float64).reshape(-1, 3)
+    spine_closed = np.array_equal(spine[0], spine[-1])
     if spine_closed:
         spine = spine[:-1]
     ns = len(spine)
-    spine = [Vector(s) for s in spine]
     nsf = ns if spine_closed else ns - 1
 
+    # Spine-aligned cross-section plane (SCP) of every spine point.
+    # The y axis is along the spine, the z axis is perpendicular to the
+    # plane of the adjacent spine segments.
+    idx = np.arange(ns)
+    snext = spine[(idx + 1) % ns]
+    sprev = spine[(idx - 1) % ns]
+    y = snext - sprev
+    if not spine_closed:
+        y[0] = spine[1] - spine[0]
+        y[-1] = spine[-1] - spine[-2]
+
+    try_z = np.cross(snext - spine, sprev - spine)
+    has_z = np.linalg.norm(try_z, axis=1) > EPSILON
+    if not spine_closed:
+        # The end points of an open spine have only one adjacent segment.
+        has_z[0] = has_z[-1] = False
+
     # This will be used for fallback, where the current spine point joins
     # two collinear spine segments. No need to recheck the case of the
     # closed spine/last-to-first point juncture; if there's an angle there,
-    # it would kick in on the first iteration of the main loop by spine.
-    def findFirstAngleNormal():
-        for i in range(1, ns - 1):
-            spt = spine[i]
-            z = (spine[i + 1] - spt).cross(spine[i - 1] - spt)
-            if z.length > EPSILON:
-                return z
+    # it would kick in on the first point.
+    has_z_inner = np.flatnonzero(has_z[1:ns - 1])
+    if len(has_z_inner):
+        z_first = try_z[has_z_inner[0] + 1]
+    else:
         # All the spines are collinear. Fallback to the rotated source
         # XZ plane.
         # TODO: handle the situation where the first two spine points match
-        v = spine[1] - spine[0]
+        v = Vector(spine[1] - spine[0])
         orig_y = Vector((0, 1, 0))
         orig_z = Vector((0, 0, 1))
         if v.cross(orig_y).length >= EPSILON:
             # Spine at angle with global y - rotate the z accordingly
             orig_z.rotate(orig_y.rotation_difference(v))
-        return orig_z
-
-    verts = []
-    z = None
-    for i, spt in enumerate(spine):
-        if (i > 0 and i < ns - 1) or spine_closed:
-            snext = spine[(i + 1) % ns]
-            sprev = spine[(i - 1 + ns) % ns]
-            y = snext - sprev
-            vnext = snext - spt
-            vprev = sprev - spt
-            try_z = vnext.cross(vprev)
-            # Might be zero, then all kinds of fallback
-            if try_z.length > EPSILON:
-                if z is not None and try_z.dot(z) < 0:
-                    try_z.negate()
-                z = try_z
-            elif not z:  # No z, and no previous z.
-                # Look ahead, see if there's at least one point where
-                # spines are not collinear.
-                z = findFirstAngleNormal()
-        elif i == 0:  # And non-crossed
-            snext = spine[i + 1]
-            y = snext - spt
-            z = findFirstAngleNormal()
-        else:  # last point and not crossed
-            sprev = spine[i - 1]
-            y = spt - sprev
-            # If there's more than one point in the spine, z is already set.
-            # One point in the spline is an error anyway.
-
-        x = y.cross(z)
-        m = Matrix(((x.x, y.x, z.x), (x.y, y.y, z.y), (x.z, y.z, z.z)))
-        # Columns are the unit vectors for the xz plane for the cross-section
-        m.normalize()
-        if orient:
-            mrot = orient[i] if len(orient) > 1 else orient[0]
-            if mrot:
-                m @= mrot  # Not sure about this. Counterexample???
-        if scale:
-            mscale = scale[i] if len(scale) > 1 else scale[0]
-            if mscale:
-                m @= mscale
-                # First the cross-section 2-vector is scaled,
-                # then applied to the xz plane unit vectors
-        for cpt in cross:
-            verts.append((spt + m @ cpt).to_tuple())
-            # Could've done this with a single 4x4 matrix... Oh well
-
-    # The method from_pydata() treats correctly quads with final vertex
-    # index being zero.
-    # So we just flip the vertices if ccw is off.
+        z_first = np.array(orig_z, dtype=np.float64)
+
+    # Keep the z axis consistent along the spine: each valid z is flipped
+    # when it points away from the previous one. A valid z at the very first
+    # point of a closed spine has nothing to compare to.
+    z_valid_idx = np.flatnonzero(has_z)
+    z_valid = try_z[z_valid_idx]
+    if len(z_valid):
+        z_prev = np.empty_like(z_valid)
+        z_prev[0] = z_valid[0] if z_valid_idx[0] == 0 else z_first
+        z_prev[1:] = z_valid[:-1]
+        z_sign = np.where(np.einsum('ij,ij->i', z_valid, z_prev) < 0, -1.0, 1.0)
+        z_valid *= np.cumprod(z_sign)[:, np.newaxis]
+
+    # Points without a valid z reuse the last one (forward fill).
+    z_src = np.where(has_z, idx, -1)
+    np.maximum.accumulate(z_src, out=z_src)
+    z = np.empty_like(spine)
+    z[:] = z_first
+    z[has_z] = z_valid
+    z = np.where((z_src >= 0)[:, np.newaxis], z[np.maximum(z_src, 0)], z_first)
+
+    x = np.cross(y, z)
+
+    # Columns are the unit vectors for the xz plane for the cross-section
+    def normalized(v):
+        length = np.linalg.norm(v, axis=1, keepdims=True)
+        return v / np.where(length > 0.0, length, 1.0)
+
+    m = np.stack((normalized(x), normalized(y), normalized(z)), axis=2)
 
-    faces = []
-    if begin_cap:
-        faces.append(flip([x for x in range(nc - 1, -1, -1)], ccw))
-
-    # Order of edges in the face: forward along cross, forward along spine,
-    # backward along cross, backward along spine, flipped if now ccw.
+    if orient:
+        orient = np.asarray(orient, dtype=np.float64).reshape(-1, 4)
+        orient = orient[np.minimum(idx, len(orient) - 1)]
+        axis = normalized(orient[:, :3])
+        angle = orient[:, 3]
+        # Rodrigues' rotation formula, zero angles give identity matrices
+        c = np.cos(angle)[:, np.newaxis, np.newaxis]
+        s = np.sin(angle)[:, np.newaxis, np.newaxis]
+        ax, ay, az = axis.T
+        zero = np.zeros(ns)
+        k = np.stack((
+            np.stack((zero, -az, ay), axis=1),
+            np.stack((az, zero, -ax), axis=1),
+            np.stack((-ay, ax, zero), axis=1)), axis=1)
+        mrot = c * np.eye(3) + s * k + (1.0 - c) * np.einsum('si,sj->sij', axis, axis)
+        m = m @ mrot  # Not sure about this. Counterexample???
+
+    # First the cross-section 2-vector is scaled,
+    # then applied to the xz plane unit vectors
+    cross_scaled = np.broadcast_to(cross, (ns, nc, 2))
+    if scale:
+        scale = np.asarray(scale, dtype=np.float64).reshape(-1, 2)
+        cross_scaled = cross_scaled * scale[np.minimum(idx, len(scale) - 1)][:, np.newaxis, :]
+
+    verts = (spine[:, np.newaxis, :] +
+             cross_scaled[:, :, 0:1] * m[:, np.newaxis, :, 0] +
+             cross_scaled[:, :, 1:2] * m[:, np.newaxis, :, 2])
+
+    # Faces are built as loops directly, reversed if ccw is off.
+    # Order of edges in the side faces: forward along cross, forward along
+    # spine, backward along cross, backward along spine.
+    # The faces between the last and the first spine points of a closed
+    # spine wrap the spine index.
     # This order is assumed later in the texture coordinate assignment;
     # please don't change without syncing.
-
-    faces += [flip((
+    s = np.arange(nsf)[:, np.newaxis]
+    c = np.arange(ncf)[np.newaxis, :]
+    s_next = (s + 1) % ns
+    c_next = (c + 1) % nc
+    sides = np.stack(np.broadcast_arrays(
         s * nc + c,
-        s * nc + (c + 1) % nc,
-        (s + 1) * nc + (c + 1) % nc,
-        (s + 1) * nc + c), ccw) for s in range(ns - 1) for c in range(ncf)]
-
-    if spine_closed:
-        # The faces between the last and the first spine points
-        b = (ns - 1) * nc
-        faces += [flip((
-            b + c,
-            b + (c + 1) % nc,
-            (c + 1) % nc,
-            c), ccw) for c in range(ncf)]
+        s * nc + c_next,
+        s_next * nc + c_next,
+        s_next * nc + c), axis=2).reshape(-1, 4)
+    if not ccw:
+        sides = sides[:, ::-1]
 
+    loops = []
+    loop_totals = []
+    if begin_cap:
+        cap = np.arange(nc - 1, -1, -1)
+        loops.append(cap if ccw else cap[::-1])
+        loop_totals.append(np.array((nc,)))
+    loops.append(sides.ravel())
+    loop_totals.append(np.full(len(sides), 4))
     if end_cap:
-        faces.append(flip([(ns - 1) * nc + x for x in range(0, nc)], ccw))
+        cap = (ns - 1) * nc + np.arange(nc)
+        loops.append(cap if ccw else cap[::-1])
+        loop_totals.append(np.array((nc,)))
+
+    loops = np.concatenate(loops).astype(np.int32)
+    loop_totals = np.concatenate(loop_totals).astype(np.int32)
+    loop_starts = np.zeros(len(loop_totals), dtype=np.int32)
+    np.cumsum(loop_totals[:-1], out=loop_starts[1:])
 
     bpymesh = bpy.data.meshes.new(name="Extrusion")
-    bpymesh.from_pydata(verts, [], faces)
+    bpymesh.vertices.add(ns * nc)
+    bpymesh.vertices.foreach_set("co", verts.astype(np.float32).ravel())
+    bpymesh.loops.add(len(loops))
+    bpymesh.polygons.add(len(loop_totals))
+    bpymesh.polygons.foreach_set("loop_start", loop_starts)
+    bpymesh.polygons.foreach_set("loop_total", loop_totals)
+    bpymesh.loops.foreach_set("vertex_index", loops)
 
     # The way we deal with textures in triangular meshes doesn't apply.
     # The structure of the loop array goes: cap, side, cap
+    # X3D caps take the raw cap shape, not a scaled one, as X3DOM does.
     if begin_cap or end_cap:  # Need dimensions
-        x_min = x_max = z_min = z_max = None
-        for c in cross:
-            (x, z) = (c.x, c.z)
-            if x_min is None or x < x_min:
-                x_min = x
-            if x_max is None or x > x_max:
-                x_max = x
-            if z_min is None or z < z_min:
-                z_min = z
-            if z_max is None or z > z_max:
-                z_max = z
-        dx = x_max - x_min
-        dz = z_max - z_min
-        cap_scale = dz if dz > dx else dx
-
-    # Takes an index in the cross array, returns scaled
-    # texture coords for cap texturing purposes
-    def scaledLoopVertex(i):
-        c = cross[i]
-        return (c.x - x_min) / cap_scale, (c.z - z_min) / cap_scale
-
-    # X3DOM uses raw cap shape, not a scaled one. So we will, too.
+        cross_min = cross.min(axis=0)
+        cap_scale = (cross.max(axis=0) - cross_min).max()
 
-    loops = []
-    mloops = bpymesh.loops
+    uvs = []
     if begin_cap:  # vertex indices match the indices in cross
-        # Rely on the loops in the mesh; don't repeat the face
-        # generation logic here
-        loops += [co for i in range(nc)
-                  for co in scaledLoopVertex(mloops[i].vertex_index)]
+        uvs.append((cross[loops[:nc]] - cross_min) / cap_scale)
 
-    # Sides
-    # Same order of vertices as in face generation
-    # We don't rely on the loops in the mesh; instead,
-    # we repeat the face generation logic.
-    loops += [co for s in range(nsf)
-              for c in range(ncf)
-              for v in flip(((c / ncf, s / nsf),
-                             ((c + 1) / ncf, s / nsf),
-                             ((c + 1) / ncf, (s + 1) / nsf),
-                             (c / ncf, (s + 1) / nsf)), ccw) for co in v]
+    # Sides, same order of vertices as in face generation
+    s, c = np.meshgrid(np.arange(nsf), np.arange(ncf), indexing='ij')
+    side_u = np.stack((c, c + 1, c + 1, c), axis=2) / ncf
+    side_v = np.stack((s, s, s + 1, s + 1), axis=2) / nsf
+    side_uvs = np.stack((side_u, side_v), axis=3).reshape(-1, 4, 2)
+    if not ccw:
+        side_uvs = side_uvs[:, ::-1]
+    uvs.append(side_uvs.reshape(-1, 2))
 
     if end_cap:
-        # Base loop index for end cap
-        lb = ncf * nsf * 4 + (nc if begin_cap else 0)
-        # Rely on the loops here too.
-        loops += [co for i in range(nc) for co
-                  in scaledLoopVertex(mloops[lb + i].vertex_index % nc)]
-    importMesh_ApplyTextureToLoops(bpymesh, loops)
+        uvs.append((cross[loops[-nc:] % nc] - cross_min) / cap_scale)
+
+    importMesh_ApplyTextureToLoops(bpymesh, np.concatenate(uvs).astype(np.float32).ravel())
 
     bpymesh.validate()
     bpymesh.update()
@@ -3032,7 +3025,7 @@ def appearance_LoadPixelTexture(pixelTexture, ancestry):
 def importShape_ProcessObject(
         bpycollection, vrmlname, bpydata, geom, geom_spec, node,
         bpymat, has_alpha, texmtx, ancestry,
-        global_matrix):
+        global_matrix, merge_groups=None):
 
     vrmlname += "_" + geom_spec
     bpydata.name = vrmlname
@@ -3065,6 +3058,15 @@ def importShape_ProcessObject(
 
         # Done transforming the texture
         # TODO: check if per-polygon textures are supported here.
+
+        if merge_groups is not None:
+            # Static shapes are joined later, one mesh per material, crease
+            # angle and outermost Transform.
+            tx_node = next((node_tx for node_tx in ancestry if node_tx.getSpec() == 'Transform'), None)
+            merge_key = (bpymat, creaseAngle, tx_node)
+            merge_groups.setdefault(merge_key, []).append(
+                (vrmlname, bpydata, getFinalMatrix(node, None, ancestry, global_matrix)))
+            return
     elif type(bpydata) == bpy.types.TextCurve:
         # Text with textures??? Not sure...
         if bpymat:
@@ -3119,7 +3121,7 @@ geometry_importers = {
     }
 
 
-def importShape(bpycollection, node, ancestry, global_matrix):
+def importShape(bpycollection, node, ancestry, global_matrix, merge_groups=None):
     # Under Shape, we can only have Appearance, MetadataXXX and a geometry node
     def isGeometry(spec):
         return spec != "Appearance" and not spec.startswith("Metadata")
@@ -3175,11 +3177,136 @@ def importShape(bpycollection, node, ancestry, global_matrix):
         importShape_ProcessObject(
                 bpycollection, vrmlname, bpydata, geom, geom_spec,
                 node, bpymat, tex_has_alpha, texmtx,
-                ancestry, global_matrix)
+                ancestry, global_matrix, merge_groups)
     else:
         print('\tImportX3D warning: unsupported type "%s"' % geom_spec)
 
 
+def importShape_MergeGroups(bpycollection, merge_groups, use_shape_names):
+    """
+    Join the meshes of every merge group into a single mesh and object.
+
+    Vertices are pre-transformed by the world matrix of their shape, so the
+    merged object has an identity matrix. Optionally a face attribute
+    "x3d_shape" indexes the "x3d_shape_names" list of the mesh, so the faces
+    of a source shape can still be selected.
+    """
+    for (bpymat, creaseAngle, tx_node), shapes in merge_groups.items():
+        if len(shapes) == 1:
+            vrmlname, bpymesh, mtx = shapes[0]
+            bpyob = bpy.data.objects.new(vrmlname, bpymesh)
+            bpyob.matrix_world = mtx
+            bpycollection.objects.link(bpyob)
+            bpyob.select_set(True)
+            continue
+
+        shape_cos = []
+        shape_loops = []
+        shape_loop_totals = []
+        shape_smooth = []
+        shape_uvs = []
+        shape_cols = []
+        shape_index = []
+        vert_offset = 0
+
+        for i, (vrmlname, bpymesh, mtx) in enumerate(shapes):
+            num_verts = len(bpymesh.vertices)
+            num_loops = len(bpymesh.loops)
+            num_polys = len(bpymesh.polygons)
+
+            co = np.empty(num_verts * 3, dtype=np.float32)
+            bpymesh.vertices.foreach_get("co", co)
+            mtx = np.array(mtx, dtype=np.float32)
+            shape_cos.append(co.reshape(-1, 3) @ mtx[:3, :3].T + mtx[:3, 3])
+
+            loop_starts = np.empty(num_polys, dtype=np.int32)
+            loop_totals = np.empty(num_polys, dtype=np.int32)
+            bpymesh.polygons.foreach_get("loop_start", loop_starts)
+            bpymesh.polygons.foreach_get("loop_total", loop_totals)
+
+            # Loops in polygon order; a mirroring matrix reverses each
+            # polygon so faces keep pointing outwards.
+            loop_offsets = np.arange(num_loops) - np.repeat(np.cumsum(loop_totals) - loop_totals, loop_totals)
+            if np.linalg.det(mtx[:3, :3]) < 0.0:
+                loop_order = np.repeat(loop_starts + loop_totals - 1, loop_totals) - loop_offsets
+            else:
+                loop_order = np.repeat(loop_starts, loop_totals) + loop_offsets
+
+            vertex_index = np.empty(num_loops, dtype=np.int32)
+            bpymesh.loops.foreach_get("vertex_index", vertex_index)
+            shape_loops.append(vertex_index[loop_order] + vert_offset)
+            shape_loop_totals.append(loop_totals)
+
+            use_smooth = np.empty(num_polys, dtype=bool)
+            bpymesh.polygons.foreach_get("use_smooth", use_smooth)
+            shape_smooth.append(use_smooth)
+
+            if bpymesh.uv_layers.active:
+                uv = np.empty(num_loops * 2, dtype=np.float32)
+                bpymesh.uv_layers.active.data.foreach_get("uv", uv)
+                shape_uvs.append(uv.reshape(-1, 2)[loop_order])
+            else:
+                shape_uvs.append(np.zeros((num_loops, 2), dtype=np.float32))
+
+            if bpymesh.vertex_colors.active:
+                col = np.empty(num_loops * 4, dtype=np.float32)
+                bpymesh.vertex_colors.active.data.foreach_get("color", col)
+                shape_cols.append(col.reshape(-1, 4)[loop_order])
+            else:
+                shape_cols.append(None)
+
+            shape_index.append(np.full(num_polys, i, dtype=np.int32))
+            vert_offset += num_verts
+
+        co = np.concatenate(shape_cos)
+        vertex_index = np.concatenate(shape_loops)
+        loop_totals = np.concatenate(shape_loop_totals)
+        loop_starts = np.zeros(len(loop_totals), dtype=np.int32)
+        np.cumsum(loop_totals[:-1], out=loop_starts[1:])
+
+        vrmlname = "%s_%s" % (tx_node.getDefName() if tx_node and tx_node.getDefName() else "Shapes",
+                              bpymat.name if bpymat else "Default")
+        bpymesh = bpy.data.meshes.new(name=vrmlname)
+        bpymesh.vertices.add(len(co))
+        bpymesh.vertices.foreach_set("co", co.ravel())
+        bpymesh.loops.add(len(vertex_index))
+        bpymesh.loops.foreach_set("vertex_index", vertex_index)
+        bpymesh.polygons.add(len(loop_totals))
+        bpymesh.polygons.foreach_set("loop_start", loop_starts)
+        bpymesh.polygons.foreach_set("loop_total", loop_totals)
+        bpymesh.polygons.foreach_set("use_smooth", np.concatenate(shape_smooth))
+
+        if any(src_mesh.uv_layers for _, src_mesh, _ in shapes):
+            bpymesh.uv_layers.new().data.foreach_set("uv", np.concatenate(shape_uvs).ravel())
+
+        if any(col is not None for col in shape_cols):
+            shape_cols = [np.ones((len(uv), 4), dtype=np.float32) if col is None else col
+                          for col, uv in zip(shape_cols, shape_uvs)]
+            bpymesh.vertex_colors.new().data.foreach_set("color", np.concatenate(shape_cols).ravel())
+
+        if use_shape_names:
+            attr = bpymesh.attributes.new("x3d_shape", 'INT', 'FACE')
+            attr.data.foreach_set("value", np.concatenate(shape_index))
+            bpymesh["x3d_shape_names"] = [vrmlname for vrmlname, _, _ in shapes]
+
+        if creaseAngle is not None:
+            bpymesh.auto_smooth_angle = creaseAngle
+            bpymesh.use_auto_smooth = True
+
+        if bpymat:
+            bpymesh.materials.append(bpymat)
+
+        bpymesh.validate()
+        bpymesh.update(calc_edges=True)
+
+        for _, src_mesh, _ in shapes:
+            bpy.data.meshes.remove(src_mesh)
+
+        bpyob = bpy.data.objects.new(vrmlname, bpymesh)
+        bpycollection.objects.link(bpyob)
+        bpyob.select_set(True)
+
+
 # -----------------------------------------------------------------------------------
 # Lighting
 
@@ -3387,7 +3514,7 @@ def translateOrientationInterpolator(node, action, ancestry):
 # Untested!
 def translateScalarInterpolator(node, action, ancestry):
     key = node.getFieldAsArray('key', 0, ancestry)
-    keyValue = node.getFieldAsArray('keyValue', 4, ancestry)
+    keyValue = node.getFieldAsArray('keyValue', 3, ancestry)
 
     sca_x = action_fcurve_ensure(action, "scale", 0)
     sca_y = action_fcurve_ensure(action, "scale", 1)
@@ -3399,9 +3526,13 @@ def translateScalarInterpolator(node, action, ancestry):
         except:
             continue
 
-        sca_x.keyframe_points.new(time, x)
-        sca_y.keyframe_points.new(time, y)
-        sca_z.keyframe_points.new(time, z)
+        sca_x.keyframe_points.insert(time, x)
+        sca_y.keyframe_points.insert(time, y)
+        sca_z.keyframe_points.insert(time, z)
+
+    for fcu in (sca_x, sca_y, sca_z):
+        for kf in fcu.keyframe_points:
+            kf.interpolation = 'LINEAR'
 
 
 def translateTimeSensor(node, action, ancestry):
@@ -3481,17 +3612,17 @@ ROUTE champFly001.bindTime TO vpTs.set_startTime
                 continue
 
             if from_type == 'value_changed':
-                if to_type == 'set_position':
+                if to_type in {'set_position', 'set_translation', 'translation'}:
                     action = getIpo(to_id)
                     set_data_from_node = defDict[from_id]
                     translatePositionInterpolator(set_data_from_node, action, ancestry)
 
-                if to_type in {'set_orientation', 'rotation'}:
+                if to_type in {'set_orientation', 'set_rotation', 'rotation'}:
                     action = getIpo(to_id)
                     set_data_from_node = defDict[from_id]
                     translateOrientationInterpolator(set_data_from_node, action, ancestry)
 
-                if to_type == 'set_scale':
+                if to_type in {'set_scale', 'scale'}:
                     action = getIpo(to_id)
                     set_data_from_node = defDict[from_id]
                     translateScalarInterpolator(set_data_from_node, action, ancestry)
@@ -3508,6 +3639,8 @@ def load_web3d(
         *,
         PREF_FLAT=False,
         PREF_CIRCLE_DIV=16,
+        PREF_MERGE_SHAPES=False,
+        PREF_SHAPE_NAMES=False,
         global_matrix=None,
         HELPER_FUNC=None
         ):
@@ -3538,6 +3671,18 @@ def load_web3d(
     # fill with tuples - (node, [parents-parent, parent])
     all_nodes = root_node.getSerialized([], [])
 
+    if PREF_MERGE_SHAPES:
+        # Shapes under animated nodes need their own objects,
+        # every other shape mesh is collected here for merging.
+        merge_groups = {}
+        routed_defs = set()
+        for node, ancestry in all_nodes:
+            for field in getattr(node, 'fields', ()):
+                if field and field[0] == 'ROUTE':
+                    routed_defs.add(field[3].split('.')[0])
+    else:
+        merge_groups = None
+
     for node, ancestry in all_nodes:
         #if 'castle.wrl' not in node.getFilename():
         #   continue
@@ -3554,7 +3699,11 @@ def load_web3d(
             # by an external script. - gets first pick
             pass
         if spec == 'Shape':
-            importShape(bpycollection, node, ancestry, global_matrix)
+            if merge_groups is not None and not any(
+                    node_anc.getDefName() in routed_defs for node_anc in chain(ancestry, (node,))):
+                importShape(bpycollection, node, ancestry, global_matrix, merge_groups)
+            else:
+                importShape(bpycollection, node, ancestry, global_matrix)
         elif spec in {'PointLight', 'DirectionalLight', 'SpotLight'}:
             importLamp(bpycollection, node, spec, ancestry, global_matrix)
         elif spec == 'Viewpoint':
@@ -3570,6 +3719,9 @@ def load_web3d(
             translatePositionInterpolator(node, action)
             '''
 
+    if merge_groups:
+        importShape_MergeGroups(bpycollection, merge_groups, PREF_SHAPE_NAMES)
+
     # After we import all nodes, route events - anim paths
     for node, ancestry in all_nodes:
         importRoute(node, ancestry)
@@ -3651,13 +3803,17 @@ def load_with_profiler(
 def load(context,
          filepath,
          *,
-         global_matrix=None
+         global_matrix=None,
+         use_merge_shapes=False,
+         use_shape_names=False
          ):
 
     # loadWithProfiler(operator, context, filepath, global_matrix)
     load_web3d(context, filepath,
                PREF_FLAT=True,
                PREF_CIRCLE_DIV=16,
+               PREF_MERGE_SHAPES=use_merge_shapes,
+               PREF_SHAPE_NAMES=use_shape_names,
                global_matrix=global_matrix,
                )
 